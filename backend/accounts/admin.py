@@ -14,3 +14,4 @@ class UserAdmin(admin.ModelAdmin):
     list_filter = ["role", "is_active"]
     search_fields = ["email", "first_name", "last_name"]
     ordering = ["-date_joined"]
+    readonly_fields = ["token_version"]
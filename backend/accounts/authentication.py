@@ -0,0 +1,175 @@
+"""
+Stateless JWT authentication.
+
+Tokens minted by ``RefreshToken.for_user()`` carry the user's ``role``
+and ``token_version`` next to the user id, so
+``StatelessJWTAuthentication`` needs no ``User`` row to authenticate a
+request: ``request.user`` is a ``TokenUser`` built from the claims, which
+is all the permission classes look at (``role`` and ``id``).
+
+Revocation goes through the version claim.  ``User.save()`` bumps
+``token_version`` when the role or the active flag changes, and a token
+carrying an older version - or belonging to an inactive user - is
+rejected.  The current version comes from the user's auth state - only
+``is_active``, ``token_version`` and ``role``, never the password hash or
+profile fields - cached under ``accounts:auth:<id>`` for
+``USER_CACHE_TTL`` seconds; saving or deleting a user drops the entry
+(``accounts.signals``).  Views that need the full model load it through
+``TokenUser.user``.  As with the response cache, the cache backend must
+be shared between workers (e.g. Redis) for a change to reach all of them
+at once; otherwise it does within the TTL.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt import models, tokens
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+CACHE_PREFIX = "accounts:auth"
+VERSION_CLAIM = "token_version"
+CLAIM_FIELDS = ("role",)
+STATE_FIELDS = ("is_active", "token_version", "role")
+
+
+def user_cache_key(user_id):
+    return f"{CACHE_PREFIX}:{user_id}"
+
+
+def get_auth_state(user_id):
+    """The cached ``STATE_FIELDS`` of ``user_id`` as a dict, ``None`` if not cached."""
+    return cache.get(user_cache_key(user_id))
+
+
+def cache_auth_state(user):
+    """Cache the ``STATE_FIELDS`` of ``user`` for ``USER_CACHE_TTL``; returns them."""
+    state = {field: getattr(user, field) for field in STATE_FIELDS}
+    cache.set(user_cache_key(user.pk), state, timeout=settings.USER_CACHE_TTL)
+    return state
+
+
+def invalidate_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def resolve_user(user):
+    """The ``User`` model instance behind ``request.user``."""
+    return user.user if isinstance(user, TokenUser) else user
+
+
+class UserClaimsMixin:
+    """Token class mixin adding the claims ``TokenUser`` reads."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        add_user_claims(token, user)
+        return token
+
+
+def add_user_claims(token, user):
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    token[VERSION_CLAIM] = user.token_version
+
+
+class AccessToken(UserClaimsMixin, tokens.AccessToken):
+    pass
+
+
+class RefreshToken(UserClaimsMixin, tokens.RefreshToken):
+    # The access token copies the refresh token's claims.
+    access_token_class = AccessToken
+
+
+class TokenUser(models.TokenUser):
+    """
+    ``request.user`` of a stateless JWT.
+
+    ``id`` and ``role`` come from the token.  Any other ``User`` attribute
+    (``email``, ``is_employer``, ...) is read from the full model, loaded
+    from the database on first use.
+    """
+
+    @cached_property
+    def id(self):
+        return User._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def user(self):
+        user = User.objects.filter(pk=self.id).first()
+        if user is None:
+            raise User.DoesNotExist(f"User {self.id} of the token no longer exists.")
+        return user
+
+    @cached_property
+    def auth_state(self):
+        return get_auth_state(self.id) or cache_auth_state(self.user)
+
+    @property
+    def is_staff(self):
+        return self.user.is_staff
+
+    @property
+    def is_superuser(self):
+        return self.user.is_superuser
+
+    @property
+    def role(self):
+        return self.token.get("role") or self.auth_state["role"]
+
+    def __str__(self):
+        return f"TokenUser {self.id} ({self.role})"
+
+    def __eq__(self, other):
+        if isinstance(other, (models.TokenUser, User)):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __getattr__(self, attr):
+        # Only called for attributes not found above.  Private names (and
+        # the token itself) stay unresolved so that copying and pickling do
+        # not load the user.
+        if attr.startswith("_") or attr in ("token", "user", "auth_state"):
+            raise AttributeError(attr)
+        return getattr(self.user, attr)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication returning a ``TokenUser`` without a database query
+    (while the user is cached), rejecting tokens of inactive users and
+    tokens issued before the user's last role or active flag change.
+    """
+
+    def get_user(self, validated_token):
+        token_user = super().get_user(validated_token)
+        state = get_auth_state(token_user.id)
+        if state is None:
+            user = User.objects.filter(pk=token_user.id).first()
+            if user is None:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+            state = cache_auth_state(user)
+            # Loaded anyway: spare a view that needs the model its query.
+            token_user.__dict__["user"] = user
+        if not state["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        # Tokens minted without the claims (before they were added) carry
+        # no version; their role is read from the state instead.
+        version = validated_token.get(VERSION_CLAIM)
+        if version is not None and version != state["token_version"]:
+            raise AuthenticationFailed("Token is no longer valid; log in again.", code="token_outdated")
+        token_user.__dict__["auth_state"] = state
+        return token_user
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Bumped when the role or active flag changes; older tokens are rejected.'),
+        ),
+    ]
@@ -60,10 +60,18 @@ class User(AbstractUser):
         help_text="Short bio or description.",
     )
     phone = models.CharField(max_length=20, blank=True, default="")
+    token_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Bumped when the role or active flag changes; older tokens are rejected.",
+    )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["first_name", "last_name"]
 
+    # Fields whose change bumps token_version (see accounts.authentication).
+    TOKEN_FIELDS = ("role", "is_active")
+
     objects = UserManager()
 
     class Meta:
@@ -72,6 +80,30 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.email} ({self.get_role_display()})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_token_state = instance._token_state()
+        return instance
+
+    def _token_state(self):
+        # Deferred fields are left out rather than loaded.
+        return {field: self.__dict__[field] for field in self.TOKEN_FIELDS if field in self.__dict__}
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, "_loaded_token_state", {})
+        update_fields = kwargs.get("update_fields")
+        changed = [
+            field for field, value in loaded.items()
+            if self.__dict__.get(field, value) != value and (update_fields is None or field in update_fields)
+        ]
+        if changed:
+            self.token_version += 1
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+        self._loaded_token_state = self._token_state()
+
     @property
     def is_employer(self):
         return self.role == self.Role.EMPLOYER
@@ -59,6 +59,7 @@ class IsOwnerOrAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.user.role == "admin":
             return True
-        # Try common owner field names
+        # Try common owner field names; compare ids, as request.user may be
+        # a token user rather than a User instance.
         owner = getattr(obj, "company", None) or getattr(obj, "user", None)
-        return owner == request.user
+        return owner is not None and owner.pk == request.user.pk
@@ -0,0 +1,24 @@
+"""
+OpenAPI extensions for the token classes of ``accounts.authentication``.
+
+drf-spectacular's simplejwt extensions only match simplejwt's own classes,
+not subclasses; these reuse them for ours.
+"""
+
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    SimpleJWTScheme,
+    TokenObtainPairSerializerExtension,
+    TokenRefreshSerializerExtension,
+)
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    target_class = "accounts.authentication.StatelessJWTAuthentication"
+
+
+class ClaimsTokenObtainPairSerializerExtension(TokenObtainPairSerializerExtension):
+    target_class = "accounts.serializers.TokenObtainPairSerializer"
+
+
+class ClaimsTokenRefreshSerializerExtension(TokenRefreshSerializerExtension):
+    target_class = "accounts.serializers.TokenRefreshSerializer"
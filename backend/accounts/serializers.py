@@ -4,6 +4,11 @@ Serializers for user registration, login, and profile management.
 
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import VERSION_CLAIM, RefreshToken, add_user_claims
 
 User = get_user_model()
 
@@ -67,6 +72,14 @@ class UserProfileSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "email", "role", "date_joined"]
 
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        # Write only the submitted columns, so that a concurrent role or
+        # active flag change is not overwritten with the loaded values.
+        instance.save(update_fields=list(validated_data))
+        return instance
+
 
 class UserMinimalSerializer(serializers.ModelSerializer):
     """Minimal user info used inside other serializers."""
@@ -75,3 +88,35 @@ class UserMinimalSerializer(serializers.ModelSerializer):
         model = User
         fields = ["id", "email", "first_name", "last_name", "company_name"]
         read_only_fields = fields
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    """Login: tokens carrying the claims of ``accounts.authentication``."""
+
+    token_class = RefreshToken
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """
+    Issue an access token with the user's current claims.  Refresh tokens
+    issued before a role or active flag change are rejected.
+    """
+
+    token_class = RefreshToken
+    default_error_messages = {
+        **jwt_serializers.TokenRefreshSerializer.default_error_messages,
+        "token_outdated": "Token is no longer valid; log in again.",
+    }
+
+    def validate(self, attrs):
+        # ROTATE_REFRESH_TOKENS is off: the refresh token is returned as is.
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.filter(pk=refresh.payload.get(api_settings.USER_ID_CLAIM)).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+        version = refresh.payload.get(VERSION_CLAIM)
+        if version is not None and version != user.token_version:
+            raise AuthenticationFailed(self.error_messages["token_outdated"], "token_outdated")
+        access = refresh.access_token
+        add_user_claims(access, user)
+        return {"access": str(access)}
@@ -1,11 +1,16 @@
 """
-Tests for the accounts app — registration, login, and profile management.
+Tests for the accounts app — registration, login, profile management, and
+stateless JWT authentication.
 """
 
 from django.test import TestCase
 from django.contrib.auth import get_user_model
-from rest_framework.test import APIClient
+from django.core.cache import cache
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework import status
+from rest_framework_simplejwt import tokens
+
+from .authentication import RefreshToken, StatelessJWTAuthentication, TokenUser, get_auth_state, user_cache_key
 
 User = get_user_model()
 
@@ -152,3 +157,108 @@ class UserProfileTests(TestCase):
         self.client.force_authenticate(user=None)
         response = self.client.get(self.profile_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    """Test the claims-based token user and token invalidation."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.profile_url = "/api/auth/profile/"
+        self.user = User.objects.create_user(
+            email="employer@example.com",
+            password="testpass123",
+            first_name="Emma",
+            last_name="Employer",
+            role="employer",
+            company_name="Acme",
+        )
+
+    def authenticate(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_login_token_carries_claims(self):
+        response = self.client.post(
+            "/api/auth/login/",
+            {"email": "employer@example.com", "password": "testpass123"},
+            format="json",
+        )
+        access = tokens.AccessToken(response.data["access"])
+        self.assertEqual(access["role"], "employer")
+        self.assertNotIn("company_name", access.payload)
+        self.assertEqual(access["token_version"], 0)
+
+    def test_cached_state_needs_no_query(self):
+        token = RefreshToken.for_user(self.user).access_token
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        with self.assertNumQueries(1):
+            StatelessJWTAuthentication().authenticate(request)
+        with self.assertNumQueries(0):
+            user, _ = StatelessJWTAuthentication().authenticate(request)
+            self.assertEqual(user.role, "employer")
+        self.assertEqual(
+            cache.get(user_cache_key(self.user.pk)), {"is_active": True, "token_version": 0, "role": "employer"}
+        )
+        self.authenticate(token)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.profile_url)
+        self.assertEqual(response.data["email"], "employer@example.com")
+
+    def test_token_user(self):
+        user = TokenUser(RefreshToken.for_user(self.user).access_token)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.role, "employer")
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "employer@example.com")
+            self.assertTrue(user.is_employer)
+
+    def test_role_change_rejects_old_token(self):
+        self.authenticate(RefreshToken.for_user(self.user).access_token)
+        self.assertEqual(self.client.get(self.profile_url).status_code, status.HTTP_200_OK)
+        self.user.role = User.Role.JOB_SEEKER
+        self.user.save()
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.authenticate(RefreshToken.for_user(self.user).access_token)
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.data["role"], "job_seeker")
+
+    def test_deactivation_rejects_token(self):
+        self.authenticate(RefreshToken.for_user(self.user).access_token)
+        self.assertEqual(self.client.get(self.profile_url).status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_keeps_token_valid(self):
+        self.authenticate(RefreshToken.for_user(self.user).access_token)
+        response = self.client.patch(self.profile_url, {"bio": "Hiring"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.bio, "Hiring")
+        self.assertEqual(self.user.token_version, 0)
+        self.assertIsNone(get_auth_state(self.user.pk))
+        self.assertEqual(self.client.get(self.profile_url).data["bio"], "Hiring")
+
+    def test_refresh_restamps_claims(self):
+        # A refresh token issued before the claims were added.
+        refresh = tokens.RefreshToken.for_user(self.user)
+        response = self.client.post("/api/auth/token/refresh/", {"refresh": str(refresh)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        access = tokens.AccessToken(response.data["access"])
+        self.assertEqual((access["role"], access["token_version"]), ("employer", 0))
+
+    def test_refresh_rejects_outdated_token(self):
+        refresh = RefreshToken.for_user(self.user)
+        self.user.role = User.Role.JOB_SEEKER
+        self.user.save()
+        response = self.client.post("/api/auth/token/refresh/", {"refresh": str(refresh)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_without_claims(self):
+        # Tokens issued before the claims were added still authenticate.
+        self.authenticate(tokens.RefreshToken.for_user(self.user).access_token)
+        response = self.client.post("/api/jobs/", {}, format="json")
+        self.assertNotIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
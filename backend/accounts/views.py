@@ -5,10 +5,10 @@ Views for user registration, login (JWT), and profile management.
 from django.contrib.auth import get_user_model
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from drf_spectacular.utils import extend_schema
 
+from .authentication import RefreshToken, resolve_user
 from .serializers import RegisterSerializer, UserProfileSerializer
 
 User = get_user_model()
@@ -21,6 +21,7 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 2
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -52,6 +53,7 @@ class LoginView(TokenObtainPairView):
     """Obtain JWT access and refresh tokens."""
 
     permission_classes = [permissions.AllowAny]
+    query_budget = 1
 
 
 @extend_schema(tags=["Auth"])
@@ -59,6 +61,7 @@ class TokenRefreshView(TokenRefreshView):
     """Refresh an expired access token."""
 
     permission_classes = [permissions.AllowAny]
+    query_budget = 1
 
 
 @extend_schema(tags=["Auth"])
@@ -67,6 +70,7 @@ class ProfileView(generics.RetrieveUpdateAPIView):
 
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = {"GET": 1, "PUT": 2, "PATCH": 2}
 
     def get_object(self):
-        return self.request.user
+        return resolve_user(self.request.user)
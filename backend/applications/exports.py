@@ -0,0 +1,105 @@
+"""
+Streaming export of job applications as CSV or NDJSON.
+
+Rows are read as flat tuples with ``values_list().iterator()`` - a
+server-side cursor on PostgreSQL, fetched ``CHUNK_SIZE`` rows at a time -
+and encoded one by one into the response, so memory use stays constant
+however many applications a posting has.
+
+``CSVRenderer`` and ``NDJSONRenderer`` only take part in content
+negotiation, so that ``Accept: text/csv`` or ``application/x-ndjson``
+reaches the export view; the view streams the body itself.
+"""
+
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+CHUNK_SIZE = 2000
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class _ExportRenderer(BaseRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # The export view answers errors with the default renderer instead.
+        raise NotImplementedError("Exports are streamed by the view.")
+
+
+class CSVRenderer(_ExportRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class NDJSONRenderer(_ExportRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+RENDERERS = (CSVRenderer, NDJSONRenderer)
+
+# (column, queryset lookup)
+COLUMNS = (
+    ("id", "id"),
+    ("job_id", "job_id"),
+    ("job_title", "job__title"),
+    ("applicant_id", "applicant_id"),
+    ("applicant_email", "applicant__email"),
+    ("applicant_first_name", "applicant__first_name"),
+    ("applicant_last_name", "applicant__last_name"),
+    ("status", "status"),
+    ("cover_letter", "cover_letter"),
+    ("applied_at", "applied_at"),
+    ("updated_at", "updated_at"),
+)
+
+# Cells starting with these are run as formulas by spreadsheet programs.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _rows(queryset):
+    lookups = [lookup for _, lookup in COLUMNS]
+    # Only the plain columns are needed; drop the list view's joins.
+    queryset = queryset.select_related(None).values_list(*lookups)
+    return queryset.iterator(chunk_size=CHUNK_SIZE)
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _Line:
+    """File-like target that hands back what ``csv.writer`` writes."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(queryset):
+    writer = csv.writer(_Line())
+    yield writer.writerow([column for column, _ in COLUMNS])
+    for row in _rows(queryset):
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def stream_ndjson(queryset):
+    columns = [column for column, _ in COLUMNS]
+    for row in _rows(queryset):
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+STREAMS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+}
@@ -3,7 +3,9 @@ Serializers for Job Applications.
 """
 
 from rest_framework import serializers
+from accounts.authentication import resolve_user
 from accounts.serializers import UserMinimalSerializer
+from jobs.fieldsets import SparseFieldsetSerializerMixin
 from jobs.serializers import JobPostingListSerializer
 from .models import JobApplication
 
@@ -32,7 +34,7 @@ class JobApplicationCreateSerializer(serializers.ModelSerializer):
                 )
             # Check for duplicate application
             if JobApplication.objects.filter(
-                job=data["job"], applicant=request.user
+                job=data["job"], applicant_id=request.user.pk
             ).exists():
                 raise serializers.ValidationError(
                     "You have already applied for this job."
@@ -40,11 +42,11 @@ class JobApplicationCreateSerializer(serializers.ModelSerializer):
         return data
 
     def create(self, validated_data):
-        validated_data["applicant"] = self.context["request"].user
+        validated_data["applicant"] = resolve_user(self.context["request"].user)
         return super().create(validated_data)
 
 
-class JobApplicationListSerializer(serializers.ModelSerializer):
+class JobApplicationListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for listing applications with related data."""
 
     applicant = UserMinimalSerializer(read_only=True)
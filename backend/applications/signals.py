@@ -0,0 +1,54 @@
+"""
+Signal handlers keeping job counters and employer stats in sync with
+application writes.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from jobs import stats
+from jobs.counters import adjust_job_counter
+from jobs.models import JobPosting
+from jobs.signals import is_job_being_deleted
+from .models import JobApplication
+
+
+def _employer(application):
+    """``(company_id, counter_shards)`` of the application's posting."""
+    if JobApplication.job.is_cached(application):
+        return application.job.company_id, application.job.counter_shards
+    return (
+        JobPosting.objects.filter(pk=application.job_id)
+        .values_list("company_id", "counter_shards")
+        .first()
+    ) or (None, 0)
+
+
+@receiver(post_init, sender=JobApplication)
+def remember_application_status(sender, instance, **kwargs):
+    instance._tracked_status = instance.__dict__.get("status") if instance.pk else None
+
+
+@receiver(post_save, sender=JobApplication)
+def application_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_status = None if created else instance._tracked_status
+    if created or old_status != instance.status:
+        with transaction.atomic():
+            if created:
+                adjust_job_counter(instance.job, "application_count", 1)
+            employer_id, shards = _employer(instance)
+            stats.application_changed(employer_id, old_status, instance.status, shards)
+    instance._tracked_status = instance.status
+
+
+@receiver(post_delete, sender=JobApplication)
+def application_deleted(sender, instance, **kwargs):
+    if is_job_being_deleted(instance.job_id):
+        return
+    with transaction.atomic():
+        adjust_job_counter(instance.job_id, "application_count", -1)
+        employer_id, shards = _employer(instance)
+        stats.application_changed(employer_id, instance._tracked_status, None, shards)
@@ -2,6 +2,10 @@
 Tests for the applications app — apply, view, and manage applications.
 """
 
+import csv
+import io
+import json
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
@@ -83,6 +87,15 @@ class JobApplicationTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 1)
 
+    def test_my_applications_cursor_mode(self):
+        self.client.force_authenticate(user=self.seeker)
+        JobApplication.objects.create(job=self.job, applicant=self.seeker)
+        response = self.client.get("/api/applications/my/?cursor=&ordering=status")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 1)
+
     def test_employer_view_applications(self):
         JobApplication.objects.create(
             job=self.job, applicant=self.seeker, cover_letter="Test"
@@ -92,6 +105,20 @@ class JobApplicationTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 1)
 
+    def test_sparse_fieldsets(self):
+        JobApplication.objects.create(job=self.job, applicant=self.seeker)
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(
+            f"/api/applications/job/{self.job.id}/", {"fields": "id,status,applicant"}
+        )
+        self.assertEqual(list(response.data["results"][0]), ["id", "applicant", "status"])
+        # Nested serializers keep all their fields.
+        self.assertEqual(response.data["results"][0]["applicant"]["email"], "seeker@example.com")
+        self.client.force_authenticate(user=self.seeker)
+        response = self.client.get("/api/applications/my/", {"omit": "job,cover_letter"})
+        self.assertNotIn("job", response.data["results"][0])
+        self.assertEqual(response.data["results"][0]["status"], "pending")
+
     def test_update_application_status(self):
         app = JobApplication.objects.create(
             job=self.job, applicant=self.seeker, cover_letter="Test"
@@ -115,3 +142,95 @@ class JobApplicationTests(TestCase):
             format="json",
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class JobApplicationsExportTests(TestCase):
+    """Test the streaming application export."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.employer = User.objects.create_user(
+            email="emp@example.com", password="emppass123", role="employer"
+        )
+        self.job = JobPosting.objects.create(
+            title="Python Developer",
+            description="Looking for a Python dev.",
+            company=self.employer,
+            location="Addis Ababa",
+        )
+        self.seekers = [
+            User.objects.create_user(
+                email=f"seeker{i}@example.com", password="x", first_name=f"Seeker{i}"
+            )
+            for i in range(3)
+        ]
+        for i, seeker in enumerate(self.seekers):
+            JobApplication.objects.create(
+                job=self.job, applicant=seeker, cover_letter="=HYPERLINK()" if i == 0 else "Hi,\nme"
+            )
+        self.url = f"/api/applications/job/{self.job.id}/export/"
+        self.client.force_authenticate(user=self.employer)
+
+    def content(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+            rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn("attachment;", response["Content-Disposition"])
+        self.assertEqual(len(rows), 3)
+        # Newest first, like the list view.
+        self.assertEqual(rows[0]["applicant_email"], "seeker2@example.com")
+        self.assertEqual(rows[0]["cover_letter"], "Hi,\nme")
+        self.assertEqual(rows[2]["cover_letter"], "'=HYPERLINK()")
+        self.assertEqual(rows[2]["job_title"], "Python Developer")
+
+    def test_ndjson_export(self):
+        response = self.client.get(self.url, {"export_format": "ndjson"})
+        lines = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([line["applicant_id"] for line in lines], [s.id for s in reversed(self.seekers)])
+        self.assertEqual(lines[2]["cover_letter"], "=HYPERLINK()")
+        self.assertEqual(lines[0]["status"], "pending")
+
+    def test_format_from_accept_header(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="text/csv")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(self.content(response))))), 3)
+
+        response = self.client.get(self.url, HTTP_ACCEPT="application/x-ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(self.content(response).splitlines()), 3)
+
+        # The query parameter wins over the header.
+        response = self.client.get(self.url, {"export_format": "ndjson"}, HTTP_ACCEPT="text/csv")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+    def test_errors_are_json_whatever_the_accept_header(self):
+        response = self.client.get(self.url, {"export_format": "xml"}, HTTP_ACCEPT="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertIn("export_format", response.json())
+
+        self.client.force_authenticate(user=self.seekers[0])
+        response = self.client.get(self.url, HTTP_ACCEPT="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_unknown_format(self):
+        response = self.client.get(self.url, {"export_format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_employer_gets_nothing(self):
+        other = User.objects.create_user(email="other@example.com", password="x", role="employer")
+        self.client.force_authenticate(user=other)
+        rows = list(csv.reader(io.StringIO(self.content(self.client.get(self.url)))))
+        self.assertEqual(len(rows), 1)
+
+    def test_job_seeker_forbidden(self):
+        self.client.force_authenticate(user=self.seekers[0])
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
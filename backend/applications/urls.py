@@ -7,6 +7,7 @@ from .views import (
     ApplyToJobView,
     MyApplicationsView,
     JobApplicationsView,
+    JobApplicationsExportView,
     UpdateApplicationStatusView,
 )
 
@@ -18,6 +19,11 @@ urlpatterns = [
         JobApplicationsView.as_view(),
         name="job-applications",
     ),
+    path(
+        "job/<int:job_id>/export/",
+        JobApplicationsExportView.as_view(),
+        name="job-applications-export",
+    ),
     path(
         "<int:pk>/status/",
         UpdateApplicationStatusView.as_view(),
@@ -2,11 +2,19 @@
 Views for Job Applications.
 """
 
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema
+from rest_framework.settings import api_settings
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
 from accounts.permissions import IsJobSeeker, IsEmployerOrAdmin
+from jobs.fieldsets import SPARSE_FIELDSET_PARAMETERS, SparseFieldsetMixin
+from jobs.pagination import KeysetPagination
+from .exports import FORMATS as EXPORT_FORMATS, RENDERERS as EXPORT_RENDERERS, STREAMS as EXPORT_STREAMS
 from .models import JobApplication
 from .serializers import (
     JobApplicationCreateSerializer,
@@ -21,11 +29,13 @@ class ApplyToJobView(generics.CreateAPIView):
 
     serializer_class = JobApplicationCreateSerializer
     permission_classes = [permissions.IsAuthenticated, IsJobSeeker]
+    query_budget = 15
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        application = serializer.save()
+        with transaction.atomic():
+            application = serializer.save()
         return Response(
             {
                 "message": "Application submitted successfully.",
@@ -39,22 +49,26 @@ class ApplyToJobView(generics.CreateAPIView):
         )
 
 
-@extend_schema(tags=["Applications"])
-class MyApplicationsView(generics.ListAPIView):
+@extend_schema(tags=["Applications"], parameters=SPARSE_FIELDSET_PARAMETERS)
+class MyApplicationsView(SparseFieldsetMixin, generics.ListAPIView):
     """List all applications for the authenticated job seeker."""
 
     serializer_class = JobApplicationListSerializer
     permission_classes = [permissions.IsAuthenticated, IsJobSeeker]
+    query_budget = 3
+    pagination_class = KeysetPagination
+    ordering_fields = ["applied_at", "updated_at", "status"]
+    ordering = ["-applied_at"]
 
     def get_queryset(self):
         return (
-            JobApplication.objects.filter(applicant=self.request.user)
+            JobApplication.objects.filter(applicant_id=self.request.user.pk)
             .select_related("job__company", "job__category", "applicant")
         )
 
 
-@extend_schema(tags=["Applications"])
-class JobApplicationsView(generics.ListAPIView):
+@extend_schema(tags=["Applications"], parameters=SPARSE_FIELDSET_PARAMETERS)
+class JobApplicationsView(SparseFieldsetMixin, generics.ListAPIView):
     """
     List all applications for a specific job posting.
     Only the employer who posted the job (or an admin) can view these.
@@ -62,6 +76,10 @@ class JobApplicationsView(generics.ListAPIView):
 
     serializer_class = JobApplicationListSerializer
     permission_classes = [permissions.IsAuthenticated, IsEmployerOrAdmin]
+    query_budget = 3
+    pagination_class = KeysetPagination
+    ordering_fields = ["applied_at", "updated_at", "status"]
+    ordering = ["-applied_at"]
 
     def get_queryset(self):
         job_id = self.kwargs["job_id"]
@@ -71,10 +89,59 @@ class JobApplicationsView(generics.ListAPIView):
         )
         # Employers can only see applications for their own job postings
         if self.request.user.role == "employer":
-            qs = qs.filter(job__company=self.request.user)
+            qs = qs.filter(job__company_id=self.request.user.pk)
         return qs
 
 
+@extend_schema(
+    tags=["Applications"],
+    parameters=[
+        OpenApiParameter(
+            "export_format",
+            OpenApiTypes.STR,
+            enum=list(EXPORT_FORMATS),
+            description="csv or ndjson; defaults to the Accept header's format, else csv.",
+        ),
+    ],
+    responses={(200, "text/csv"): OpenApiTypes.STR, (200, "application/x-ndjson"): OpenApiTypes.STR},
+)
+class JobApplicationsExportView(JobApplicationsView):
+    """
+    Stream every application for a job posting as CSV or NDJSON.
+    Same access rules and ordering as the paginated list.
+    """
+
+    pagination_class = None
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *EXPORT_RENDERERS]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if isinstance(response, Response) and isinstance(response.accepted_renderer, EXPORT_RENDERERS):
+            # Errors are rendered as JSON whatever export format was asked for.
+            renderer = self.renderer_classes[0]()
+            response.accepted_renderer = renderer
+            response.accepted_media_type = renderer.media_type
+        return response
+
+    def list(self, request, *args, **kwargs):
+        accepted = request.accepted_renderer.format
+        export_format = request.query_params.get(
+            "export_format", accepted if accepted in EXPORT_FORMATS else "csv"
+        )
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"export_format": [f"Must be one of: {', '.join(EXPORT_FORMATS)}."]}
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            EXPORT_STREAMS[export_format](queryset),
+            content_type=EXPORT_FORMATS[export_format],
+        )
+        filename = f"job-{self.kwargs['job_id']}-applications.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
 @extend_schema(tags=["Applications"])
 class UpdateApplicationStatusView(generics.UpdateAPIView):
     """
@@ -84,9 +151,10 @@ class UpdateApplicationStatusView(generics.UpdateAPIView):
 
     serializer_class = JobApplicationStatusSerializer
     permission_classes = [permissions.IsAuthenticated, IsEmployerOrAdmin]
+    query_budget = 10
 
     def get_queryset(self):
         qs = JobApplication.objects.select_related("job__company")
         if self.request.user.role == "employer":
-            qs = qs.filter(job__company=self.request.user)
+            qs = qs.filter(job__company_id=self.request.user.pk)
         return qs
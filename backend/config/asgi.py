@@ -2,6 +2,14 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Under ASGI the public job/category reads are served by async views
+when ``ASYNC_VIEWS`` is set (see ``jobs.async_views``); it also turns
+persistent database connections off unless ``CONN_MAX_AGE`` is given::
+
+    ASYNC_VIEWS=true gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker --workers 3
+
+This mode is experimental: the Dockerfile and Procfile serve ``config.wsgi``.
+Compare the two with ``manage.py benchmark_concurrency`` before switching.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -14,3 +22,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# Build in-process indexes before this worker serves its first request.
+from jobs import fuzzy, typeahead  # noqa: E402
+
+typeahead.warm_up()
+fuzzy.warm_up()
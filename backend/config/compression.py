@@ -0,0 +1,214 @@
+"""
+Response compression for API responses.
+
+``CompressionMiddleware`` picks the best encoding the client accepts
+(``zstd``, ``br`` or ``gzip``; the first two only when the zstandard /
+brotli packages are installed), compresses bodies of compressible types
+larger than ``COMPRESSION["MIN_SIZE"]`` and compresses streaming
+responses incrementally.  Static files are left to WhiteNoise, which
+serves them precompressed before this middleware runs.
+
+Views can set ``response.compressed_cache = (key, timeout)``: the
+compressed body is then stored in the cache under that key (plus the
+encoding) and reused by later responses with the same key, so cached
+list pages are compressed once per encoding rather than on every hit.
+"""
+
+import re
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/javascript",
+    "application/vnd.oai.openapi",
+    "text/",
+)
+
+_accept_encoding_re = re.compile(r"\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?")
+
+
+class _Gzip:
+    name = "gzip"
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        compressor = self.stream()
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self):
+        # wbits=31: zlib stream with a gzip header and trailer.
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+
+class _Brotli:
+    name = "br"
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self):
+        return _BrotliStream(brotli.Compressor(quality=self.level))
+
+
+class _BrotliStream:
+    # zlib's compress-object interface over a brotli Compressor.
+    def __init__(self, compressor):
+        self.compress = compressor.process
+        self.flush = compressor.finish
+
+
+class _Zstd:
+    name = "zstd"
+
+    def __init__(self, level):
+        self.compressor = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def stream(self):
+        return self.compressor.compressobj()
+
+
+def _codecs(levels):
+    codecs = []
+    if zstandard is not None:
+        codecs.append(_Zstd(levels["zstd"]))
+    if brotli is not None:
+        codecs.append(_Brotli(levels["br"]))
+    codecs.append(_Gzip(levels["gzip"]))
+    return codecs
+
+
+def parse_accept_encoding(header):
+    """``{coding: q}`` for an ``Accept-Encoding`` header."""
+    accepted = {}
+    for part in header.split(","):
+        match = _accept_encoding_re.match(part)
+        if not match or not match.group(1):
+            continue
+        try:
+            quality = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+        accepted[match.group(1).lower()] = quality
+    return accepted
+
+
+def negotiate(header, codecs):
+    """The accepted codec with the highest q-value; server preference breaks ties."""
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for codec in codecs:
+        quality = accepted.get(codec.name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
+
+
+def _is_compressible(response):
+    content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith("+json")
+
+
+def _compress_stream(codec, chunks):
+    compressor = codec.stream()
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def _acompress_stream(codec, chunks):
+    compressor = codec.stream()
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class CompressionMiddleware:
+    """Compress responses with the best encoding in ``Accept-Encoding``."""
+
+    sync_capable = async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = settings.COMPRESSION
+        self.enabled = config["ENABLED"]
+        self.min_size = config["MIN_SIZE"]
+        self.codecs = _codecs(config["LEVELS"])
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        if not self.enabled or response.has_header("Content-Encoding") or not _is_compressible(response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+        codec = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""), self.codecs)
+        if codec is None:
+            return response
+
+        if response.streaming:
+            compress_stream = _acompress_stream if response.is_async else _compress_stream
+            response.streaming_content = compress_stream(codec, response.streaming_content)
+            del response["Content-Length"]
+        else:
+            response.content = self._compress(codec, response)
+            response["Content-Length"] = str(len(response.content))
+
+        # The compressed representation is not byte-identical to the original.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = codec.name
+        return response
+
+    def _compress(self, codec, response):
+        cached = getattr(response, "compressed_cache", None)
+        if cached is None:
+            return codec.compress(response.content)
+        key, timeout = cached
+        key = f"{key}:{codec.name}"
+        body = cache.get(key)
+        if body is None:
+            body = codec.compress(response.content)
+            cache.set(key, body, timeout=timeout)
+        return body
@@ -0,0 +1,32 @@
+"""
+Database helpers shared by the middleware.
+
+Under ASGI the ORM runs in the request's sync thread (``sync_to_async``
+with ``thread_sensitive=True``), and each thread has its own connection,
+so a ``connection.execute_wrapper`` entered on the event loop would not
+see the request's queries.  ``aexecute_wrapper`` installs the hook on the
+connection of that sync thread instead.
+"""
+
+from contextlib import asynccontextmanager
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+
+
+def _add(wrapper):
+    connection.execute_wrappers.append(wrapper)
+
+
+def _remove(wrapper):
+    connection.execute_wrappers.remove(wrapper)
+
+
+@asynccontextmanager
+async def aexecute_wrapper(wrapper):
+    """Async twin of ``connection.execute_wrapper(wrapper)``."""
+    await sync_to_async(_add)(wrapper)
+    try:
+        yield
+    finally:
+        await sync_to_async(_remove)(wrapper)
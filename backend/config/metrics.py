@@ -0,0 +1,315 @@
+"""
+Request metrics in the Prometheus text format.
+
+``MetricsMiddleware`` records, per URL name: request counts by method and
+status, a latency histogram, and the number and time of SQL queries.
+``jobs.cache`` counts response-cache hits, stale hits and misses.
+
+Recording takes no lock: each thread updates its own shard (plain dicts
+only that thread writes), and readers merge copies of all shards.
+
+With ``METRICS["DIR"]`` set, every process also writes its totals to
+``<DIR>/<pid>.json`` from a background thread every ``FLUSH_INTERVAL``
+seconds (and when a gunicorn worker exits, see ``gunicorn.conf.py``).  ``GET /metrics``
+adds up the files of all processes (its own totals read live), so any
+worker answers for the whole server.  Only counters and histograms are
+kept, which sum correctly across workers, and the files of dead workers
+stay in the sum, so the totals never go down while the server runs.
+``gunicorn.conf.py`` points ``METRICS_DIR`` at a temporary directory
+and empties it when the server starts.
+"""
+
+import hmac
+import json
+import os
+import threading
+import time
+from math import inf
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_safe
+
+from .db import aexecute_wrapper
+from .query_budgets import query_budget
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METHODS = ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+
+
+class Metric:
+    """A named counter or histogram; samples are keyed by label values."""
+
+    def __init__(self, registry, kind, name, documentation, labels, buckets=()):
+        self.registry = registry
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets) + (inf,)
+
+    def inc(self, *values, amount=1):
+        shard = self.registry.shard()
+        key = (self.name, values)
+        shard[key] = shard.get(key, 0) + amount
+
+    def observe(self, value, *values):
+        shard = self.registry.shard()
+        key = (self.name, values)
+        counts = shard.get(key)
+        if counts is None:
+            # One count per bucket (not cumulative), then the sum.
+            counts = shard[key] = [0] * (len(self.buckets) + 1)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        counts[-1] += value
+
+
+class Registry:
+    """Metric definitions plus the per-thread shards holding their samples."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.reset()
+        os.register_at_fork(after_in_child=self.reset)
+
+    def counter(self, name, documentation, labels=()):
+        return self._define(Metric(self, "counter", name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        return self._define(Metric(self, "histogram", name, documentation, labels, buckets))
+
+    def _define(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def reset(self):
+        """Drop all samples (a forked child must not repeat its parent's)."""
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+
+    def samples(self):
+        """This process's totals: ``{(name, label values): value or counts}``."""
+        totals = {}
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # dict.copy() and list() are atomic, so writers need no lock.
+            for key, value in shard.copy().items():
+                _add(totals, key, list(value) if isinstance(value, list) else value)
+        return totals
+
+    def start_flushing(self):
+        """Write this process's totals to ``METRICS["DIR"]`` in the background."""
+        if self._flusher is None and settings.METRICS["DIR"]:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flusher", daemon=True)
+                    self._flusher.start()
+
+    def _flush_loop(self):
+        written = None
+        while True:
+            time.sleep(settings.METRICS["FLUSH_INTERVAL"])
+            samples = self.samples()
+            if samples != written:
+                self.flush(samples)
+                written = samples
+
+    def flush(self, samples=None):
+        """Write this process's totals to the metrics directory, if any."""
+        directory = settings.METRICS["DIR"]
+        if not directory:
+            return
+        samples = self.samples() if samples is None else samples
+        with self._flush_lock:
+            path = Path(directory) / f"{os.getpid()}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = path.with_suffix(".tmp")
+            temporary.write_text(json.dumps([[name, list(values), value] for (name, values), value in samples.items()]))
+            os.replace(temporary, path)
+
+    def collect(self):
+        """Totals of all processes: the live ones of this one plus the others' files."""
+        totals = self.samples()
+        directory = settings.METRICS["DIR"]
+        if directory:
+            own = f"{os.getpid()}.json"
+            for path in Path(directory).glob("*.json"):
+                if path.name == own:
+                    continue
+                try:
+                    samples = json.loads(path.read_text())
+                except (OSError, ValueError):
+                    # Removed or replaced between glob and read.
+                    continue
+                for name, values, value in samples:
+                    _add(totals, (name, tuple(values)), value)
+        return totals
+
+    def render(self):
+        """The Prometheus text exposition of ``collect()``."""
+        by_metric = {}
+        for (name, values), value in self.collect().items():
+            metric = self.metrics.get(name)
+            if metric is not None and len(values) == len(metric.labels):
+                by_metric.setdefault(name, []).append((values, value))
+        lines = []
+        for name, samples in sorted(by_metric.items()):
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for values, value in sorted(samples, key=lambda sample: sample[0]):
+                labels = list(zip(metric.labels, values))
+                if metric.kind == "counter":
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets, value):
+                    cumulative += count
+                    le = "+Inf" if bound == inf else _number(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _add(totals, key, value):
+    current = totals.get(key)
+    if current is None:
+        totals[key] = value
+    elif isinstance(current, list):
+        for index, count in enumerate(value):
+            current[index] += count
+    else:
+        totals[key] = current + value
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{label}="{_escape(value)}"' for label, value in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+REQUESTS = registry.counter(
+    "jobboard_http_requests_total", "HTTP requests by URL name, method and status.", ["view", "method", "status"]
+)
+LATENCY = registry.histogram(
+    "jobboard_http_request_duration_seconds", "Time to produce the response.", ["view", "method"]
+)
+SQL_QUERIES = registry.counter("jobboard_db_queries_total", "SQL queries run by requests.", ["view"])
+SQL_TIME = registry.counter("jobboard_db_query_seconds_total", "Time spent in SQL queries by requests.", ["view"])
+CACHE = registry.counter(
+    "jobboard_response_cache_total", "Response cache lookups by scope and outcome (hit, stale, miss).",
+    ["scope", "outcome"],
+)
+
+
+class SQLTimer:
+    """``connection.execute_wrapper`` hook adding up queries and their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """Record the count, latency and SQL work of every request."""
+
+    sync_capable = async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timer = SQLTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        self.observe(request, response, timer, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        timer = SQLTimer()
+        start = time.perf_counter()
+        async with aexecute_wrapper(timer):
+            response = await self.get_response(request)
+        self.observe(request, response, timer, time.perf_counter() - start)
+        return response
+
+    def observe(self, request, response, timer, elapsed):
+        match = request.resolver_match
+        # Unmatched paths share one label so that scanners cannot create
+        # a series per URL.
+        view = match.view_name if match and match.view_name else "unmatched"
+        method = request.method if request.method in METHODS else "other"
+        REQUESTS.inc(view, method, str(response.status_code))
+        LATENCY.observe(elapsed, view, method)
+        if timer.count:
+            SQL_QUERIES.inc(view, amount=timer.count)
+            SQL_TIME.inc(view, amount=timer.seconds)
+        registry.start_flushing()
+
+
+@query_budget(0)
+@require_safe
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint; requires ``METRICS_TOKEN`` as a bearer
+    token, which only ``DEBUG`` may go without.
+    """
+    config = settings.METRICS
+    if not config["ENABLED"]:
+        raise Http404
+    if not config["TOKEN"]:
+        if settings.DEBUG:
+            return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
+        return HttpResponse("Set METRICS_TOKEN to serve metrics.\n", status=403, content_type="text/plain")
+    expected = f"Bearer {config['TOKEN']}"
+    if not hmac.compare_digest(request.META.get("HTTP_AUTHORIZATION", ""), expected):
+        return HttpResponse("Invalid metrics token.\n", status=401, content_type="text/plain")
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
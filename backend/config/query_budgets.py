@@ -0,0 +1,109 @@
+"""
+Per-view SQL query budgets.
+
+Views declare the most queries one request may run, independent of the
+page size and of how much data is in the database::
+
+    class JobPostingDetailView(...):
+        query_budget = {"GET": 2, "PATCH": 16}
+
+    @query_budget(2)
+    @api_view(["GET"])
+    def salary_stats(request):
+        ...
+
+An ``int`` applies to every method; ``HEAD`` uses the ``GET`` budget.  A
+callable is given the response and returns the budget of that request,
+for views whose work comes in fixed-size steps (an import, per batch).
+Budgets of writes include creating an employer's stats row or a salary
+bucket on first use.  The ``performance`` app's tests enforce the budgets at growing data
+volumes and page sizes.  In development ``QueryBudgetMiddleware`` logs
+every request that goes over its view's budget.
+"""
+
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from .db import aexecute_wrapper
+
+logger = logging.getLogger(__name__)
+
+
+def query_budget(budget):
+    """Declare the query budget of a function-based view."""
+
+    def decorator(view):
+        view.query_budget = budget
+        return view
+
+    return decorator
+
+
+def get_query_budget(view, method, response=None):
+    """Budget of ``view`` (a resolved view function) for ``method``, or ``None``."""
+    budget = getattr(view, "query_budget", None)
+    if budget is None:
+        budget = getattr(getattr(view, "view_class", None), "query_budget", None)
+    if isinstance(budget, dict):
+        budget = budget.get("GET" if method == "HEAD" else method)
+    if callable(budget):
+        return budget(response)
+    return budget
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` hook counting the queries it sees."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMiddleware:
+    """Log requests whose view ran more queries than its ``query_budget``."""
+
+    sync_capable = async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGETS["LOG_VIOLATIONS"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        self.check(request, response, counter)
+        return response
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        async with aexecute_wrapper(counter):
+            response = await self.get_response(request)
+        self.check(request, response, counter)
+        return response
+
+    def check(self, request, response, counter):
+        match = request.resolver_match
+        budget = get_query_budget(match.func, request.method, response) if match else None
+        if budget is not None and counter.count > budget:
+            logger.warning(
+                "%s %s ran %d SQL queries; the budget of %s is %d.",
+                request.method,
+                request.path,
+                counter.count,
+                match.view_name,
+                budget,
+            )
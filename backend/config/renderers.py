@@ -0,0 +1,65 @@
+"""
+Faster drop-in renderers for the API.
+
+``ORJSONRenderer`` produces the same bytes as DRF's ``JSONRenderer``
+(compact, UTF-8, ``Z``-suffixed millisecond datetimes; decimal fields
+such as salaries reach it as strings, ``COERCE_DECIMAL_TO_STRING``)
+using orjson; it falls back to ``JSONRenderer`` when orjson is not
+installed, when an indented response is requested or for values orjson
+cannot encode.  ``MessagePackRenderer`` answers
+``Accept: application/msgpack`` and is only enabled when msgpack is
+installed (see ``REST_FRAMEWORK`` in settings).
+"""
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # Everything orjson leaves to us (datetimes included, so they are
+    # formatted exactly like DRF's encoder does).
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` backed by orjson."""
+
+    options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data, default=_default, option=self.options)
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer: keep the output valid JavaScript.
+        return content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Render responses as MessagePack; types JSON lacks are encoded like the JSON renderer does."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_default, use_bin_type=True)
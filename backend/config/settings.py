@@ -3,6 +3,7 @@ Django settings for Job Board Platform.
 """
 
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from datetime import timedelta
 
@@ -43,11 +44,17 @@ INSTALLED_APPS = [
     "accounts",
     "jobs",
     "applications",
+    "performance",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "config.metrics.MetricsMiddleware",
+    "performance.profiling.ProfilingMiddleware",
+    "performance.slow_queries.SlowQueryMiddleware",
+    "config.query_budgets.QueryBudgetMiddleware",
+    "config.static.StaticFilesMiddleware",
+    "config.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -83,9 +90,17 @@ WSGI_APPLICATION = "config.wsgi.application"
 # ---------------------------------------------------------------------------
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Experimental async GET views for the public job/category reads
+# (jobs.async_views); turn on when serving config.asgi.
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "False").lower() in ("true", "1", "yes")
+
+# Under ASGI every request runs its sync code in a new thread, so kept
+# connections are never reused: close them after each request there.
+CONN_MAX_AGE = int(os.getenv("CONN_MAX_AGE", "0" if ASYNC_VIEWS else "600"))
+
 if DATABASE_URL:
     DATABASES = {
-        "default": dj_database_url.parse(DATABASE_URL, conn_max_age=600),
+        "default": dj_database_url.parse(DATABASE_URL, conn_max_age=CONN_MAX_AGE),
     }
 else:
     DATABASES = {
@@ -96,6 +111,82 @@ else:
     }
 
 
+# ---------------------------------------------------------------------------
+# Cache – Redis when configured (required to share invalidation across
+# gunicorn workers), per-process memory otherwise
+# ---------------------------------------------------------------------------
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Versioned cache for the public job/category list responses (jobs.cache).
+RESPONSE_CACHE = {
+    "ENABLED": os.getenv("RESPONSE_CACHE_ENABLED", "True").lower() in ("true", "1", "yes"),
+    "TTL": int(os.getenv("RESPONSE_CACHE_TTL", "60")),
+    "MAX_STALE": int(os.getenv("RESPONSE_CACHE_MAX_STALE", "300")),
+}
+
+# gzip/brotli/zstd compression of API responses (config.compression).
+COMPRESSION = {
+    "ENABLED": os.getenv("COMPRESSION_ENABLED", "True").lower() in ("true", "1", "yes"),
+    "MIN_SIZE": int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    "LEVELS": {"gzip": 6, "br": 5, "zstd": 3},
+}
+
+# Log requests over their view's SQL query budget (config.query_budgets).
+QUERY_BUDGETS = {
+    "LOG_VIOLATIONS": os.getenv("QUERY_BUDGET_LOGGING", str(DEBUG)).lower() in ("true", "1", "yes"),
+}
+
+# Prometheus metrics at /metrics (config.metrics).  DIR holds one file per
+# process so that every gunicorn worker reports the totals of all of them;
+# gunicorn.conf.py sets it.  Outside DEBUG the endpoint is off unless
+# METRICS_TOKEN is set, and refuses to serve without one.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS = {
+    "ENABLED": os.getenv("METRICS_ENABLED", str(DEBUG or bool(METRICS_TOKEN))).lower() in ("true", "1", "yes"),
+    "DIR": os.getenv("METRICS_DIR"),
+    "FLUSH_INTERVAL": float(os.getenv("METRICS_FLUSH_INTERVAL", "1")),
+    "TOKEN": METRICS_TOKEN,
+}
+
+# On-demand request profiling (performance.profiling): admins send
+# ``X-Profile: 1``; SAMPLE_RATE profiles that fraction of all requests.
+PROFILING = {
+    "ENABLED": os.getenv("PROFILING_ENABLED", "True").lower() in ("true", "1", "yes"),
+    "SAMPLE_RATE": float(os.getenv("PROFILING_SAMPLE_RATE", "0")),
+    "MODE": os.getenv("PROFILING_MODE", "sampling"),
+    "INTERVAL": 0.001,
+    "MAX_QUERIES": 500,
+    "MAX_PROFILES": 1000,
+}
+
+# Slow query log with EXPLAIN plans (performance.slow_queries).
+SLOW_QUERIES = {
+    "ENABLED": os.getenv("SLOW_QUERY_LOG_ENABLED", "True").lower() in ("true", "1", "yes"),
+    "THRESHOLD_MS": float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100")),
+    "EXPLAIN": True,
+    # Parameters can hold personal data (emails, names): only store them
+    # when asked to.
+    "CAPTURE_PARAMS": os.getenv("SLOW_QUERY_CAPTURE_PARAMS", "False").lower() in ("true", "1", "yes"),
+}
+
+# Spelling correction ("did you mean") for zero-result job searches (jobs.fuzzy).
+FUZZY_SEARCH_ENABLED = os.getenv("FUZZY_SEARCH_ENABLED", "True").lower() in ("true", "1", "yes")
+
+
 # ---------------------------------------------------------------------------
 # Auth
 # ---------------------------------------------------------------------------
@@ -112,9 +203,24 @@ AUTH_PASSWORD_VALIDATORS = [
 # ---------------------------------------------------------------------------
 # REST Framework
 # ---------------------------------------------------------------------------
+# orjson speeds up JSON when installed (config.renderers falls back to the
+# stdlib otherwise); MessagePack is only offered when msgpack is installed.
+MSGPACK_ENABLED = find_spec("msgpack") is not None
+
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": (
+        "config.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        *(("config.renderers.MessagePackRenderer",) if MSGPACK_ENABLED else ()),
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "config.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+        *(("config.parsers.MessagePackParser",) if MSGPACK_ENABLED else ()),
+    ),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
@@ -129,9 +235,11 @@ REST_FRAMEWORK = {
         "rest_framework.throttling.UserRateThrottle",
     ),
     "DEFAULT_THROTTLE_RATES": {
-        "anon": "100/hour",
+        # Overridable so that load tests (benchmark_concurrency) are not throttled.
+        "anon": os.getenv("ANON_THROTTLE_RATE", "100/hour"),
         "user": "1000/hour",
         "auth": "10/minute",
+        "typeahead": "120/minute",
     },
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
@@ -146,8 +254,18 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # Tokens carry the user's role and token version, so requests
+    # authenticate without loading the user (accounts.authentication).
+    "TOKEN_USER_CLASS": "accounts.authentication.TokenUser",
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.TokenRefreshSerializer",
 }
 
+# Seconds the auth state of a token's user (active flag, token version,
+# role) is cached for authentication; role and active flag changes reach
+# other workers within this time unless the cache is shared (REDIS_URL).
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))
+
 
 # ---------------------------------------------------------------------------
 # drf-spectacular (Swagger / OpenAPI)
@@ -166,6 +284,7 @@ SPECTACULAR_SETTINGS = {
         {"name": "Categories", "description": "Job category management (admin only for CUD)"},
         {"name": "Jobs", "description": "Job posting CRUD with filtering, sorting, and pagination"},
         {"name": "Applications", "description": "Job application management"},
+        {"name": "Performance", "description": "Stored request profiles (admin only)"},
     ],
 }
 
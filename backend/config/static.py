@@ -0,0 +1,39 @@
+"""
+WhiteNoise static file serving for both WSGI and ASGI.
+
+``WhiteNoiseMiddleware`` is sync-only, and a single sync middleware makes
+Django run every middleware above it in a thread as well.
+``StaticFilesMiddleware`` adds the async path: the lookup is a dict read
+(a file system check with autorefresh, in development), and only serving
+a file is handed to a thread.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """``WhiteNoiseMiddleware`` that also runs natively under ASGI."""
+
+    sync_capable = async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -7,6 +7,8 @@ from django.urls import path, include
 from django.http import JsonResponse
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
+from .metrics import metrics_view
+
 
 def api_root(request):
     """API root — welcome message with available endpoints."""
@@ -20,6 +22,7 @@ def api_root(request):
             "categories": "/api/categories/",
             "jobs": "/api/jobs/",
             "applications": "/api/applications/",
+            "performance": "/api/performance/",
         }
     })
 
@@ -27,11 +30,13 @@ def api_root(request):
 urlpatterns = [
     path("", api_root, name="api-root"),
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     # App URLs
     path("api/auth/", include("accounts.urls")),
     path("api/categories/", include("jobs.urls_categories")),
     path("api/jobs/", include("jobs.urls_jobs")),
     path("api/applications/", include("applications.urls")),
+    path("api/performance/", include("performance.urls")),
     # OpenAPI / Swagger
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Build in-process indexes before this worker serves its first request.
+from jobs import fuzzy, typeahead  # noqa: E402
+
+typeahead.warm_up()
+fuzzy.warm_up()
@@ -0,0 +1,27 @@
+"""
+gunicorn settings, read automatically when gunicorn starts in this directory.
+
+Workers write their metrics to one file each under METRICS_DIR so that
+/metrics reports the whole server (see config/metrics.py).
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+metrics_dir = Path(os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), "job-board-metrics")))
+
+
+def on_starting(server):
+    # Start every server from zero: the files of a previous run would be
+    # added to this run's totals.
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    for path in metrics_dir.glob("*.json"):
+        path.unlink(missing_ok=True)
+
+
+def worker_exit(server, worker):
+    # Only workers that loaded the application have metrics to write.
+    if "config.metrics" in sys.modules:
+        sys.modules["config.metrics"].registry.flush()
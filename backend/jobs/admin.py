@@ -3,12 +3,12 @@ Admin configuration for jobs app.
 """
 
 from django.contrib import admin
-from .models import JobCategory, JobPosting
+from .models import EmployerStats, JobCategory, JobPosting, SalaryBucket
 
 
 @admin.register(JobCategory)
 class JobCategoryAdmin(admin.ModelAdmin):
-    list_display = ["name", "created_at"]
+    list_display = ["name", "active_job_count", "created_at"]
     search_fields = ["name"]
 
 
@@ -21,8 +21,30 @@ class JobPostingAdmin(admin.ModelAdmin):
         "location",
         "job_type",
         "is_active",
+        "application_count",
+        "saved_count",
         "created_at",
     ]
-    list_filter = ["job_type", "is_active", "category"]
+    list_filter = ["job_type", "is_active", "category", "location_country"]
     search_fields = ["title", "description", "location"]
     ordering = ["-created_at"]
+
+
+@admin.register(EmployerStats)
+class EmployerStatsAdmin(admin.ModelAdmin):
+    list_display = [
+        "employer",
+        "total_jobs",
+        "active_jobs",
+        "total_applications",
+        "updated_at",
+    ]
+    search_fields = ["employer__email", "employer__company_name"]
+    readonly_fields = ["updated_at"]
+
+
+@admin.register(SalaryBucket)
+class SalaryBucketAdmin(admin.ModelAdmin):
+    list_display = ["dimension", "value", "field", "bucket", "count"]
+    list_filter = ["dimension", "field"]
+    search_fields = ["value"]
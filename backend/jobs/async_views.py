@@ -0,0 +1,132 @@
+"""
+Async read path for the public job and category endpoints (experimental).
+
+With ``ASYNC_VIEWS`` on (set it when serving ``config.asgi``), ``as_view()`` of
+a view using ``AsyncReadMixin`` returns an ``async def`` view.  ``GET``
+and ``HEAD`` go through ``adispatch()``, the async twin of DRF's
+``dispatch()``: the rows are counted and fetched with the async ORM
+(``acount()``, ``aaggregate()``, ``aget()``, ``async for``), including
+keyset and page-number pagination, and the response cache, conditional
+requests and column projection run through their ``a``-prefixed methods.
+Filtering and serialization run on the event loop, except for a
+serializer that may query (``serializer_queries()``, e.g. a posting's
+pending counter shards).
+
+Some steps still run in the request's sync thread: authentication and
+throttling, and every response cache access - Django's cache backends
+have no native async methods (``cache.aget()`` and friends wrap the sync
+calls the same way).  A cached list therefore costs a thread hop or two
+per request, and the sync workers (``config.wsgi``, what the Dockerfile
+and Procfile run) remain the supported deployment; compare both with
+``manage.py benchmark_concurrency`` before switching.
+
+Under WSGI ``as_view()`` returns the regular DRF view, so both servers
+answer with identical responses.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import mixins
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from .pagination import apaginate_page_numbers
+
+ASYNC_METHODS = ("GET", "HEAD")
+
+
+class AsyncReadMixin:
+    """Generic-view mixin serving ``GET``/``HEAD`` asynchronously when ``ASYNC_VIEWS`` is on."""
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        if settings.ASYNC_VIEWS:
+            return cls.as_async_view(**initkwargs)
+        return super().as_view(**initkwargs)
+
+    @classmethod
+    def as_async_view(cls, **initkwargs):
+        sync_view = super().as_view(**initkwargs)
+
+        async def view(request, *args, **kwargs):
+            if request.method not in ASYNC_METHODS:
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.adispatch(request, *args, **kwargs)
+
+        # What DRF's as_view() sets, for schema generation and query budgets.
+        view.cls = view.view_class = cls
+        view.initkwargs = view.view_initkwargs = initkwargs
+        view.__doc__ = cls.__doc__
+        view.__module__ = cls.__module__
+        view.__name__ = view.__qualname__ = cls.__name__
+        return csrf_exempt(view)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """``APIView.dispatch()`` for ``GET``/``HEAD``."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            # Authentication, permissions and throttles.
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if isinstance(self, mixins.ListModelMixin):
+                response = await self.alist(request, *args, **kwargs)
+            else:
+                response = await self.aretrieve(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def afilter_queryset(self, queryset):
+        # The filter backends only build the query; running it is up to the caller.
+        return self.filter_queryset(queryset)
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        if hasattr(self.paginator, "apaginate_queryset"):
+            return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+        if type(self.paginator).paginate_queryset is PageNumberPagination.paginate_queryset:
+            return await apaginate_page_numbers(self.paginator, queryset, self.request)
+        return await sync_to_async(self.paginate_queryset)(queryset)
+
+    def serializer_queries(self, serializer):
+        """Whether ``serializer.data`` may run queries, which the event loop must not."""
+        return False
+
+    async def aserialize(self, serializer):
+        if self.serializer_queries(serializer):
+            return await sync_to_async(lambda: serializer.data)()
+        return serializer.data
+
+    async def aget_object(self):
+        """``get_object()`` through the async ORM."""
+        queryset = await self.afilter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(await self.aserialize(serializer))
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(await self.aserialize(serializer))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(await self.aget_object())
+        return Response(await self.aserialize(serializer))
@@ -0,0 +1,352 @@
+"""
+Versioned response cache for the public job and category list endpoints.
+
+Entries are keyed on the view scope and the normalized query string and
+store the response payload together with the list version they were
+built from.  Any ``JobPosting``/``JobCategory`` write bumps the version
+(see ``jobs.signals``), which turns every entry stale at once without
+having to find and delete keys.
+
+A stale entry - old version or past ``TTL`` - is still served for up to
+``MAX_STALE`` seconds while a single worker, elected with ``cache.add``,
+rebuilds it in the background, on a fresh view instance for a request
+reduced to the normalized query.  Pagination links are stored as that
+normalized query and made absolute again for each request, so one
+requester's host or untracked parameters (``utm_*``) never leak into
+another's response.
+
+Configure with the ``RESPONSE_CACHE`` setting.  The version lives in the
+cache backend, so it must be shared between workers (Redis, via
+``REDIS_URL``) for a write to invalidate the entries of all of them.
+With the default per-process ``LocMemCache`` only the writing worker
+sees the bump; the others keep serving their entries until ``TTL`` plus
+``MAX_STALE`` has passed.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+from django.http import HttpRequest, QueryDict
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from config import metrics
+from .conditional import ConditionalGetMixin, make_etag, not_modified, set_validators
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "jobs:list-version"
+KEY_PREFIX = "jobs:resp"
+STATS_PREFIX = "jobs:resp-stats"
+
+DEFAULTS = {
+    "ENABLED": True,
+    # Seconds an entry is served as fresh.
+    "TTL": 60,
+    # Seconds past freshness (or past a version bump) a stale entry may
+    # still be served while it is being refreshed.
+    "MAX_STALE": 300,
+    # Seconds a refresh lock is held before another worker may retry.
+    "LOCK_TIMEOUT": 30,
+    # Refresh stale entries in a background thread; when False the refresh
+    # runs inline after the stale payload has been picked.
+    "BACKGROUND_REFRESH": True,
+}
+
+HIT, STALE, MISS = "hit", "stale", "miss"
+OUTCOMES = (HIT, STALE, MISS)
+
+LINK_FIELDS = ("next", "previous")
+# Request headers a refresh keeps, so that it builds URLs like the request.
+REFRESH_META = ("HTTP_HOST", "SERVER_NAME", "SERVER_PORT", "wsgi.url_scheme", "HTTP_X_FORWARDED_PROTO")
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "RESPONSE_CACHE", {})}
+
+
+def get_version():
+    """Return the current list version, initialising it if needed."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a flushed cache never reuses old versions.
+        cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    """Invalidate every cached list response."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def normalize_query(query_params, allowed):
+    """Canonical query string: known params only, sorted, empty values dropped."""
+    items = []
+    for name in sorted(set(query_params) & set(allowed)):
+        values = sorted(v for v in query_params.getlist(name) if v != "")
+        # Keep an empty cursor: it switches the list into keyset mode.
+        if not values and name == "cursor":
+            values = [""]
+        items.extend((name, value) for value in values)
+    return urlencode(items)
+
+
+def make_key(scope, normalized_query):
+    digest = hashlib.sha1(normalized_query.encode()).hexdigest()
+    return f"{KEY_PREFIX}:{scope}:{digest}"
+
+
+def record(scope, outcome):
+    metrics.CACHE.inc(scope, outcome)
+    key = f"{STATS_PREFIX}:{scope}:{outcome}"
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def get_stats(scopes):
+    """Hit/stale/miss counts and hit ratio per scope."""
+    keys = [f"{STATS_PREFIX}:{scope}:{outcome}" for scope in scopes for outcome in OUTCOMES]
+    values = cache.get_many(keys)
+    stats = {}
+    for scope in scopes:
+        counts = {
+            outcome: values.get(f"{STATS_PREFIX}:{scope}:{outcome}", 0)
+            for outcome in OUTCOMES
+        }
+        total = sum(counts.values())
+        counts["hit_ratio"] = round((counts[HIT] + counts[STALE]) / total, 4) if total else None
+        stats[scope] = counts
+    return stats
+
+
+def _plain(data):
+    # Paginated payloads hold ReturnDict/ReturnList objects that reference
+    # their serializer; store the JSON-equivalent structure instead.
+    return json.loads(JSONRenderer().render(data))
+
+
+def _store(key, data, version, config):
+    entry = {"version": version, "created": time.time(), "data": _plain(data)}
+    cache.set(key, entry, timeout=config["TTL"] + config["MAX_STALE"])
+    return entry
+
+
+def _refresh(key, compute, version, config):
+    try:
+        _store(key, compute(), version, config)
+    except Exception:
+        logger.exception("Background refresh of %s failed", key)
+    finally:
+        cache.delete(f"{key}:lock")
+
+
+def _refresh_in_background(key, compute, version, config):
+    if not config["BACKGROUND_REFRESH"]:
+        _refresh(key, compute, version, config)
+        return
+
+    def run():
+        close_old_connections()
+        try:
+            _refresh(key, compute, version, config)
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=run, name=f"refresh {key}", daemon=True).start()
+
+
+def get_or_compute(scope, normalized_query, compute, refresh=None):
+    """
+    Return ``(entry, outcome)`` for a cached list response.
+
+    ``entry`` holds the payload under ``data`` plus the ``version`` and
+    ``created`` time it was built with.
+
+    ``compute`` builds the response payload inline on a miss; ``refresh``
+    (``compute`` by default) builds it from the refreshing worker when a
+    stale entry is served, possibly after the request has finished.
+    """
+    config = get_config()
+    key = make_key(scope, normalized_query)
+    version, entry, outcome = _lookup(scope, key, refresh or compute, config)
+    if entry is None:
+        entry = _store_miss(scope, key, compute(), version, config)
+    return entry, outcome
+
+
+async def aget_or_compute(scope, normalized_query, compute, refresh=None):
+    """``get_or_compute()`` for a coroutine function ``compute``."""
+    config = get_config()
+    key = make_key(scope, normalized_query)
+    refresh = refresh or async_to_sync(compute)
+    version, entry, outcome = await sync_to_async(_lookup)(scope, key, refresh, config)
+    if entry is None:
+        entry = await sync_to_async(_store_miss)(scope, key, await compute(), version, config)
+    return entry, outcome
+
+
+def relative_links(data, allowed):
+    """Replace the absolute pagination links of ``data`` by their normalized query (``?page=2``)."""
+    if isinstance(data, dict):
+        for field in LINK_FIELDS:
+            if data.get(field):
+                query = QueryDict(urlsplit(data[field]).query)
+                data[field] = f"?{normalize_query(query, allowed)}"
+    return data
+
+
+def _lookup(scope, key, compute, config):
+    """``(version, entry, outcome)``; the entry is ``None`` on a miss."""
+    version = get_version()
+    entry = cache.get(key)
+    now = time.time()
+
+    if entry is not None:
+        age = now - entry["created"]
+        if entry["version"] == version and age < config["TTL"]:
+            record(scope, HIT)
+            return version, entry, HIT
+        if age < config["TTL"] + config["MAX_STALE"]:
+            if cache.add(f"{key}:lock", 1, timeout=config["LOCK_TIMEOUT"]):
+                _refresh_in_background(key, compute, version, config)
+            record(scope, STALE)
+            return version, entry, STALE
+    return version, None, MISS
+
+
+def _store_miss(scope, key, data, version, config):
+    entry = _store(key, data, version, config)
+    record(scope, MISS)
+    return entry
+
+
+class CachedListMixin(ConditionalGetMixin):
+    """
+    Serve ``list()`` through the versioned response cache.
+
+    Views set ``cache_scope`` and ``cache_query_params`` (the query
+    parameters that can change the response).  The ``ETag`` of a cached
+    response identifies the cache entry, so conditional requests are
+    answered without touching the database.
+    """
+
+    cache_scope = None
+    cache_query_params = ("page", "ordering")
+
+    def etag_salt(self):
+        # List rows embed related data (company, category) whose changes
+        # bump the list version without touching the aggregated columns.
+        return get_version()
+
+    def list(self, request, *args, **kwargs):
+        if not get_config()["ENABLED"]:
+            return super().list(request, *args, **kwargs)
+
+        def compute():
+            # Build the plain payload, skipping ConditionalGetMixin.list().
+            data = super(ConditionalGetMixin, self).list(request, *args, **kwargs).data
+            return relative_links(data, self.cache_query_params)
+
+        normalized = normalize_query(request.query_params, self.cache_query_params)
+        entry, outcome = get_or_compute(self.cache_scope, normalized, compute, self.refresher(normalized))
+        return self.cached_response(request, normalized, entry, outcome)
+
+    async def alist(self, request, *args, **kwargs):
+        if not get_config()["ENABLED"]:
+            return await super().alist(request, *args, **kwargs)
+
+        async def compute():
+            data = (await super(ConditionalGetMixin, self).alist(request, *args, **kwargs)).data
+            return relative_links(data, self.cache_query_params)
+
+        normalized = normalize_query(request.query_params, self.cache_query_params)
+        entry, outcome = await aget_or_compute(self.cache_scope, normalized, compute, self.refresher(normalized))
+        return self.cached_response(request, normalized, entry, outcome)
+
+    def refresher(self, normalized):
+        """
+        Build the payload for ``normalized`` on a new view instance.
+
+        The refresh may run in a background thread after this request has
+        finished, so it gets a request of its own: a ``GET`` of the same
+        path with only the normalized query.
+        """
+        request = HttpRequest()
+        request.method = "GET"
+        request.path = self.request.path
+        request.path_info = self.request._request.path_info
+        request.META = {key: self.request.META[key] for key in REFRESH_META if key in self.request.META}
+        request.META["QUERY_STRING"] = normalized
+        request.GET = QueryDict(normalized)
+        cls, args, kwargs = type(self), self.args, self.kwargs
+
+        def refresh():
+            view = cls()
+            view.setup(request, *args, **kwargs)
+            view.request = view.initialize_request(request, *args, **kwargs)
+            view.format_kwarg = None
+            data = super(ConditionalGetMixin, view).list(view.request, *args, **kwargs).data
+            return relative_links(data, view.cache_query_params)
+
+        return refresh
+
+    def absolute_links(self, request, data):
+        """Turn the stored pagination links back into URLs for ``request``."""
+        if not isinstance(data, dict) or not any(data.get(field) for field in LINK_FIELDS):
+            return data
+        # Parameters the cache ignores stay on the links, as DRF keeps them.
+        extra = [
+            (name, value)
+            for name, values in request.query_params.lists()
+            if name not in self.cache_query_params
+            for value in values
+        ]
+        base = request.build_absolute_uri(request.path)
+        data = dict(data)
+        for field in LINK_FIELDS:
+            if data.get(field):
+                items = parse_qsl(data[field][1:], keep_blank_values=True) + extra
+                data[field] = f"{base}?{urlencode(items)}" if items else base
+        return data
+
+    def cached_response(self, request, normalized, entry, outcome):
+        etag = make_etag(
+            request.accepted_renderer.format,
+            make_key(self.cache_scope, normalized),
+            entry["version"],
+            entry["created"],
+        )
+        last_modified = datetime.datetime.fromtimestamp(entry["created"], tz=datetime.timezone.utc)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            data = self.absolute_links(request, entry["data"])
+            response = set_validators(Response(data), etag, last_modified)
+            if request.accepted_renderer.format != "api":
+                # Let the compression middleware reuse its output for this entry
+                # (the browsable API's HTML is per user).  The links depend on
+                # the host and untracked parameters, so they are part of the key.
+                config = get_config()
+                links = [data.get(field) for field in LINK_FIELDS] if isinstance(data, dict) else []
+                links = hashlib.sha1(json.dumps(links).encode()).hexdigest()
+                response.compressed_cache = (
+                    f"{KEY_PREFIX}:compressed:{etag}:{request.accepted_media_type}:{links}",
+                    config["TTL"] + config["MAX_STALE"],
+                )
+        response["X-Cache"] = outcome.upper()
+        return response
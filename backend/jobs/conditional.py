@@ -0,0 +1,137 @@
+"""
+Conditional GET support (``ETag`` / ``Last-Modified``) for job endpoints.
+
+Validators are computed from a cheap query - an aggregate over the
+filtered list queryset, or a few columns of the detail row - before the
+serializer and paginator run, so a matching ``If-None-Match`` or
+``If-Modified-Since`` is answered with an empty ``304``.  ``alist()`` and
+``aretrieve()`` do the same for the async views (``jobs.async_views``).
+"""
+
+import calendar
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    return hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _timestamp(value):
+    return calendar.timegm(value.utctimetuple()) if value is not None else None
+
+
+def not_modified(request, etag, last_modified):
+    """Return a ``304`` response if the request's validators still match."""
+    response = get_conditional_response(
+        request, etag=quote_etag(etag), last_modified=_timestamp(last_modified)
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = quote_etag(etag)
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(_timestamp(last_modified))
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Add ``ETag``/``Last-Modified`` validators and ``304`` handling to
+    ``list()`` and ``retrieve()`` of a generic view.
+
+    ``list_validators`` are aggregates over the filtered queryset, named
+    ``last_modified*`` for timestamps.  ``detail_validators`` are columns
+    of the object row, the first of which is its modification time.
+
+    ``Last-Modified`` is only sent when every validator is a timestamp: a
+    count or a counter changes without moving them, and ``If-Modified-Since``
+    would then get a stale ``304``.  Such views answer ``If-None-Match`` only.
+    """
+
+    list_validators = {"last_modified": Max("updated_at"), "count": Count("pk")}
+    detail_validators = ("updated_at",)
+
+    def representation_key(self, request):
+        # The same data renders differently per format (JSON, browsable API, ...).
+        return request.accepted_renderer.format, request.get_full_path(), self.etag_salt()
+
+    def etag_salt(self):
+        """Extra input mixed into every ETag of this view."""
+        return ""
+
+    def get_list_validators(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.list_etag(request, queryset.aggregate(**self.list_validators))
+
+    async def aget_list_validators(self, request):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        return self.list_etag(request, await queryset.aaggregate(**self.list_validators))
+
+    def list_etag(self, request, values):
+        etag = make_etag(*self.representation_key(request), *sorted(values.items()))
+        if not all(name.startswith("last_modified") for name in values):
+            return etag, None
+        return etag, max((value for value in values.values() if value is not None), default=None)
+
+    def get_detail_validators(self, request):
+        return self.detail_etag(request, self.detail_validator_queryset().first())
+
+    async def aget_detail_validators(self, request):
+        return self.detail_etag(request, await self.detail_validator_queryset().afirst())
+
+    def detail_validator_queryset(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return (
+            self.get_queryset()
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values_list(*self.detail_validators)
+        )
+
+    def detail_etag(self, request, row):
+        if row is None:
+            return None, None
+        etag = make_etag(*self.representation_key(request), *row)
+        return etag, row[0] if len(row) == 1 else None
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.get_list_validators(request)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = set_validators(super().list(request, *args, **kwargs), etag, last_modified)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_detail_validators(request)
+        if etag is None:
+            # Let the regular lookup raise the 404.
+            return super().retrieve(request, *args, **kwargs)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = set_validators(
+                super().retrieve(request, *args, **kwargs), etag, last_modified
+            )
+        return response
+
+    async def alist(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_list_validators(request)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = set_validators(await super().alist(request, *args, **kwargs), etag, last_modified)
+        return response
+
+    async def aretrieve(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_detail_validators(request)
+        if etag is None:
+            return await super().aretrieve(request, *args, **kwargs)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = set_validators(await super().aretrieve(request, *args, **kwargs), etag, last_modified)
+        return response
@@ -0,0 +1,195 @@
+"""
+Denormalized counters for categories and job postings.
+
+``JobCategory.active_job_count``, ``JobPosting.application_count`` and
+``JobPosting.saved_count`` are adjusted with single ``UPDATE ... SET
+x = x + 1`` statements from the signal handlers, so reads never need a
+``COUNT``.  Postings flagged with ``counter_shards`` route their deltas to
+``JobPostingCounterShard`` rows instead; readers add the pending shard
+totals and ``reconcile()`` folds them back and repairs any drift.  It
+also folds the ``EmployerStatsShard`` rows of ``jobs.stats``.
+"""
+
+import random
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from applications.models import JobApplication
+from .models import EmployerStats, EmployerStatsShard, JobCategory, JobPosting, JobPostingCounterShard, SavedJob
+
+JOB_COUNTERS = ("application_count", "saved_count")
+
+
+def adjust_category_count(category_id, delta):
+    """Add ``delta`` to a category's active job count."""
+    if category_id is None or not delta:
+        return
+    queryset = JobCategory.objects.filter(pk=category_id)
+    if delta < 0:
+        queryset = queryset.filter(active_job_count__gte=-delta)
+    queryset.update(active_job_count=F("active_job_count") + delta)
+
+
+def adjust_job_counter(job, field, delta):
+    """
+    Add ``delta`` to one of a posting's counters.
+
+    ``job`` may be a ``JobPosting`` instance or a primary key; passing the
+    instance avoids a lookup of its ``counter_shards`` setting.
+    """
+    if field not in JOB_COUNTERS:
+        raise ValueError(f"Unknown job counter: {field}")
+    if isinstance(job, JobPosting):
+        job_id, shards = job.pk, job.counter_shards
+    else:
+        job_id = job
+        shards = (
+            JobPosting.objects.filter(pk=job_id)
+            .values_list("counter_shards", flat=True)
+            .first()
+        )
+    if not shards:
+        queryset = JobPosting.objects.filter(pk=job_id)
+        if delta < 0:
+            queryset = queryset.filter(**{f"{field}__gte": -delta})
+        queryset.update(**{field: F(field) + delta})
+        return
+
+    shard = random.randrange(shards)
+    queryset = JobPostingCounterShard.objects.filter(job_id=job_id, shard=shard)
+    if queryset.update(**{field: F(field) + delta}):
+        return
+    try:
+        with transaction.atomic():
+            JobPostingCounterShard.objects.create(job_id=job_id, shard=shard, **{field: delta})
+    except IntegrityError:
+        # Another writer created the shard row first.
+        queryset.update(**{field: F(field) + delta})
+
+
+def read_job_counter(job, field):
+    """Return a posting's counter including deltas still parked on shards."""
+    value = getattr(job, field)
+    if job.counter_shards:
+        pending = job.counter_shard_rows.aggregate(total=Sum(field))["total"]
+        value += pending or 0
+    return max(value, 0)
+
+
+def fold_counter_shards(job_ids=None):
+    """Move pending shard deltas into the posting columns; return postings folded."""
+    with transaction.atomic():
+        shards = JobPostingCounterShard.objects.select_for_update()
+        if job_ids is not None:
+            shards = shards.filter(job_id__in=job_ids)
+        totals = {}
+        shard_ids = []
+        for shard_id, job_id, *values in shards.values_list("pk", "job_id", *JOB_COUNTERS):
+            shard_ids.append(shard_id)
+            job_totals = totals.setdefault(job_id, dict.fromkeys(JOB_COUNTERS, 0))
+            for field, value in zip(JOB_COUNTERS, values):
+                job_totals[field] += value
+        for job_id, job_totals in totals.items():
+            JobPosting.objects.filter(pk=job_id).update(**{
+                field: Greatest(F(field) + delta, Value(0))
+                for field, delta in job_totals.items()
+            })
+        JobPostingCounterShard.objects.filter(pk__in=shard_ids).delete()
+        fold_employer_stats_shards()
+    return len(totals)
+
+
+def fold_employer_stats_shards():
+    """Move pending ``EmployerStatsShard`` deltas into the stats rows; return employers folded."""
+    fields = EmployerStatsShard.COUNTERS
+    with transaction.atomic():
+        shards = EmployerStatsShard.objects.select_for_update()
+        totals = {}
+        shard_ids = []
+        for shard_id, employer_id, *values in shards.values_list("pk", "employer_id", *fields):
+            shard_ids.append(shard_id)
+            employer_totals = totals.setdefault(employer_id, dict.fromkeys(fields, 0))
+            for field, value in zip(fields, values):
+                employer_totals[field] += value
+        for employer_id, employer_totals in totals.items():
+            EmployerStats.objects.filter(pk=employer_id).update(**{
+                field: Greatest(F(field) + delta, Value(0))
+                for field, delta in employer_totals.items()
+            })
+        EmployerStatsShard.objects.filter(pk__in=shard_ids).delete()
+    return len(totals)
+
+
+def _grouped_count(queryset, group_field):
+    """Correlated ``COUNT(*)`` subquery over ``queryset`` grouped by ``group_field``."""
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values(group_field).annotate(n=Count("pk")).values("n")
+        ),
+        Value(0),
+    )
+
+
+def pending_shards(field):
+    """Sum of a posting's pending shard deltas for ``field``, as a subquery."""
+    return Coalesce(
+        Subquery(
+            JobPostingCounterShard.objects.filter(job=OuterRef("pk"))
+            .order_by()
+            .values("job")
+            .annotate(total=Sum(field))
+            .values("total")
+        ),
+        Value(0),
+    )
+
+
+def reconcile(dry_run=False):
+    """
+    Recompute every counter from the source tables and fix drifted rows.
+
+    Pending shard deltas are folded into the posting columns first (unless
+    ``dry_run``).  Returns the number of drifted rows per counter.
+    """
+    checks = [
+        (
+            "category.active_job_count",
+            JobCategory.objects.all(),
+            "active_job_count",
+            _grouped_count(
+                JobPosting.objects.filter(category=OuterRef("pk"), is_active=True), "category"
+            ),
+        ),
+        (
+            "job.application_count",
+            JobPosting.objects.all(),
+            "application_count",
+            _grouped_count(JobApplication.objects.filter(job=OuterRef("pk")), "job"),
+        ),
+        (
+            "job.saved_count",
+            JobPosting.objects.all(),
+            "saved_count",
+            _grouped_count(SavedJob.objects.filter(job=OuterRef("pk")), "job"),
+        ),
+    ]
+
+    drift = {}
+    with transaction.atomic():
+        if not dry_run:
+            fold_counter_shards()
+        for label, queryset, field, actual in checks:
+            stored = F(field)
+            if field in JOB_COUNTERS:
+                stored = stored + pending_shards(field)
+            drifted = queryset.annotate(
+                stored_value=stored, actual_value=actual
+            ).filter(~Q(stored_value=F("actual_value")))
+            rows = list(drifted.values_list("pk", "actual_value"))
+            drift[label] = len(rows)
+            if not dry_run:
+                for pk, value in rows:
+                    queryset.filter(pk=pk).update(**{field: value})
+    return drift
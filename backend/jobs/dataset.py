@@ -0,0 +1,490 @@
+"""
+Synthetic dataset generator for load and performance testing.
+
+``generate()`` writes employers, job seekers, postings, applications and
+saved jobs with deterministic, skewed distributions: a few employers
+post most jobs, a few postings draw most applications, salaries are
+log-normal per category and seniority, and locations mix gazetteer
+aliases ("Addis", "addis ababa, Ethiopia") with free text.
+
+Rows are built as plain tuples with pre-assigned primary keys and
+written with ``COPY`` on PostgreSQL and ``executemany`` elsewhere,
+bypassing model instances and signals.  The denormalized counters are
+computed while generating; the salary buckets and search index are
+rebuilt once at the end.  All users share one pre-hashed password.
+"""
+
+import datetime
+import io
+import math
+import random
+from array import array
+from collections import Counter
+from decimal import Decimal
+from functools import lru_cache
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from . import cache as list_cache, locations, salaries, typeahead
+from .models import JobCategory, JobPosting, SavedJob
+from .search import get_search_backend
+
+User = get_user_model()
+
+BATCH_SIZE = 10000
+
+CATEGORIES = {
+    # name: (weight, median salary, roles)
+    "Software Engineering": (30, 70000, [
+        "Backend Engineer", "Frontend Developer", "Full Stack Developer", "Python Developer",
+        "Mobile Developer", "Software Engineer", "QA Engineer", "Django Developer",
+    ]),
+    "Data Science": (12, 75000, [
+        "Data Scientist", "Data Analyst", "Machine Learning Engineer", "Data Engineer",
+    ]),
+    "Design": (8, 50000, ["UI/UX Designer", "Product Designer", "Graphic Designer"]),
+    "Marketing": (10, 40000, [
+        "Digital Marketing Specialist", "Content Writer", "SEO Specialist", "Growth Marketer",
+    ]),
+    "DevOps & Cloud": (9, 80000, ["DevOps Engineer", "Site Reliability Engineer", "Cloud Architect"]),
+    "Product Management": (7, 85000, ["Product Manager", "Product Owner", "Technical Program Manager"]),
+    "Sales": (10, 35000, ["Account Executive", "Sales Representative", "Customer Success Manager"]),
+    "Finance": (6, 55000, ["Accountant", "Financial Analyst", "Payroll Specialist"]),
+    "Customer Support": (8, 25000, ["Support Agent", "Technical Support Engineer", "Call Center Agent"]),
+}
+
+SENIORITY = [
+    # (prefix, weight, salary multiplier)
+    ("Junior", 20, 0.6),
+    ("", 40, 1.0),
+    ("Senior", 25, 1.45),
+    ("Lead", 10, 1.8),
+    ("Principal", 5, 2.2),
+]
+
+# (location as typed by employers, weight); aliases exercise normalization.
+LOCATIONS = [
+    ("Remote", 22), ("Addis Ababa, Ethiopia", 12), ("Addis", 3), ("addis ababa", 2),
+    ("Nairobi, Kenya", 10), ("Nairobi", 3), ("Lagos, Nigeria", 9), ("Lagos", 2),
+    ("Kigali, Rwanda", 4), ("Accra, Ghana", 4), ("Kampala, Uganda", 3),
+    ("Dar es Salaam, Tanzania", 3), ("Cairo, Egypt", 4), ("Cape Town, South Africa", 3),
+    ("Johannesburg", 3), ("London, UK", 3), ("Berlin, Germany", 2), ("Amsterdam", 1),
+    ("Dubai, UAE", 2), ("Toronto, Canada", 1), ("New York, NY, USA", 2), ("NYC", 1),
+    ("San Francisco", 1), ("Bangalore", 1), ("Kenya", 1), ("Ethiopia", 1),
+    ("Hawassa, Ethiopia", 1), ("Mombasa, Kenya", 1), ("Work from home", 1),
+]
+
+JOB_TYPES = [
+    (JobPosting.JobType.FULL_TIME, 55), (JobPosting.JobType.REMOTE, 15),
+    (JobPosting.JobType.CONTRACT, 12), (JobPosting.JobType.PART_TIME, 10),
+    (JobPosting.JobType.INTERNSHIP, 8),
+]
+
+FIRST_NAMES = [
+    "Abebe", "Almaz", "Amina", "Chidi", "Dawit", "Fatima", "Grace", "Hana", "Ibrahim", "James",
+    "Kwame", "Lina", "Meron", "Musa", "Nia", "Omar", "Priya", "Samuel", "Selam", "Tendai",
+    "Wanjiru", "Yonas", "Zara", "Daniel", "Sara", "Ahmed", "Esther", "Joseph", "Ruth", "David",
+]
+LAST_NAMES = [
+    "Bekele", "Okafor", "Mensah", "Kamau", "Haile", "Mwangi", "Adeyemi", "Tesfaye", "Njoroge",
+    "Osei", "Abdi", "Girma", "Otieno", "Balogun", "Alemu", "Mutua", "Diallo", "Kebede",
+]
+COMPANY_WORDS = [
+    "Blue", "Nile", "Savanna", "Acacia", "Summit", "Bright", "Rift", "Harbor", "Sun", "Atlas",
+    "Kilima", "Delta", "Zebra", "Baobab", "Orbit", "Coral", "Lion", "Pioneer", "Unity", "Echo",
+]
+COMPANY_SUFFIXES = ["Labs", "Tech", "Systems", "Digital", "Solutions", "Group", "Works", "Cloud", "Analytics"]
+
+SENTENCES = [
+    "You will work with a cross-functional team to deliver reliable products.",
+    "We value ownership, clear communication and continuous learning.",
+    "The role involves designing, building and maintaining core services.",
+    "You will collaborate closely with product, design and engineering.",
+    "Our customers rely on us for fast, accurate and secure service.",
+    "We offer flexible hours, health insurance and a learning budget.",
+    "You will mentor teammates and take part in code and design reviews.",
+    "Experience with agile teams and remote collaboration is a plus.",
+    "We are growing quickly across East and West Africa.",
+    "You will analyse metrics and iterate on what matters most.",
+    "Strong written and spoken English is required.",
+    "The team ships small changes often and measures their impact.",
+]
+REQUIREMENTS = [
+    "2+ years of relevant experience", "Strong problem-solving skills", "Excellent communication",
+    "Experience with SQL databases", "Familiarity with Git and CI/CD", "Bachelor's degree or equivalent",
+    "Attention to detail", "Experience working with remote teams", "Customer-first mindset",
+]
+
+APPLICATION_STATUSES = [("pending", 55), ("reviewed", 25), ("rejected", 15), ("accepted", 5)]
+
+
+def _cumulative(weights):
+    total, cumulative = 0, []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return cumulative
+
+
+def _spread(total, weights, cap):
+    """Split ``total`` over ``weights`` (each share at most ``cap``), deterministically."""
+    weight_sum = sum(weights) or 1
+    counts = array("l", (min(cap, int(total * w / weight_sum)) for w in weights))
+    remaining = total - sum(counts)
+    # Hand out the rounding remainder to the heaviest postings with room left.
+    for i in sorted(range(len(weights)), key=weights.__getitem__, reverse=True):
+        if remaining <= 0:
+            break
+        if counts[i] < cap:
+            counts[i] += 1
+            remaining -= 1
+    return counts
+
+
+@lru_cache(maxsize=None)
+def _location(value):
+    return locations.normalize(value)
+
+
+def _next_id(model):
+    return (model.objects.aggregate(n=Max("pk"))["n"] or 0) + 1
+
+
+class _Writer:
+    """Bulk row writer: ``COPY`` on PostgreSQL, ``executemany`` elsewhere."""
+
+    def __init__(self, model):
+        self.model = model
+        self.fields = model._meta.concrete_fields
+        self.table = model._meta.db_table
+        self.columns = [field.column for field in self.fields]
+        self.defaults = [
+            field.get_default() if field.has_default() else (None if field.null else "")
+            for field in self.fields
+        ]
+        self.copy = connection.vendor == "postgresql"
+        ops = connection.ops
+        self.adapters = []
+        for field in self.fields:
+            if self.copy:
+                self.adapters.append(None)
+            elif isinstance(field, models.DateTimeField):
+                self.adapters.append(ops.adapt_datetimefield_value)
+            elif isinstance(field, models.DecimalField):
+                self.adapters.append(
+                    lambda value, field=field: ops.adapt_decimalfield_value(
+                        value, field.max_digits, field.decimal_places
+                    )
+                )
+            else:
+                self.adapters.append(None)
+        self.written = 0
+
+    def tuple(self, values):
+        """Row tuple for ``values`` (attname -> value), defaults filled in."""
+        return tuple(
+            values.get(field.attname, default) for field, default in zip(self.fields, self.defaults)
+        )
+
+    def write(self, rows):
+        if not rows:
+            return
+        if self.copy:
+            self._copy(rows)
+        else:
+            self._execute(rows)
+        self.written += len(rows)
+
+    def _execute(self, rows):
+        adapters = [(i, adapt) for i, adapt in enumerate(self.adapters) if adapt]
+        if adapters:
+            adapted = []
+            for row in rows:
+                row = list(row)
+                for i, adapt in adapters:
+                    if row[i] is not None:
+                        row[i] = adapt(row[i])
+                adapted.append(row)
+            rows = adapted
+        quote = connection.ops.quote_name
+        sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            quote(self.table),
+            ", ".join(quote(column) for column in self.columns),
+            ", ".join(["%s"] * len(self.columns)),
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    @staticmethod
+    def _text(value):
+        if value is None:
+            return "\\N"
+        if value is True:
+            return "t"
+        if value is False:
+            return "f"
+        if isinstance(value, datetime.datetime):
+            return value.isoformat()
+        value = str(value)
+        if "\\" in value or "\t" in value or "\n" in value or "\r" in value:
+            value = value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+        return value
+
+    def _copy(self, rows):
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(self._text(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(column) for column in self.columns)
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(f"COPY {quote(self.table)} ({columns}) FROM STDIN", buffer)
+
+
+class DatasetGenerator:
+    def __init__(self, seed=42, batch_size=BATCH_SIZE, domain="dataset.example.com"):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.domain = domain
+        self.now = timezone.now().replace(microsecond=0)
+
+    # -- helpers -----------------------------------------------------------
+
+    def _batched(self, writer, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                writer.write(batch)
+                batch = []
+        writer.write(batch)
+        return writer.written
+
+    def _ago(self, max_days):
+        return self.now - datetime.timedelta(seconds=self.rng.randrange(int(max_days * 86400)))
+
+    def _categories(self):
+        existing = dict(JobCategory.objects.values_list("name", "pk"))
+        for name in CATEGORIES:
+            if name not in existing:
+                existing[name] = JobCategory.objects.create(name=name).pk
+        return [(name, existing[name]) for name in CATEGORIES]
+
+    # -- users -------------------------------------------------------------
+
+    def users(self, count, role, password_hash):
+        start = _next_id(User)
+        writer = _Writer(User)
+        rng = self.rng
+        employer = role == User.Role.EMPLOYER
+
+        def rows():
+            for i in range(count):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                values = {
+                    "id": start + i,
+                    "password": password_hash,
+                    "email": f"{role}{i}@{self.domain}",
+                    "first_name": first,
+                    "last_name": last,
+                    "role": role,
+                    "is_active": True,
+                    "is_staff": False,
+                    "is_superuser": False,
+                    "date_joined": self._ago(730),
+                }
+                if employer:
+                    values["company_name"] = (
+                        f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}"
+                    )
+                yield writer.tuple(values)
+
+        self._batched(writer, rows())
+        return array("q", range(start, start + count))
+
+    # -- postings ----------------------------------------------------------
+
+    def jobs(self, count, employer_ids, seeker_count, applications, saved):
+        rng = self.rng
+        categories = self._categories()
+        category_cum = _cumulative(CATEGORIES[name][0] for name, _ in categories)
+        seniority_cum = _cumulative(weight for _, weight, _ in SENIORITY)
+        location_cum = _cumulative(weight for _, weight in LOCATIONS)
+        job_type_cum = _cumulative(weight for _, weight in JOB_TYPES)
+        # Zipf-like: the k-th employer posts ~1/k as much as the first.
+        employer_cum = _cumulative(1 / (k + 1) ** 1.1 for k in range(len(employer_ids)))
+
+        # Popularity decides how many applications and saves each posting draws.
+        popularity = [rng.lognormvariate(0, 1.2) for _ in range(count)]
+        application_counts = _spread(applications, popularity, seeker_count)
+        saved_counts = _spread(saved, popularity, seeker_count)
+
+        start = _next_id(JobPosting)
+        writer = _Writer(JobPosting)
+        self.job_created = array("d")
+        self.active_by_category = Counter()
+
+        def rows():
+            for i in range(count):
+                name, category_id = categories[rng.choices(range(len(categories)), cum_weights=category_cum)[0]]
+                _, median, roles = CATEGORIES[name]
+                prefix, _, multiplier = SENIORITY[rng.choices(range(len(SENIORITY)), cum_weights=seniority_cum)[0]]
+                title = f"{prefix} {rng.choice(roles)}".strip()
+                location = LOCATIONS[rng.choices(range(len(LOCATIONS)), cum_weights=location_cum)[0]][0]
+                normalized = _location(location)
+                salary_min = salary_max = None
+                if rng.random() < 0.85:
+                    low = median * multiplier * rng.lognormvariate(0, 0.35)
+                    low = max(1000, int(round(low, -3)))
+                    salary_min = Decimal(low)
+                    salary_max = Decimal(int(round(low * rng.uniform(1.1, 1.6), -3)))
+                created = self._ago(365)
+                is_active = rng.random() < 0.85 - min(0.5, (self.now - created).days / 730)
+                if is_active:
+                    self.active_by_category[category_id] += 1
+                self.job_created.append(created.timestamp())
+                paragraphs = [" ".join(rng.sample(SENTENCES, 4)) for _ in range(rng.randint(1, 3))]
+                yield writer.tuple({
+                    "id": start + i,
+                    "title": title,
+                    "description": f"We are hiring a {title}.\n\n" + "\n\n".join(paragraphs),
+                    "company_id": employer_ids[rng.choices(range(len(employer_ids)), cum_weights=employer_cum)[0]],
+                    "category_id": category_id,
+                    "location": location,
+                    "location_city": normalized["city"],
+                    "location_region": normalized["region"],
+                    "location_country": normalized["country"],
+                    "location_key": normalized["key"],
+                    "job_type": JOB_TYPES[rng.choices(range(len(JOB_TYPES)), cum_weights=job_type_cum)[0]][0],
+                    "salary_min": salary_min,
+                    "salary_max": salary_max,
+                    "requirements": "\n".join(f"- {line}" for line in rng.sample(REQUIREMENTS, 4)),
+                    "is_active": is_active,
+                    "application_count": application_counts[i],
+                    "saved_count": saved_counts[i],
+                    "counter_shards": 0,
+                    "created_at": created,
+                    "updated_at": created,
+                })
+
+        self._batched(writer, rows())
+        self.job_ids = range(start, start + count)
+        return application_counts, saved_counts
+
+    # -- applications and saved jobs ----------------------------------------
+
+    def _per_job(self, model, counts, seeker_ids, build):
+        rng = self.rng
+        start = _next_id(model)
+        writer = _Writer(model)
+        seekers = len(seeker_ids)
+
+        def rows():
+            pk = start
+            for index, job_id in enumerate(self.job_ids):
+                n = counts[index]
+                if not n:
+                    continue
+                created = self.job_created[index]
+                for seeker in rng.sample(range(seekers), n):
+                    # Activity clusters in the weeks after a posting goes up.
+                    delay = min(rng.expovariate(1 / (7 * 86400)), self.now.timestamp() - created)
+                    when = datetime.datetime.fromtimestamp(created + delay, tz=datetime.timezone.utc)
+                    yield writer.tuple(build(pk, job_id, seeker_ids[seeker], when))
+                    pk += 1
+
+        return self._batched(writer, rows())
+
+    def applications(self, counts, seeker_ids):
+        JobApplication = apps.get_model("applications", "JobApplication")
+        status_cum = _cumulative(weight for _, weight in APPLICATION_STATUSES)
+        rng = self.rng
+
+        def build(pk, job_id, applicant_id, when):
+            return {
+                "id": pk,
+                "job_id": job_id,
+                "applicant_id": applicant_id,
+                "cover_letter": "" if rng.random() < 0.3 else " ".join(rng.sample(SENTENCES, 2)),
+                "status": APPLICATION_STATUSES[rng.choices(range(4), cum_weights=status_cum)[0]][0],
+                "applied_at": when,
+                "updated_at": when,
+            }
+
+        return self._per_job(JobApplication, counts, seeker_ids, build)
+
+    def saved_jobs(self, counts, seeker_ids):
+        def build(pk, job_id, user_id, when):
+            return {"id": pk, "job_id": job_id, "user_id": user_id, "saved_at": when}
+
+        return self._per_job(SavedJob, counts, seeker_ids, build)
+
+    # -- derived data --------------------------------------------------------
+
+    def finish(self):
+        for category_id, n in self.active_by_category.items():
+            JobCategory.objects.filter(pk=category_id).update(active_job_count=F("active_job_count") + n)
+        if connection.vendor == "postgresql":
+            JobApplication = apps.get_model("applications", "JobApplication")
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [User, JobPosting, JobApplication, SavedJob]):
+                    cursor.execute(sql)
+        buckets = salaries.rebuild()
+        indexed = get_search_backend().rebuild()
+        # Employer stats are built lazily on first access; in-process indexes
+        # notice the version bumps and rebuild.
+        list_cache.bump_version()
+        typeahead.index.apply()
+        return buckets, indexed
+
+
+def generate(employers, seekers, jobs, applications, saved, seed=42, password="password123",
+             domain="dataset.example.com", batch_size=BATCH_SIZE, log=None):
+    """Write a synthetic dataset; return the number of rows per table."""
+    log = log or (lambda message: None)
+    if User.objects.filter(email__iendswith=f"@{domain}").exists():
+        raise ValueError(f"Users @{domain} already exist; use another domain or a fresh database.")
+    if (employers < 1 or seekers < 1) and jobs:
+        raise ValueError("Postings need at least one employer and one job seeker.")
+    applications = min(applications, jobs * seekers)
+    saved = min(saved, jobs * seekers)
+
+    generator = DatasetGenerator(seed=seed, batch_size=batch_size, domain=domain)
+    password_hash = make_password(password)
+    counts = {}
+    with transaction.atomic():
+        log(f"Creating {employers} employers and {seekers} job seekers...")
+        employer_ids = generator.users(employers, User.Role.EMPLOYER, password_hash)
+        seeker_ids = generator.users(seekers, User.Role.JOB_SEEKER, password_hash)
+        counts["employers"], counts["seekers"] = len(employer_ids), len(seeker_ids)
+        log(f"Creating {jobs} job postings...")
+        application_counts, saved_counts = generator.jobs(
+            jobs, employer_ids, len(seeker_ids), applications, saved
+        )
+        counts["jobs"] = jobs
+        log(f"Creating {sum(application_counts)} applications...")
+        counts["applications"] = generator.applications(application_counts, seeker_ids)
+        log(f"Creating {sum(saved_counts)} saved jobs...")
+        counts["saved_jobs"] = generator.saved_jobs(saved_counts, seeker_ids)
+        log("Rebuilding salary buckets and the search index...")
+        counts["salary_buckets"], counts["indexed"] = generator.finish()
+    return counts
+
+
+def parse_count(value):
+    """Parse ``10k`` / ``1.5M`` / ``500`` into an int."""
+    value = str(value).strip().lower().replace("_", "")
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    if multiplier != 1:
+        value = value[:-1]
+    number = float(value)
+    if number < 0 or math.isnan(number):
+        raise ValueError(value)
+    return int(number * multiplier)
@@ -0,0 +1,130 @@
+"""
+Facet counts for the job list filters.
+
+Each facet is counted over the list filtered by every parameter except
+its own, so the sidebar shows how many results selecting another value
+would give.  ``category``, ``job_type`` and the canonical location key
+are one grouped query each (served by the ``(<facet>, is_active)``
+indexes when the list is narrowed by ``is_active``); all salary bands
+come from a single conditional aggregate.
+"""
+
+from django.db.models import Count, Max, Q
+from django_filters.utils import translate_validation
+from rest_framework.response import Response
+
+from .filters import JobPostingFilter
+from .locations import label
+from .models import JobPosting
+
+LOCATION_FACET_LIMIT = 20
+
+# (key, salary_min filter, salary_max filter); ``None`` leaves that side open.
+SALARY_BANDS = (
+    ("0-50k", None, 50000),
+    ("50k-100k", 50000, 100000),
+    ("100k-150k", 100000, 150000),
+    ("150k+", 150000, None),
+)
+
+# Facet name -> the filter parameters it ignores.
+FACET_PARAMS = {
+    "category": ("category", "category_name"),
+    "job_type": ("job_type",),
+    "location": ("location",),
+    "salary": ("salary_min", "salary_max"),
+}
+
+
+def _filtered(queryset, params, exclude):
+    data = params.copy()
+    for name in exclude:
+        data.pop(name, None)
+    filterset = JobPostingFilter(data, queryset=queryset)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+    return filterset.qs.order_by()
+
+
+def _category_facet(queryset):
+    rows = (
+        queryset.filter(category__isnull=False)
+        .values("category_id", "category__name")
+        .annotate(count=Count("pk"))
+        .order_by("-count", "category__name")
+    )
+    return [
+        {"id": row["category_id"], "name": row["category__name"], "count": row["count"]}
+        for row in rows
+    ]
+
+
+def _job_type_facet(queryset):
+    labels = dict(JobPosting.JobType.choices)
+    rows = queryset.values("job_type").annotate(count=Count("pk")).order_by("-count", "job_type")
+    return [
+        {"value": row["job_type"], "label": labels.get(row["job_type"], row["job_type"]),
+         "count": row["count"]}
+        for row in rows
+    ]
+
+
+def _location_facet(queryset):
+    rows = (
+        queryset.exclude(location_key="")
+        .values("location_key")
+        .annotate(
+            count=Count("pk"),
+            city=Max("location_city"),
+            region=Max("location_region"),
+            country=Max("location_country"),
+        )
+        .order_by("-count", "location_key")[:LOCATION_FACET_LIMIT]
+    )
+    return [
+        {
+            "value": row["location_key"],
+            "label": label(row["city"], row["region"], row["country"]),
+            "count": row["count"],
+        }
+        for row in rows
+    ]
+
+
+def _salary_facet(queryset):
+    bands = {}
+    for key, lower, upper in SALARY_BANDS:
+        condition = Q()
+        if lower is not None:
+            condition &= Q(salary_min__gte=lower)
+        if upper is not None:
+            condition &= Q(salary_max__lte=upper)
+        bands[key] = Count("pk", filter=condition)
+    counts = queryset.aggregate(**bands)
+    return [
+        {"key": key, "salary_min": lower, "salary_max": upper, "count": counts[key]}
+        for key, lower, upper in SALARY_BANDS
+    ]
+
+
+FACETS = {
+    "category": _category_facet,
+    "job_type": _job_type_facet,
+    "location": _location_facet,
+    "salary": _salary_facet,
+}
+
+
+def facet_counts(queryset, params):
+    """Return every facet's counts for the ``JobPostingFilter`` selection in ``params``."""
+    return {
+        name: count(_filtered(queryset, params, FACET_PARAMS[name]))
+        for name, count in FACETS.items()
+    }
+
+
+class FacetCountsMixin:
+    """``list()`` that returns facet counts instead of a page of postings."""
+
+    def list(self, request, *args, **kwargs):
+        return Response(facet_counts(self.get_queryset(), request.query_params))
@@ -0,0 +1,146 @@
+"""
+Sparse fieldsets: ``?fields=`` and ``?omit=`` on read endpoints.
+
+``SparseFieldsetSerializerMixin`` drops unrequested fields from the
+top-level serializer of a GET request (nested serializers are kept
+whole).  ``SparseFieldsetMixin`` asks that serializer which columns and
+joins the remaining fields read and trims the view's queryset to them
+with ``only()`` and ``select_related()``.  Fields whose source cannot be
+traced to columns (method fields without ``Meta.sparse_sources``,
+reverse relations) leave the queryset untouched.
+"""
+
+import re
+
+from django.core.exceptions import FieldDoesNotExist
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        FIELDS_PARAM, OpenApiTypes.STR, description="Comma-separated fields to return (default: all)."
+    ),
+    OpenApiParameter(OMIT_PARAM, OpenApiTypes.STR, description="Comma-separated fields to leave out."),
+]
+
+
+def _names(request, param):
+    values = request.query_params.getlist(param)
+    return [name.strip() for value in values for name in value.split(",") if name.strip()]
+
+
+def requested_fields(request):
+    """``(fields, omit)`` of a read request; ``fields`` is ``None`` when not restricted."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, []
+    return _names(request, FIELDS_PARAM) or None, _names(request, OMIT_PARAM)
+
+
+class SparseFieldsetSerializerMixin:
+    """Honour ``?fields=``/``?omit=`` when this is the request's top-level serializer."""
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_root():
+            return fields
+        only, omit = requested_fields(self.context.get("request"))
+        if only is None and not omit:
+            return fields
+        errors = {}
+        for param, names in ((FIELDS_PARAM, only or ()), (OMIT_PARAM, omit)):
+            unknown = [name for name in names if name not in fields]
+            if unknown:
+                errors[param] = [f"Unknown field(s): {', '.join(unknown)}."]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return {
+            name: field
+            for name, field in fields.items()
+            if (only is None or name in only) and name not in omit
+        }
+
+
+def _lookups(serializer, model, prefix=""):
+    # Returns the (columns, joins) read by ``serializer``'s fields, or
+    # ``None`` if some field cannot be traced to columns.
+    sources = getattr(getattr(serializer, "Meta", None), "sparse_sources", {})
+    columns = {prefix + model._meta.pk.name}
+    joins = set()
+    for name, field in serializer.fields.items():
+        if name in sources:
+            columns.update(prefix + source for source in sources[name])
+            continue
+        if field.source == "*":
+            return None
+        attr = field.source_attrs[0]
+        display = re.fullmatch(r"get_(\w+)_display", attr)
+        if display:
+            attr = display.group(1)
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        columns.add(prefix + attr)
+        if not model_field.is_relation:
+            continue
+        if not (model_field.many_to_one or model_field.one_to_one) or model_field.auto_created:
+            return None
+        related = model_field.related_model
+        if isinstance(field, serializers.BaseSerializer):
+            nested = _lookups(field, related, f"{prefix}{attr}__")
+            if nested is None:
+                return None
+            columns |= nested[0]
+            joins |= nested[1] | {prefix + attr}
+        elif len(field.source_attrs) > 1:
+            # e.g. ``category.name``
+            joins.add(prefix + attr)
+            columns.add(f"{prefix}{attr}__{field.source_attrs[1]}")
+    return columns, joins
+
+
+def trim_queryset(queryset, serializer_class, request, keep=()):
+    """
+    Restrict ``queryset`` to the columns and joins that ``serializer_class``
+    reads for the fields requested in ``request``; ``keep`` lists extra
+    columns that must stay loaded (e.g. ordering keys).
+    """
+    only, omit = requested_fields(request)
+    if only is None and not omit:
+        return queryset
+    serializer = serializer_class(context={"request": request})
+    lookups = _lookups(serializer, queryset.model)
+    if lookups is None:
+        return queryset
+    columns, joins = lookups
+    queryset = queryset.select_related(None)
+    if joins:
+        # A bare select_related() would follow every foreign key.
+        queryset = queryset.select_related(*sorted(joins))
+    return queryset.only(*columns, *keep)
+
+
+class SparseFieldsetMixin:
+    """
+    Generic-view mixin: trim the filtered queryset of read requests to
+    the requested fieldset.  The view's ``ordering_fields`` stay loaded
+    for pagination cursors.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        keep = [name for name in getattr(self, "ordering_fields", None) or () if isinstance(name, str)]
+        return trim_queryset(queryset, self.get_serializer_class(), self.request, keep)
@@ -1,10 +1,15 @@
 """
-Django-filter filter sets for job postings.
+Django-filter filter sets for job postings, and the list views' spelling
+correction of searches without results.
 """
 
 import django_filters
-from django.db import models
+from rest_framework.filters import OrderingFilter
+
+from . import fuzzy
+from .locations import canonical as canonical_location, location_condition
 from .models import JobPosting
+from .search import RANK_ANNOTATION, get_search_backend
 
 
 class JobPostingFilter(django_filters.FilterSet):
@@ -15,9 +20,7 @@ class JobPostingFilter(django_filters.FilterSet):
         field_name="category__name", lookup_expr="icontains"
     )
     job_type = django_filters.CharFilter(field_name="job_type")
-    location = django_filters.CharFilter(
-        field_name="location", lookup_expr="icontains"
-    )
+    location = django_filters.CharFilter(method="filter_location")
     salary_min = django_filters.NumberFilter(
         field_name="salary_min", lookup_expr="gte"
     )
@@ -39,10 +42,70 @@ class JobPostingFilter(django_filters.FilterSet):
             "is_active",
         ]
 
+    def filter_location(self, queryset, name, value):
+        """Canonical location match, falling back to a substring search."""
+        location = canonical_location(value)
+        if location is None:
+            return queryset.filter(location__icontains=value)
+        return queryset.filter(location_condition(location))
+
     def filter_search(self, queryset, name, value):
-        """Search in title, description, and location."""
-        return queryset.filter(
-            models.Q(title__icontains=value)
-            | models.Q(description__icontains=value)
-            | models.Q(location__icontains=value)
-        )
+        """
+        Full-text search over title, location, and description.
+
+        Searches for ``request.did_you_mean`` instead once
+        ``SpellingCorrectionMixin`` has set it.
+        """
+        corrected = getattr(self.request, "did_you_mean", None)
+        return get_search_backend().search(queryset, corrected or value)
+
+
+class SpellingCorrectionMixin:
+    """
+    Retry a list search that found nothing with its spelling correction
+    (``jobs.fuzzy``), exposed as ``request.did_you_mean``.
+
+    Searches with results never consult the index or run extra queries.
+    """
+
+    def search_correction(self, request, response):
+        query = request.query_params.get("search")
+        if not query or request.query_params.get("cursor"):
+            return None
+        results = response.data.get("results") if isinstance(response.data, dict) else response.data
+        if results:
+            return None
+        return fuzzy.suggest(query)
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        suggestion = self.search_correction(request, response)
+        if suggestion is None:
+            return response
+        request.did_you_mean = suggestion
+        return super().list(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        response = await super().alist(request, *args, **kwargs)
+        suggestion = self.search_correction(request, response)
+        if suggestion is None:
+            return response
+        request.did_you_mean = suggestion
+        return await super().alist(request, *args, **kwargs)
+
+
+class JobOrderingFilter(OrderingFilter):
+    """
+    Ordering filter that sorts keyword searches by relevance.
+
+    An explicit ``?ordering=`` always wins; otherwise ranked search results
+    come back best match first, newest first among equal scores.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        if (
+            not request.query_params.get(self.ordering_param)
+            and RANK_ANNOTATION in queryset.query.annotations
+        ):
+            return [f"-{RANK_ANNOTATION}", *(self.get_default_ordering(view) or [])]
+        return super().get_ordering(request, queryset, view)
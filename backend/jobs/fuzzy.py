@@ -0,0 +1,242 @@
+"""
+Typo-tolerant spelling correction for job search queries.
+
+A symmetric-delete index (as in SymSpell) maps every word of the
+vocabulary - job title and category name words plus description words
+that occur in several postings - to the strings left after deleting up
+to ``MAX_DISTANCE`` characters from its first ``PREFIX_LENGTH``
+characters.  Correcting a word only needs the deletes of the word
+itself: a handful of dictionary lookups plus an edit-distance check of
+the few candidates they return.
+
+Memory is bounded by keeping the ``MAX_TERMS`` most frequent words and
+indexing deletes of a fixed-length prefix only.  The build stays within
+the same bound: only the first ``MAX_DESCRIPTION_CHARS`` of a description
+are read, and the word counts are pruned to the most frequent words
+whenever they outgrow ``MAX_CANDIDATES`` (so counts of rare words are
+approximate).  Each worker builds the index at start (``config.wsgi`` and
+``config.asgi``) and rebuilds it in a background thread, at most every
+``CHECK_INTERVAL`` seconds, when the job list version (see ``jobs.cache``)
+has moved; until the first build finishes no corrections are offered, so
+searches never wait for it.  Disable with ``FUZZY_SEARCH_ENABLED``.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models.functions import Left
+
+from . import cache as list_cache
+from .models import JobCategory, JobPosting
+from .search import tokenize
+
+logger = logging.getLogger(__name__)
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+MAX_TERMS = 20000
+# Description words must appear in this many postings to be indexed.
+MIN_DESCRIPTION_FREQUENCY = 2
+MIN_WORD_LENGTH = 3
+CHECK_INTERVAL = 60.0
+# Words read per description, and word counts held while building.
+MAX_DESCRIPTION_CHARS = 2000
+MAX_CANDIDATES = 4 * MAX_TERMS
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it of on or our that the "
+    "their this to was we will with you your".split()
+)
+
+
+def allowed_distance(word):
+    """Longer words tolerate more typos; very short ones none."""
+    if len(word) <= 3:
+        return 0
+    if len(word) <= 6:
+        return 1
+    return MAX_DISTANCE
+
+
+def _deletes(word, distance):
+    variants = frontier = {word[:PREFIX_LENGTH]}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants = variants | frontier
+    return variants
+
+
+def _count(counter, words):
+    """Add ``words`` to ``counter``, pruning it to the most frequent once it outgrows ``MAX_CANDIDATES``."""
+    counter.update(words)
+    if len(counter) > MAX_CANDIDATES:
+        kept = counter.most_common(MAX_CANDIDATES // 2)
+        counter.clear()
+        counter.update(dict(kept))
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """Symmetric-delete spelling index; one module-level instance per worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything; the next lookup starts a rebuild."""
+        self._terms = {}
+        self._deletes = {}
+        self._built = False
+        self._version = None
+        self._checked_at = 0.0
+        self._rebuilding = False
+
+    def build(self):
+        """(Re)load the vocabulary from the active postings and categories."""
+        version = list_cache.get_version()
+        frequencies = Counter()
+        description_words = Counter()
+        postings = JobPosting.objects.filter(is_active=True).values_list(
+            "title", Left("description", MAX_DESCRIPTION_CHARS)
+        )
+        for title, description in postings.iterator(chunk_size=2000):
+            _count(frequencies, set(tokenize(title)))
+            _count(description_words, set(tokenize(description)))
+        for name in JobCategory.objects.values_list("name", flat=True):
+            _count(frequencies, set(tokenize(name)))
+        for word, n in description_words.items():
+            if n >= MIN_DESCRIPTION_FREQUENCY or word in frequencies:
+                frequencies[word] += n
+
+        terms = {
+            word: n
+            for word, n in frequencies.most_common()
+            if len(word) >= MIN_WORD_LENGTH and word not in STOPWORDS and not word.isdigit()
+        }
+        terms = dict(list(terms.items())[:MAX_TERMS])
+        deletes = {}
+        for word in terms:
+            for variant in _deletes(word, allowed_distance(word)):
+                # Most variants belong to a single word: store it unwrapped.
+                existing = deletes.get(variant)
+                if existing is None:
+                    deletes[variant] = word
+                elif isinstance(existing, str):
+                    deletes[variant] = (existing, word)
+                else:
+                    deletes[variant] = existing + (word,)
+        with self._lock:
+            self._terms, self._deletes = terms, deletes
+            self._built = True
+            self._version = version
+            self._checked_at = time.monotonic()
+        return len(terms)
+
+    def _rebuild_in_background(self):
+        def run():
+            close_old_connections()
+            try:
+                self.build()
+            except Exception:
+                logger.exception("Rebuilding the fuzzy search index failed")
+            finally:
+                self._rebuilding = False
+                connections.close_all()
+
+        threading.Thread(target=run, name="fuzzy index rebuild", daemon=True).start()
+
+    def _ensure_fresh(self):
+        """Start a background (re)build when one is due; ``False`` until the index is built."""
+        now = time.monotonic()
+        with self._lock:
+            if self._rebuilding or (self._built and now - self._checked_at < CHECK_INTERVAL):
+                return self._built
+            self._checked_at = now
+            if self._built and list_cache.get_version() == self._version:
+                return True
+            self._rebuilding = True
+        self._rebuild_in_background()
+        return self._built
+
+    def correct_word(self, word):
+        """Closest known word (fewest edits, then most frequent), or ``None``."""
+        distance = allowed_distance(word)
+        if not distance:
+            return None
+        terms, deletes = self._terms, self._deletes
+        candidates = set()
+        for variant in _deletes(word, distance):
+            match = deletes.get(variant)
+            if isinstance(match, str):
+                candidates.add(match)
+            elif match:
+                candidates.update(match)
+        best = None
+        for candidate in candidates:
+            d = edit_distance(word, candidate, distance)
+            if d <= distance:
+                rank = (d, -terms[candidate], candidate)
+                if best is None or rank < best:
+                    best = rank
+        return best[2] if best else None
+
+    def suggest(self, query):
+        """
+        Corrected version of ``query``, or ``None`` if every word is known
+        or nothing close enough exists.
+        """
+        words = tokenize(query)
+        if not words or not self._ensure_fresh():
+            return None
+        corrected = []
+        changed = False
+        for word in words:
+            replacement = None
+            if word not in self._terms and not word.isdigit():
+                replacement = self.correct_word(word)
+            corrected.append(replacement or word)
+            changed = changed or replacement is not None
+        return " ".join(corrected) if changed else None
+
+
+index = FuzzyIndex()
+
+
+def suggest(query):
+    """Spelling correction of ``query``, or ``None``; see ``FuzzyIndex.suggest``."""
+    if not settings.FUZZY_SEARCH_ENABLED:
+        return None
+    return index.suggest(query)
+
+
+def warm_up():
+    """Build the index at worker start; failures only delay it to the first search."""
+    if not settings.FUZZY_SEARCH_ENABLED:
+        return
+    try:
+        index.build()
+    except Exception:
+        logger.exception("Could not build the fuzzy search index at startup")
@@ -0,0 +1,156 @@
+"""
+Streaming bulk import of job postings from CSV or JSON Lines.
+
+Rows are read one at a time from the (binary) upload stream, validated
+with ``JobPostingImportSerializer`` - the detail serializer's rules, with
+categories resolved from a map loaded once - and inserted with
+``bulk_create`` in batches of ``BATCH_SIZE``.  Only the current batch and
+the first ``MAX_REPORTED_ERRORS`` row errors are held in memory, so
+memory use does not grow with the file size.
+
+``bulk_create`` sends no signals; every batch goes through
+``jobs.signals.job_postings_bulk_created`` for the search index,
+counters, stats and caches.
+"""
+
+import csv
+import io
+import json
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .models import JobCategory, JobPosting
+from .serializers import JobPostingDetailSerializer
+from .signals import job_postings_bulk_created, normalize_job_location
+
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+FORMATS = ("csv", "jsonl")
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class JobPostingImportSerializer(JobPostingDetailSerializer):
+    """
+    Validates one imported row.
+
+    ``category`` may be a category id or name; it is looked up in the
+    ``categories`` map passed in the serializer context.
+    """
+
+    category = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    def validate_category(self, value):
+        if value in (None, ""):
+            return None
+        category_id = self.context["categories"].get(str(value).strip().lower())
+        if category_id is None:
+            raise serializers.ValidationError(f"Unknown category '{value}'.")
+        return category_id
+
+
+def category_map():
+    """Category id and lowercased name -> id."""
+    categories = {}
+    for pk, name in JobCategory.objects.values_list("pk", "name"):
+        categories[str(pk)] = pk
+        categories[name.lower()] = pk
+    return categories
+
+
+def detect_format(filename, requested=None):
+    """Explicit ``requested`` format, else the one implied by the file extension."""
+    if requested:
+        if requested not in FORMATS:
+            raise ValueError(f"Unsupported format '{requested}'; use one of {', '.join(FORMATS)}.")
+        return requested
+    for extension, file_format in EXTENSIONS.items():
+        if (filename or "").lower().endswith(extension):
+            return file_format
+    raise ValueError("Cannot tell the file format from its name; pass csv or jsonl explicitly.")
+
+
+def iter_rows(stream, file_format):
+    """
+    Yield ``(row_number, data)`` from a binary stream; ``data`` is a dict
+    or an error message for rows that cannot be parsed.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if file_format == "csv":
+            reader = csv.DictReader(text)
+            for number, row in enumerate(reader, start=2):
+                # Empty cells mean "not given", not an empty value.
+                yield number, {key: value for key, value in row.items() if key and value != ""}
+            return
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as exc:
+                yield number, f"Invalid JSON: {exc}"
+                continue
+            yield number, data if isinstance(data, dict) else "Each line must be a JSON object."
+    finally:
+        # Leave the underlying upload open for its owner.
+        text.detach()
+
+
+class ImportReport:
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "dry_run": self.dry_run,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def _insert(batch, report):
+    with transaction.atomic():
+        created = JobPosting.objects.bulk_create(batch)
+        job_postings_bulk_created(created)
+    report.created += len(created)
+
+
+def import_jobs(stream, file_format, company, dry_run=False, batch_size=BATCH_SIZE):
+    """Validate and insert every row of ``stream`` for ``company``; return the report dict."""
+    serializer = JobPostingImportSerializer(context={"categories": category_map()})
+    report = ImportReport(dry_run)
+    batch = []
+    for number, data in iter_rows(stream, file_format):
+        if isinstance(data, str):
+            report.add_error(number, {"non_field_errors": [data]})
+            continue
+        try:
+            validated = serializer.run_validation(data)
+        except serializers.ValidationError as exc:
+            report.add_error(number, exc.detail)
+            continue
+        if dry_run:
+            report.created += 1
+            continue
+        validated["category_id"] = validated.pop("category", None)
+        posting = JobPosting(company=company, **validated)
+        normalize_job_location(JobPosting, posting)
+        batch.append(posting)
+        if len(batch) >= batch_size:
+            _insert(batch, report)
+            batch = []
+    if batch:
+        _insert(batch, report)
+    return report.as_dict()
@@ -0,0 +1,183 @@
+"""
+Location normalization for job postings.
+
+The free-text ``JobPosting.location`` is parsed into city, region and
+country, with a small gazetteer resolving common aliases ("Addis",
+"addis ababa" and "Addis Ababa, Ethiopia" are the same place).  The
+canonical ``location_key`` joins the slugs of the non-empty parts, city
+first (``addis-ababa:ethiopia``), so exact matches and typed-prefix
+autocomplete are both plain index range scans.
+"""
+
+import re
+
+from django.db.models import Count, Max, Q
+from django.utils.text import slugify
+
+REMOTE = {"city": "Remote", "region": "", "country": ""}
+
+REMOTE_ALIASES = {"remote", "anywhere", "worldwide", "work from home", "wfh"}
+
+COUNTRIES = {
+    "Egypt": ["egypt"],
+    "Ethiopia": ["ethiopia"],
+    "Ghana": ["ghana"],
+    "Kenya": ["kenya"],
+    "Nigeria": ["nigeria"],
+    "Rwanda": ["rwanda"],
+    "South Africa": ["south africa", "za"],
+    "Tanzania": ["tanzania"],
+    "Uganda": ["uganda"],
+    "Canada": ["canada"],
+    "France": ["france"],
+    "Germany": ["germany", "deutschland"],
+    "India": ["india"],
+    "Netherlands": ["netherlands", "the netherlands", "holland"],
+    "United Arab Emirates": ["united arab emirates", "uae"],
+    "United Kingdom": ["united kingdom", "uk", "gb", "great britain", "england"],
+    "United States": ["united states", "united states of america", "usa", "us"],
+}
+
+# Canonical city -> (aliases, country).
+CITIES = {
+    "Addis Ababa": (["addis ababa", "addis abeba", "addis", "finfinne"], "Ethiopia"),
+    "Accra": (["accra"], "Ghana"),
+    "Cairo": (["cairo"], "Egypt"),
+    "Cape Town": (["cape town"], "South Africa"),
+    "Dar es Salaam": (["dar es salaam", "dar"], "Tanzania"),
+    "Johannesburg": (["johannesburg", "joburg"], "South Africa"),
+    "Kampala": (["kampala"], "Uganda"),
+    "Kigali": (["kigali"], "Rwanda"),
+    "Lagos": (["lagos"], "Nigeria"),
+    "Nairobi": (["nairobi"], "Kenya"),
+    "Amsterdam": (["amsterdam"], "Netherlands"),
+    "Bengaluru": (["bengaluru", "bangalore"], "India"),
+    "Berlin": (["berlin"], "Germany"),
+    "Dubai": (["dubai"], "United Arab Emirates"),
+    "London": (["london"], "United Kingdom"),
+    "New York": (["new york", "new york city", "nyc"], "United States"),
+    "Paris": (["paris"], "France"),
+    "San Francisco": (["san francisco", "sf"], "United States"),
+    "Toronto": (["toronto"], "Canada"),
+}
+
+_COUNTRY_ALIASES = {alias: name for name, aliases in COUNTRIES.items() for alias in aliases}
+_CITY_ALIASES = {
+    alias: (name, country) for name, (aliases, country) in CITIES.items() for alias in aliases
+}
+
+
+def _clean(part):
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s'-]", " ", part)).strip()
+
+
+def _parts(location):
+    if "," not in location and ":" in location:
+        # Already a canonical key.
+        return [_clean(part.replace("-", " ")) for part in location.split(":")]
+    return [_clean(part) for part in location.split(",")]
+
+
+def make_key(city, region, country):
+    return ":".join(slugify(part, allow_unicode=True) for part in (city, region, country) if part)
+
+
+def _normalize(location):
+    # Returns the normalized location and whether it is unambiguous: a
+    # remote alias, a canonical key, a gazetteer hit or "city, region".
+    empty = {"city": "", "region": "", "country": "", "key": ""}
+    is_key = "," not in location and ":" in location
+    parts = [part for part in _parts(location) if part]
+    if not parts:
+        return empty, False
+    lowered = [part.lower() for part in parts]
+    if lowered[0] in REMOTE_ALIASES:
+        return {**REMOTE, "key": "remote"}, True
+
+    country = ""
+    if len(parts) > 1 and lowered[-1] in _COUNTRY_ALIASES:
+        country = _COUNTRY_ALIASES[lowered.pop()]
+        parts.pop()
+    if len(parts) == 1 and lowered[0] in _COUNTRY_ALIASES and not country:
+        country, parts, lowered = _COUNTRY_ALIASES[lowered[0]], [], []
+
+    city = region = ""
+    known_city = False
+    if parts:
+        city = parts[0]
+        region = ", ".join(parts[1:])
+        known_city = lowered[0] in _CITY_ALIASES
+        if known_city:
+            city, city_country = _CITY_ALIASES[lowered[0]]
+            country = country or city_country
+            if region.lower() in (city.lower(), country.lower()):
+                region = ""
+        elif city.islower():
+            city = city.title()
+    location = {
+        "city": city,
+        "region": region,
+        "country": country,
+        "key": make_key(city, region, country),
+    }
+    return location, bool(is_key or country or known_city or region)
+
+
+def normalize(location):
+    """Return ``{"city", "region", "country", "key"}`` for a free-text location."""
+    return _normalize(location or "")[0]
+
+
+def canonical(value):
+    """
+    Normalize a filter value if it unambiguously names a location.
+
+    Returns ``None`` for bare unknown words ("Add", "Springfield"), which
+    callers should match as a substring instead.
+    """
+    location, recognized = _normalize(value or "")
+    return location if recognized else None
+
+
+def label(city, region, country):
+    return ", ".join(part for part in (city, region, country) if part)
+
+
+def location_condition(location):
+    """``Q`` matching a normalized location; a city also matches its more specific keys."""
+    if not location["city"]:
+        return Q(location_country=location["country"])
+    key = location["key"]
+    return Q(location_key=key) | Q(location_key__startswith=f"{key}:")
+
+
+def suggest(queryset, prefix, limit=10):
+    """Canonical locations whose key starts with ``prefix``, with active job counts."""
+    condition = Q(location_key__startswith=slugify(prefix, allow_unicode=True))
+    location = canonical(prefix)
+    if location is not None:
+        # Aliases ("nyc") and countries do not share a prefix with the key.
+        condition |= location_condition(location)
+    rows = (
+        queryset.filter(condition, is_active=True)
+        .exclude(location_key="")
+        .values("location_key")
+        .annotate(
+            count=Count("pk"),
+            city=Max("location_city"),
+            region=Max("location_region"),
+            country=Max("location_country"),
+        )
+        .order_by("-count", "location_key")[:limit]
+    )
+    return [
+        {
+            "key": row["location_key"],
+            "label": label(row["city"], row["region"], row["country"]),
+            "city": row["city"],
+            "region": row["region"],
+            "country": row["country"],
+            "count": row["count"],
+        }
+        for row in rows
+    ]
@@ -0,0 +1,52 @@
+"""
+Management command to compare the job list serialization paths.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.models import JobPosting
+from jobs.projections import FIELDS, build_rows, project
+from jobs.serializers import JobPostingListSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Time JobPostingListSerializer against the projected-row fast path "
+        "over existing postings and report rows per second."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="Postings per run.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per path; the best is kept.")
+
+    def _best(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = len(run())
+            timings.append(time.perf_counter() - start)
+        return count, min(timings)
+
+    def handle(self, *args, **options):
+        queryset = JobPosting.objects.order_by("-created_at", "-id")
+        rows, repeat = options["rows"], options["repeat"]
+        names = list(FIELDS)
+
+        def serializer_path():
+            page = list(queryset.select_related("company", "category")[:rows])
+            return JobPostingListSerializer(page, many=True).data
+
+        def projected_path():
+            return build_rows(project(queryset, names)[:rows], names)
+
+        count, slow = self._best(serializer_path, repeat)
+        if not count:
+            self.stdout.write(self.style.WARNING("No job postings to benchmark; load some first."))
+            return
+        _, fast = self._best(projected_path, repeat)
+        self.stdout.write(f"Rows per run: {count} (best of {repeat})")
+        self.stdout.write(f"Serializer: {count / slow:12,.0f} rows/s  ({slow * 1000:.1f} ms)")
+        self.stdout.write(f"Projected:  {count / fast:12,.0f} rows/s  ({fast * 1000:.1f} ms)")
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {slow / fast:.1f}x"))
@@ -0,0 +1,59 @@
+"""
+Management command to generate a large synthetic dataset for load testing.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.dataset import BATCH_SIZE, generate, parse_count
+
+
+def _count(value):
+    try:
+        return parse_count(value)
+    except ValueError:
+        raise CommandError(f"Invalid count '{value}'; use e.g. 500, 10k or 1.5M.")
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate employers, job seekers, postings, applications and saved jobs "
+        "with deterministic, realistic distributions (e.g. --jobs 1M --applications 5M)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employers", type=_count, default=100)
+        parser.add_argument("--seekers", type=_count, default=1000)
+        parser.add_argument("--jobs", type=_count, default=5000)
+        parser.add_argument("--applications", type=_count, default=20000)
+        parser.add_argument("--saved", type=_count, default=10000, help="Saved jobs to create.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--password",
+            default="password123",
+            help="Password of every generated user (hashed once).",
+        )
+        parser.add_argument(
+            "--domain",
+            default="dataset.example.com",
+            help="Email domain of the generated users.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            counts = generate(
+                employers=options["employers"],
+                seekers=options["seekers"],
+                jobs=options["jobs"],
+                applications=options["applications"],
+                saved=options["saved"],
+                seed=options["seed"],
+                password=options["password"],
+                domain=options["domain"],
+                batch_size=options["batch_size"],
+                log=self.stdout.write,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        summary = ", ".join(f"{n} {name.replace('_', ' ')}" for name, n in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Generated {summary}."))
@@ -0,0 +1,55 @@
+"""
+Management command to bulk-import job postings from a CSV or JSONL file.
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.imports import BATCH_SIZE, FORMATS, detect_format, import_jobs
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Stream job postings from a CSV or JSON Lines file into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument(
+            "--employer",
+            required=True,
+            help="Email of the employer the postings belong to.",
+        )
+        parser.add_argument("--file-format", choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Only validate the rows.")
+
+    def handle(self, *args, **options):
+        try:
+            employer = User.objects.get(email=options["employer"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email '{options['employer']}'.")
+        try:
+            file_format = detect_format(options["path"], options["file_format"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        with open(options["path"], "rb") as stream:
+            report = import_jobs(
+                stream,
+                file_format,
+                employer,
+                dry_run=options["dry_run"],
+                batch_size=options["batch_size"],
+            )
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        if report["errors_truncated"]:
+            self.stderr.write(f"... and {report['failed'] - len(report['errors'])} more failed row(s).")
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['created']} job posting(s); {report['failed']} row(s) failed."
+        ))
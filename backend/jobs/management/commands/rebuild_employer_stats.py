@@ -0,0 +1,32 @@
+"""
+Management command to rebuild per-employer dashboard statistics.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from jobs.stats import rebuild
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Rebuild employer dashboard statistics from jobs and applications."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--employer",
+            help="Only rebuild the stats of the employer with this email.",
+        )
+
+    def handle(self, *args, **options):
+        employer_id = None
+        if options["employer"]:
+            try:
+                employer_id = User.objects.get(email=options["employer"]).pk
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email '{options['employer']}'.")
+        with transaction.atomic():
+            count = rebuild(employer_id)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {count} employer(s)."))
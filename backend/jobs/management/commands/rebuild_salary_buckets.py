@@ -0,0 +1,15 @@
+"""
+Management command to rebuild the precomputed salary histograms.
+"""
+
+from django.core.management.base import BaseCommand
+
+from jobs.salaries import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the salary bucket aggregates behind /api/jobs/salary-stats/."
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} salary bucket(s)."))
@@ -0,0 +1,20 @@
+"""
+Management command to rebuild the job posting full-text search index.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for all job postings."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        with transaction.atomic():
+            count = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {count} job postings with {type(backend).__name__}."
+        ))
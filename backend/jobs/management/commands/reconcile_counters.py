@@ -0,0 +1,28 @@
+"""
+Management command to repair drift in the denormalized job counters.
+"""
+
+from django.core.management.base import BaseCommand
+
+from jobs.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold pending counter shards and recompute category and job posting "
+        "counters from the source tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted rows without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        drift = reconcile(dry_run=options["dry_run"])
+        verb = "Found" if options["dry_run"] else "Repaired"
+        for label, count in drift.items():
+            style = self.style.WARNING if count else self.style.SUCCESS
+            self.stdout.write(style(f"{verb} {count} drifted row(s) in {label}."))
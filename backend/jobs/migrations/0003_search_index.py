@@ -0,0 +1,63 @@
+"""
+Create the full-text search index for job postings.
+
+The index is vendor specific (tsvector + GIN on PostgreSQL, FTS5 on
+SQLite), so it is created with raw SQL rather than model operations.
+"""
+
+from django.db import migrations
+
+POSTGRES_CREATE = [
+    """
+    CREATE TABLE jobs_jobpostingsearch (
+        job_id bigint PRIMARY KEY
+            REFERENCES jobs_jobposting (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+        document tsvector NOT NULL
+    )
+    """,
+    "CREATE INDEX jobs_jobpostingsearch_document_gin ON jobs_jobpostingsearch USING gin (document)",
+    """
+    INSERT INTO jobs_jobpostingsearch (job_id, document)
+    SELECT id,
+           setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+           setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+           setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    FROM jobs_jobposting
+    """,
+]
+POSTGRES_DROP = ["DROP TABLE IF EXISTS jobs_jobpostingsearch"]
+
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE jobs_jobposting_fts USING fts5(
+        title, location, description, tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    INSERT INTO jobs_jobposting_fts (rowid, title, location, description)
+    SELECT id, title, location, description FROM jobs_jobposting
+    """,
+]
+SQLITE_DROP = ["DROP TABLE IF EXISTS jobs_jobposting_fts"]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_savedjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_CREATE, "sqlite": SQLITE_CREATE}),
+            _run({"postgresql": POSTGRES_DROP, "sqlite": SQLITE_DROP}),
+        ),
+    ]
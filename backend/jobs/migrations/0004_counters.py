@@ -0,0 +1,73 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_field):
+    return Coalesce(
+        Subquery(queryset.order_by().values(group_field).annotate(n=Count("pk")).values("n")),
+        Value(0),
+    )
+
+
+def populate_counters(apps, schema_editor):
+    JobCategory = apps.get_model("jobs", "JobCategory")
+    JobPosting = apps.get_model("jobs", "JobPosting")
+    SavedJob = apps.get_model("jobs", "SavedJob")
+    JobApplication = apps.get_model("applications", "JobApplication")
+
+    JobCategory.objects.update(active_job_count=_count(
+        JobPosting.objects.filter(category=OuterRef("pk"), is_active=True), "category"
+    ))
+    JobPosting.objects.update(
+        application_count=_count(JobApplication.objects.filter(job=OuterRef("pk")), "job"),
+        saved_count=_count(SavedJob.objects.filter(job=OuterRef("pk")), "job"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+        ('jobs', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobcategory',
+            name='active_job_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Denormalized number of active job postings in this category.'),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Denormalized number of applications (excluding pending shards).'),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='counter_shards',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Spread counter updates over this many shard rows instead of locking the posting row. Use for very hot postings; 0 disables.'),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='saved_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Denormalized number of saves (excluding pending shards).'),
+        ),
+        migrations.CreateModel(
+            name='JobPostingCounterShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('application_count', models.IntegerField(default=0)),
+                ('saved_count', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='counter_shard_rows', to='jobs.jobposting')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job', 'shard'), name='unique_counter_shard')],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
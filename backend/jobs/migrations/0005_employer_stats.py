@@ -0,0 +1,85 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+TOP_JOBS_LIMIT = 5
+
+
+def build_employer_stats(apps, schema_editor):
+    JobPosting = apps.get_model("jobs", "JobPosting")
+    JobApplication = apps.get_model("applications", "JobApplication")
+    EmployerStats = apps.get_model("jobs", "EmployerStats")
+
+    rows = {}
+    job_totals = (
+        JobPosting.objects.values("company_id")
+        .annotate(total=Count("pk"), active=Count("pk", filter=Q(is_active=True)))
+        .order_by()
+    )
+    for entry in job_totals:
+        rows[entry["company_id"]] = EmployerStats(
+            employer_id=entry["company_id"],
+            total_jobs=entry["total"],
+            active_jobs=entry["active"],
+        )
+    status_totals = (
+        JobApplication.objects.values("job__company_id", "status")
+        .annotate(n=Count("pk"))
+        .order_by()
+    )
+    for entry in status_totals:
+        stats = rows[entry["job__company_id"]]
+        stats.total_applications += entry["n"]
+        field = f"{entry['status']}_applications"
+        if hasattr(stats, field):
+            setattr(stats, field, entry["n"])
+    for employer_id, stats in rows.items():
+        top = (
+            JobPosting.objects.filter(company_id=employer_id)
+            .annotate(app_count=Count("applications"))
+            .order_by("-app_count", "-created_at")
+            .values("id", "title", "app_count", "is_active", "created_at")[:TOP_JOBS_LIMIT]
+        )
+        stats.top_jobs = [
+            {**job, "created_at": job["created_at"].isoformat().replace("+00:00", "Z")}
+            for job in top
+        ]
+    EmployerStats.objects.bulk_create(rows.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('jobs', '0004_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployerStats',
+            fields=[
+                ('employer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='employer_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_jobs', models.PositiveIntegerField(default=0)),
+                ('active_jobs', models.PositiveIntegerField(default=0)),
+                ('total_applications', models.PositiveIntegerField(default=0)),
+                ('pending_applications', models.PositiveIntegerField(default=0)),
+                ('reviewed_applications', models.PositiveIntegerField(default=0)),
+                ('accepted_applications', models.PositiveIntegerField(default=0)),
+                ('rejected_applications', models.PositiveIntegerField(default=0)),
+                ('top_jobs', models.JSONField(blank=True, default=list, help_text='Most-applied postings, ordered by application count.')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Employer stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['company', '-application_count'], name='jobs_jobpos_company_858edf_idx'),
+        ),
+        migrations.RunPython(build_employer_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:13
+
+import math
+from collections import Counter
+
+from django.db import migrations, models
+
+BUCKET_WIDTH = 1000
+
+
+def build_salary_buckets(apps, schema_editor):
+    JobPosting = apps.get_model("jobs", "JobPosting")
+    SalaryBucket = apps.get_model("jobs", "SalaryBucket")
+
+    totals = Counter()
+    postings = JobPosting.objects.filter(is_active=True).values_list(
+        "category_id", "job_type", "location", "salary_min", "salary_max"
+    )
+    for category_id, job_type, location, *salaries in postings.iterator():
+        dimensions = [("all", ""), ("job_type", job_type)]
+        if category_id is not None:
+            dimensions.append(("category", str(category_id)))
+        if location:
+            dimensions.append(("location", location.strip().lower()))
+        for field, salary in zip(("salary_min", "salary_max"), salaries):
+            if salary is None:
+                continue
+            bucket = math.floor(salary / BUCKET_WIDTH)
+            for dimension, value in dimensions:
+                totals[dimension, value, field, bucket] += 1
+    SalaryBucket.objects.bulk_create(
+        SalaryBucket(dimension=dimension, value=value, field=field, bucket=bucket, count=n)
+        for (dimension, value, field, bucket), n in totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_category_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalaryBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('all', 'All postings'), ('category', 'Category'), ('job_type', 'Job type'), ('location', 'Location')], max_length=20)),
+                ('value', models.CharField(blank=True, default='', max_length=255)),
+                ('field', models.CharField(choices=[('salary_min', 'Minimum salary'), ('salary_max', 'Maximum salary')], max_length=20)),
+                ('bucket', models.IntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'value', 'field', 'bucket'), name='unique_salary_bucket')],
+            },
+        ),
+        migrations.RunPython(build_salary_buckets, migrations.RunPython.noop),
+    ]
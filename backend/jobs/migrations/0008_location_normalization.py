@@ -0,0 +1,89 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:16
+
+from django.conf import settings
+import math
+from collections import Counter
+
+from django.db import migrations, models
+
+from jobs.locations import normalize
+
+BUCKET_WIDTH = 1000
+
+
+def normalize_locations(apps, schema_editor):
+    JobPosting = apps.get_model("jobs", "JobPosting")
+    SalaryBucket = apps.get_model("jobs", "SalaryBucket")
+
+    postings = []
+    for posting in JobPosting.objects.only("location").iterator():
+        location = normalize(posting.location)
+        posting.location_city = location["city"]
+        posting.location_region = location["region"]
+        posting.location_country = location["country"]
+        posting.location_key = location["key"]
+        postings.append(posting)
+    JobPosting.objects.bulk_update(
+        postings,
+        ["location_city", "location_region", "location_country", "location_key"],
+        batch_size=500,
+    )
+
+    # Location salary buckets are now keyed on the canonical location.
+    totals = Counter()
+    rows = JobPosting.objects.filter(is_active=True).exclude(location_key="").values_list(
+        "location_key", "salary_min", "salary_max"
+    )
+    for key, *salaries in rows.iterator():
+        for field, salary in zip(("salary_min", "salary_max"), salaries):
+            if salary is not None:
+                totals[key, field, math.floor(salary / BUCKET_WIDTH)] += 1
+    SalaryBucket.objects.filter(dimension="location").delete()
+    SalaryBucket.objects.bulk_create(
+        SalaryBucket(dimension="location", value=key, field=field, bucket=bucket, count=n)
+        for (key, field, bucket), n in totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_salary_buckets'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='location_city',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='location_country',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='location_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='location_region',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['location_key', 'is_active'], name='jobs_jobpos_locatio_b72dc5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['location_country', 'is_active'], name='jobs_jobpos_locatio_b11054_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['location_key'], name='jobs_location_key_prefix', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(normalize_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:10
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+import jobs.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_location_normalization'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobPostingFTS',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='fts_document', serialize=False, to='jobs.jobposting')),
+                ('document', jobs.search.FTS5Column(db_column='jobs_jobposting_fts')),
+            ],
+            options={
+                'db_table': 'jobs_jobposting_fts',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='JobPostingSearch',
+            fields=[
+                ('job', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='jobs.jobposting')),
+                ('document', django.contrib.postgres.search.SearchVectorField()),
+            ],
+            options={
+                'db_table': 'jobs_jobpostingsearch',
+                'managed': False,
+            },
+        ),
+    ]
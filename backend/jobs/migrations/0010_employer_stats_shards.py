@@ -0,0 +1,36 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_search_index_models'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='employerstats',
+            name='top_jobs',
+        ),
+        migrations.CreateModel(
+            name='EmployerStatsShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('total_applications', models.IntegerField(default=0)),
+                ('pending_applications', models.IntegerField(default=0)),
+                ('reviewed_applications', models.IntegerField(default=0)),
+                ('accepted_applications', models.IntegerField(default=0)),
+                ('rejected_applications', models.IntegerField(default=0)),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='employer_stats_shards', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('employer', 'shard'), name='unique_employer_stats_shard')],
+            },
+        ),
+    ]
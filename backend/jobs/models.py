@@ -3,15 +3,24 @@ Models for Job Categories and Job Postings.
 """
 
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
+from .search import FTS5Column
+
 
 class JobCategory(models.Model):
     """Industry or domain category for job postings."""
 
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True, default="")
+    active_job_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Denormalized number of active job postings in this category.",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Job Categories"
@@ -47,6 +56,11 @@ class JobPosting(models.Model):
         related_name="job_postings",
     )
     location = models.CharField(max_length=255, db_index=True)
+    # Derived from ``location`` on save, see ``jobs.locations``.
+    location_city = models.CharField(max_length=255, blank=True, default="", editable=False)
+    location_region = models.CharField(max_length=255, blank=True, default="", editable=False)
+    location_country = models.CharField(max_length=100, blank=True, default="", editable=False)
+    location_key = models.CharField(max_length=255, blank=True, default="", editable=False)
     job_type = models.CharField(
         max_length=20,
         choices=JobType.choices,
@@ -71,6 +85,23 @@ class JobPosting(models.Model):
         help_text="Job requirements and qualifications.",
     )
     is_active = models.BooleanField(default=True, db_index=True)
+    application_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Denormalized number of applications (excluding pending shards).",
+    )
+    saved_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Denormalized number of saves (excluding pending shards).",
+    )
+    counter_shards = models.PositiveSmallIntegerField(
+        default=0,
+        help_text=(
+            "Spread counter updates over this many shard rows instead of "
+            "locking the posting row. Use for very hot postings; 0 disables."
+        ),
+    )
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -80,12 +111,98 @@ class JobPosting(models.Model):
             models.Index(fields=["category", "is_active"]),
             models.Index(fields=["job_type", "is_active"]),
             models.Index(fields=["location", "is_active"]),
+            models.Index(fields=["company", "-application_count"]),
+            models.Index(fields=["location_key", "is_active"]),
+            models.Index(fields=["location_country", "is_active"]),
+            # Prefix (LIKE 'abc%') lookups for autocomplete on PostgreSQL.
+            models.Index(
+                fields=["location_key"],
+                name="jobs_location_key_prefix",
+                opclasses=["varchar_pattern_ops"],
+            ),
         ]
 
     def __str__(self):
         return f"{self.title} at {self.company.company_name or self.company.email}"
 
 
+class JobPostingCounterShard(models.Model):
+    """
+    Pending counter deltas for a hot job posting.
+
+    Increments for postings with ``counter_shards > 0`` land on a random
+    shard row, so concurrent applies contend on different row locks.
+    Shards are folded back into the posting columns by
+    ``manage.py reconcile_counters``.
+    """
+
+    job = models.ForeignKey(
+        JobPosting,
+        on_delete=models.CASCADE,
+        related_name="counter_shard_rows",
+    )
+    shard = models.PositiveSmallIntegerField()
+    application_count = models.IntegerField(default=0)
+    saved_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "shard"],
+                name="unique_counter_shard",
+            )
+        ]
+
+    def __str__(self):
+        return f"Counter shard {self.shard} of job {self.job_id}"
+
+
+class JobPostingSearch(models.Model):
+    """
+    PostgreSQL search index row: a posting's weighted ``tsvector``.
+
+    The table is created and filled by migration ``0003_search_index``
+    and ``jobs.search``; the model only lets search queries join it.
+    """
+
+    job = models.OneToOneField(
+        JobPosting,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_constraint=False,
+        related_name="search_document",
+    )
+    document = SearchVectorField()
+
+    class Meta:
+        managed = False
+        db_table = "jobs_jobpostingsearch"
+
+
+class JobPostingFTS(models.Model):
+    """
+    SQLite search index row in the ``jobs_jobposting_fts`` FTS5 table.
+
+    ``document`` is the table's hidden column of the same name, which
+    ``MATCH`` and ``bm25()`` take.  As with ``JobPostingSearch``, the
+    table is maintained by ``jobs.search``.
+    """
+
+    job = models.OneToOneField(
+        JobPosting,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        related_name="fts_document",
+    )
+    document = FTS5Column(db_column="jobs_jobposting_fts")
+
+    class Meta:
+        managed = False
+        db_table = "jobs_jobposting_fts"
+
+
 class SavedJob(models.Model):
     """A bookmarked/saved job by a job seeker."""
 
@@ -112,3 +229,115 @@ class SavedJob(models.Model):
 
     def __str__(self):
         return f"{self.user.email} saved {self.job.title}"
+
+
+class EmployerStats(models.Model):
+    """
+    Per-employer dashboard statistics, maintained incrementally.
+
+    Updated from job and application writes by the signal handlers in
+    ``jobs.signals`` and ``applications.signals``; rebuilt from scratch with
+    ``manage.py rebuild_employer_stats``.  Application deltas for postings
+    with ``counter_shards`` are parked on ``EmployerStatsShard`` rows.
+    """
+
+    employer = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="employer_stats",
+    )
+    total_jobs = models.PositiveIntegerField(default=0)
+    active_jobs = models.PositiveIntegerField(default=0)
+    total_applications = models.PositiveIntegerField(default=0)
+    pending_applications = models.PositiveIntegerField(default=0)
+    reviewed_applications = models.PositiveIntegerField(default=0)
+    accepted_applications = models.PositiveIntegerField(default=0)
+    rejected_applications = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Employer stats"
+
+    def __str__(self):
+        return f"Stats for employer {self.employer_id}"
+
+
+class EmployerStatsShard(models.Model):
+    """
+    Pending application deltas of an employer's stats.
+
+    Applications to postings with ``counter_shards > 0`` add to a random
+    shard row instead of the ``EmployerStats`` row, so concurrent applies
+    to a hot posting do not all wait on the employer's row lock.  Folded
+    back by ``manage.py reconcile_counters``.
+    """
+
+    employer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="employer_stats_shards",
+    )
+    shard = models.PositiveSmallIntegerField()
+    total_applications = models.IntegerField(default=0)
+    pending_applications = models.IntegerField(default=0)
+    reviewed_applications = models.IntegerField(default=0)
+    accepted_applications = models.IntegerField(default=0)
+    rejected_applications = models.IntegerField(default=0)
+
+    COUNTERS = (
+        "total_applications",
+        "pending_applications",
+        "reviewed_applications",
+        "accepted_applications",
+        "rejected_applications",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["employer", "shard"],
+                name="unique_employer_stats_shard",
+            )
+        ]
+
+    def __str__(self):
+        return f"Stats shard {self.shard} of employer {self.employer_id}"
+
+
+class SalaryBucket(models.Model):
+    """
+    Number of active postings per salary bucket and filter dimension.
+
+    One row per ``(dimension, value, field, bucket)``: e.g. the postings of
+    category 3 whose ``salary_min`` falls in ``[bucket * width,
+    (bucket + 1) * width)``.  Maintained from job writes by ``jobs.signals``
+    and rebuilt with ``manage.py rebuild_salary_buckets``.
+    """
+
+    class Dimension(models.TextChoices):
+        ALL = "all", "All postings"
+        CATEGORY = "category", "Category"
+        JOB_TYPE = "job_type", "Job type"
+        LOCATION = "location", "Location"
+
+    class Field(models.TextChoices):
+        SALARY_MIN = "salary_min", "Minimum salary"
+        SALARY_MAX = "salary_max", "Maximum salary"
+
+    dimension = models.CharField(max_length=20, choices=Dimension.choices)
+    value = models.CharField(max_length=255, blank=True, default="")
+    field = models.CharField(max_length=20, choices=Field.choices)
+    bucket = models.IntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dimension", "value", "field", "bucket"],
+                name="unique_salary_bucket",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.value} {self.field} bucket {self.bucket}: {self.count}"
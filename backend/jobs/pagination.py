@@ -0,0 +1,262 @@
+"""
+Pagination classes shared by the job and application list endpoints.
+"""
+
+import base64
+import binascii
+import datetime
+import decimal
+import json
+from collections.abc import Mapping
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage, Page
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+async def apaginate_page_numbers(pagination, queryset, request):
+    """``PageNumberPagination.paginate_queryset()`` through the async ORM."""
+    pagination.request = request
+    page_size = pagination.get_page_size(request)
+    if not page_size:
+        return None
+    paginator = pagination.django_paginator_class(queryset, page_size)
+    # Paginator.count is a cached property; fill it in without a sync query.
+    paginator.count = await queryset.acount()
+    page_number = pagination.get_page_number(request, paginator)
+    try:
+        number = paginator.validate_number(page_number)
+    except InvalidPage as exc:
+        raise NotFound(pagination.invalid_page_message.format(page_number=page_number, message=str(exc)))
+    bottom = (number - 1) * page_size
+    rows = [row async for row in queryset[bottom:bottom + page_size]]
+    pagination.page = Page(rows, number, paginator)
+    if paginator.num_pages > 1 and pagination.template is not None:
+        # The browsable API shows page controls.
+        pagination.display_page_controls = True
+    return rows
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    Requests without a ``cursor`` parameter are paginated exactly like the
+    global ``PageNumberPagination``.  Passing ``?cursor=`` (empty for the
+    first page) switches to keyset mode: pages are located with a
+    ``WHERE (ordering keys) > (last row)`` clause instead of ``OFFSET``, no
+    ``COUNT(*)`` is issued, and the response carries ``next``/``previous``
+    links only.  The keys are the queryset's current ordering (as set by
+    ``OrderingFilter``) plus ``id`` as a tie-breaker, so deep pages cost
+    the same as the first one and stay stable while rows are inserted.
+    """
+
+    cursor_query_param = "cursor"
+    tiebreaker = "id"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+        queryset = self.keyset_queryset(queryset, request)
+        return self.keyset_page(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset()`` running its queries through the async ORM."""
+        self.keyset = self.cursor_query_param in request.query_params
+        if self.keyset:
+            queryset = self.keyset_queryset(queryset, request)
+            return self.keyset_page([row async for row in queryset[:self.page_size + 1]])
+
+        return await apaginate_page_numbers(self, queryset, request)
+
+    def keyset_queryset(self, queryset, request):
+        """Order and filter ``queryset`` for the requested cursor page (no query)."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        self.keys = self.get_keys(queryset)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        keys = [self.reverse_key(key) for key in self.keys] if self.reverse else self.keys
+        queryset = queryset.order_by(*(self.order_expression(key) for key in keys))
+        if self.position is not None:
+            queryset = queryset.filter(self.after_position(keys, self.position))
+        return queryset
+
+    def keyset_page(self, rows):
+        """The page out of up to ``page_size + 1`` rows of ``keyset_queryset()``."""
+        position, reverse = self.position, self.reverse
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_position = self.previous_position = None
+        if rows:
+            if has_more or reverse:
+                self.next_position = self.row_position(rows[-1])
+            if (has_more and reverse) or (position is not None and not reverse):
+                self.previous_position = self.row_position(rows[0])
+        elif position is not None:
+            # Walked off either end: offer a way back to where we came from.
+            if reverse:
+                self.next_position = position
+            else:
+                self.previous_position = position
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            "next": self.get_cursor_link(self.next_position, reverse=False),
+            "previous": self.get_cursor_link(self.previous_position, reverse=True),
+            "results": data,
+        })
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            "name": self.cursor_query_param,
+            "required": False,
+            "in": "query",
+            "description": (
+                "Opt-in keyset pagination cursor. Pass an empty value for the "
+                "first page, then follow the returned next/previous links."
+            ),
+            "schema": {"type": "string"},
+        })
+        return parameters
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def get_keys(self, queryset):
+        """
+        Return the ordering keys as ``(name, descending, nulls_last, nullable)``.
+
+        NULLs always sort last in the forward direction so that keyset
+        comparisons behave the same on PostgreSQL and SQLite.
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        keys = []
+        for item in ordering:
+            if not isinstance(item, str) or item == "?":
+                raise NotFound(self.invalid_cursor_message)
+            name = item.lstrip("-")
+            if name == "pk":
+                name = self.tiebreaker
+            keys.append((name, item.startswith("-"), True, self.is_nullable(queryset, name)))
+        if not any(key[0] == self.tiebreaker for key in keys):
+            descending = keys[0][1] if keys else False
+            keys.append((self.tiebreaker, descending, True, False))
+        return keys
+
+    @staticmethod
+    def is_nullable(queryset, name):
+        if name in queryset.query.annotations:
+            return False
+        try:
+            return queryset.model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            return True
+
+    @staticmethod
+    def reverse_key(key):
+        name, descending, nulls_last, nullable = key
+        return name, not descending, not nulls_last, nullable
+
+    @staticmethod
+    def order_expression(key):
+        name, descending, nulls_last, _ = key
+        nulls = {"nulls_last": True} if nulls_last else {"nulls_first": True}
+        return F(name).desc(**nulls) if descending else F(name).asc(**nulls)
+
+    @staticmethod
+    def after_position(keys, position):
+        """Build ``(k1, k2, ...) > (v1, v2, ...)`` honouring direction and NULLs."""
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (name, descending, nulls_last, nullable), value in zip(keys, position):
+            if value is None:
+                after = Q(pk__in=[]) if nulls_last else Q(**{f"{name}__isnull": False})
+                same = Q(**{f"{name}__isnull": True})
+            else:
+                lookup = "lt" if descending else "gt"
+                after = Q(**{f"{name}__{lookup}": value})
+                if nullable and nulls_last:
+                    after |= Q(**{f"{name}__isnull": True})
+                same = Q(**{name: value})
+            condition |= equal & after
+            equal &= same
+        return condition
+
+    def row_position(self, row):
+        if isinstance(row, Mapping):
+            return [row[name] for name, *_ in self.keys]
+        return [getattr(row, name) for name, *_ in self.keys]
+
+    # ------------------------------------------------------------------
+    # Cursor encoding
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def encode_value(value):
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        if isinstance(value, decimal.Decimal):
+            return str(value)
+        return value
+
+    def encode_cursor(self, position, reverse):
+        payload = {"p": [self.encode_value(v) for v in position]}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        """Return ``(position, reverse)``; position is ``None`` on the first page."""
+        encoded = request.query_params.get(self.cursor_query_param, "")
+        if not encoded:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            payload = json.loads(raw)
+            values = payload["p"]
+            reverse = bool(payload.get("r"))
+            if not isinstance(values, list) or len(values) != len(self.keys):
+                raise ValueError
+            position = [
+                self.decode_value(self.model, name, value)
+                for (name, *_), value in zip(self.keys, values)
+            ]
+        except (binascii.Error, ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    @staticmethod
+    def decode_value(model, name, value):
+        if value is None:
+            return None
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+    def get_cursor_link(self, position, reverse):
+        if position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(position, reverse)
+        )
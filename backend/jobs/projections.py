@@ -0,0 +1,136 @@
+"""
+Column-projected fast path for the job list.
+
+``JobPostingListSerializer`` needs full model instances (including the
+large ``description`` and ``requirements`` columns) and walks its field
+objects for every row.  ``ProjectedListMixin`` instead pages a
+``values()`` queryset of just the listed columns, joined to company and
+category, and builds each output dict directly.  Decimal and datetime
+values go through the serializer's own fields, so the JSON is identical
+to the serializer's.
+"""
+
+from functools import cache
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from accounts.serializers import UserMinimalSerializer
+from .fieldsets import requested_fields
+from .models import JobPosting
+from .serializers import JobPostingListSerializer
+
+COMPANY_FIELDS = tuple(UserMinimalSerializer.Meta.fields)
+JOB_TYPE_LABELS = dict(JobPosting.JobType.choices)
+
+# Returned by a getter when the serializer would leave the key out.
+SKIP = object()
+
+
+def _column(name):
+    return (name,), lambda row: row[name]
+
+
+def _formatted(name):
+    def get(row, name=name):
+        value = row[name]
+        return None if value is None else _serializer_fields()[name].to_representation(value)
+
+    return (name,), get
+
+
+@cache
+def _serializer_fields():
+    return JobPostingListSerializer().fields
+
+
+# Output field -> (values() columns, row -> output value), in serializer order.
+FIELDS = {
+    "id": _column("id"),
+    "title": _column("title"),
+    "company": (
+        tuple(f"company__{name}" for name in COMPANY_FIELDS),
+        lambda row: {name: row[f"company__{name}"] for name in COMPANY_FIELDS},
+    ),
+    "category": _column("category_id"),
+    # DRF skips ``category.name`` of a posting without a category.
+    "category_name": (
+        ("category_id", "category__name"),
+        lambda row: SKIP if row["category_id"] is None else row["category__name"],
+    ),
+    "location": _column("location"),
+    "job_type": _column("job_type"),
+    "job_type_display": (
+        ("job_type",),
+        lambda row: JOB_TYPE_LABELS.get(row["job_type"], row["job_type"]),
+    ),
+    "salary_min": _formatted("salary_min"),
+    "salary_max": _formatted("salary_max"),
+    "is_active": _column("is_active"),
+    "created_at": _formatted("created_at"),
+}
+
+
+def project(queryset, names):
+    """``values()`` queryset with the columns behind ``names`` and the ordering keys."""
+    columns = {column for name in names for column in FIELDS[name][0]}
+    # Keyset cursors read the ordering keys (including annotations) from the rows.
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    columns.update(item.lstrip("-") for item in ordering if isinstance(item, str) and item != "?")
+    columns.add("id")
+    return queryset.values(*sorted(columns))
+
+
+def build_rows(rows, names):
+    getters = [(name, FIELDS[name][1]) for name in names]
+    built = []
+    for row in rows:
+        data = {}
+        for name, get in getters:
+            value = get(row)
+            if value is not SKIP:
+                data[name] = value
+        built.append(data)
+    return built
+
+
+class ProjectedListMixin:
+    """
+    Serve read ``list()`` requests from projected rows instead of
+    ``JobPostingListSerializer`` instances.  Honours sparse fieldsets.
+    """
+
+    projected_list = True
+
+    def get_projected_fields(self):
+        names = list(_serializer_fields())
+        if set(names) != set(FIELDS):
+            # The serializer gained a field this projection does not know.
+            return None
+        only, omit = requested_fields(self.request)
+        if only is not None or omit:
+            # Prunes (and validates) the names like the serializer would.
+            names = list(JobPostingListSerializer(context=self.get_serializer_context()).fields)
+        return names
+
+    def list(self, request, *args, **kwargs):
+        if not self.projected_list or request.method not in SAFE_METHODS:
+            return super().list(request, *args, **kwargs)
+        names = self.get_projected_fields()
+        if names is None:
+            return super().list(request, *args, **kwargs)
+        queryset = project(self.filter_queryset(self.get_queryset()), names)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(build_rows(page, names))
+        return Response(build_rows(queryset, names))
+
+    async def alist(self, request, *args, **kwargs):
+        names = self.get_projected_fields() if self.projected_list else None
+        if names is None:
+            return await super().alist(request, *args, **kwargs)
+        queryset = project(await self.afilter_queryset(self.get_queryset()), names)
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(build_rows(page, names))
+        return Response(build_rows([row async for row in queryset], names))
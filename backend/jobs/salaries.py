@@ -0,0 +1,279 @@
+"""
+Salary statistics served from precomputed ``SalaryBucket`` histograms.
+
+Every active posting adds one to the bucket its ``salary_min`` and
+``salary_max`` fall in, once for all postings and once per category, job
+type and location.  Selections covered by a single dimension read those
+rows (a handful per bucket instead of one per posting); any other
+``JobPostingFilter`` selection falls back to one grouped query per field.
+Minimum, maximum and percentiles are resolved to ``BUCKET_WIDTH``.
+
+A posting write touches up to sixteen buckets; they are moved with two
+statements rather than one per bucket: an ``INSERT`` of the missing
+buckets that skips existing rows, then one ``UPDATE`` adding each
+bucket's delta (per ``UPDATE_BATCH`` buckets, for bulk imports).
+"""
+
+import math
+from collections import Counter
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Floor, Greatest
+from django_filters.utils import translate_validation
+
+from . import locations
+from .filters import JobPostingFilter
+from .models import JobPosting, SalaryBucket
+
+BUCKET_WIDTH = 1000
+DEFAULT_HISTOGRAM_WIDTH = 10000
+PERCENTILES = (10, 25, 50, 75, 90)
+# Buckets per UPDATE: bounds the statement's parameters and OR chain.
+UPDATE_BATCH = 100
+SALARY_FIELDS = tuple(SalaryBucket.Field.values)
+
+Dimension = SalaryBucket.Dimension
+
+
+def bucket_of(value):
+    return math.floor(Decimal(str(value)) / BUCKET_WIDTH)
+
+
+def _dimension_values(state):
+    yield Dimension.ALL, ""
+    if state["category_id"] is not None:
+        yield Dimension.CATEGORY, str(state["category_id"])
+    yield Dimension.JOB_TYPE, state["job_type"]
+    key = locations.normalize(state["location"])["key"]
+    if key:
+        yield Dimension.LOCATION, key
+
+
+def _contributions(state):
+    keys = Counter()
+    if not state or not state["is_active"]:
+        return keys
+    for field in SALARY_FIELDS:
+        if state[field] is None:
+            continue
+        bucket = bucket_of(state[field])
+        for dimension, value in _dimension_values(state):
+            keys[dimension, value, field, bucket] += 1
+    return keys
+
+
+def _key_filter(dimension, value, field, bucket):
+    return Q(dimension=dimension, value=value, field=field, bucket=bucket)
+
+
+def job_changed(old, new):
+    """
+    Move a posting between buckets after a create/update/delete.
+
+    ``old`` and ``new`` are the tracked field snapshots from
+    ``jobs.signals`` (``None`` for a created or deleted posting).
+    """
+    deltas = _contributions(new)
+    deltas.subtract(_contributions(old))
+    _apply(deltas)
+
+
+def jobs_created(states):
+    """Add the buckets of many new postings at once (bulk imports)."""
+    deltas = Counter()
+    for state in states:
+        deltas.update(_contributions(state))
+    _apply(deltas)
+
+
+def _apply(deltas):
+    added = [key for key, delta in deltas.items() if delta > 0]
+    if added:
+        # Concurrent writers may create the same buckets: keep whichever
+        # row won, the UPDATE below adds to it.
+        SalaryBucket.objects.bulk_create(
+            [
+                SalaryBucket(dimension=dimension, value=value, field=field, bucket=bucket, count=0)
+                for dimension, value, field, bucket in added
+            ],
+            ignore_conflicts=True,
+        )
+    changed = [(key, delta) for key, delta in deltas.items() if delta]
+    for start in range(0, len(changed), UPDATE_BATCH):
+        chunk = [(_key_filter(*key), delta) for key, delta in changed[start:start + UPDATE_BATCH]]
+        increment = Case(
+            *(When(condition, then=Value(delta)) for condition, delta in chunk), output_field=IntegerField()
+        )
+        SalaryBucket.objects.filter(reduce(or_, (condition for condition, _ in chunk))).update(
+            count=Greatest(F("count") + increment, Value(0))
+        )
+
+
+def _bucket_annotation(field):
+    return Floor(F(field) / Value(Decimal(BUCKET_WIDTH)))
+
+
+def rebuild():
+    """Recompute every bucket from the active postings; return the number of rows."""
+    groups = {
+        Dimension.ALL: None,
+        Dimension.CATEGORY: "category_id",
+        Dimension.JOB_TYPE: "job_type",
+        Dimension.LOCATION: "location_key",
+    }
+    totals = Counter()
+    active = JobPosting.objects.filter(is_active=True)
+    for field in SALARY_FIELDS:
+        postings = active.filter(**{f"{field}__isnull": False}).annotate(
+            salary_bucket=_bucket_annotation(field)
+        )
+        for dimension, group in groups.items():
+            columns = ["salary_bucket"] + ([group] if group else [])
+            rows = postings.values(*columns).annotate(n=Count("pk")).order_by()
+            for row in rows:
+                value = row[group] if group else ""
+                if value is None or (group and value == ""):
+                    continue
+                totals[dimension, str(value), field, int(row["salary_bucket"])] += row["n"]
+
+    with transaction.atomic():
+        SalaryBucket.objects.all().delete()
+        SalaryBucket.objects.bulk_create(
+            SalaryBucket(dimension=dimension, value=value, field=field, bucket=bucket, count=n)
+            for (dimension, value, field, bucket), n in totals.items()
+        )
+    return len(totals)
+
+
+def _bucket_lookup(selected):
+    """
+    ``SalaryBucket`` condition answering ``selected``, or ``None`` if the
+    selection is not covered by a single precomputed dimension.
+    """
+    if selected.pop("is_active", None) is not True:
+        return None
+    if not selected:
+        return Q(dimension=Dimension.ALL, value="")
+    if len(selected) != 1:
+        return None
+    name, value = selected.popitem()
+    if name == "category" and value == int(value):
+        return Q(dimension=Dimension.CATEGORY, value=str(int(value)))
+    if name == "job_type":
+        return Q(dimension=Dimension.JOB_TYPE, value=value)
+    if name == "location":
+        # Mirror JobPostingFilter.filter_location for canonical city matches.
+        location = locations.canonical(value)
+        if location and location["city"]:
+            key = location["key"]
+            return Q(dimension=Dimension.LOCATION) & (Q(value=key) | Q(value__startswith=f"{key}:"))
+    return None
+
+
+def _bucket_counts(lookup):
+    counts = {field: Counter() for field in SALARY_FIELDS}
+    rows = (
+        SalaryBucket.objects.filter(lookup, count__gt=0)
+        .values("field", "bucket")
+        .annotate(n=Sum("count"))
+        .order_by()
+    )
+    for row in rows:
+        counts[row["field"]][row["bucket"]] += row["n"]
+    return counts
+
+
+def _query_counts(queryset):
+    counts = {}
+    for field in SALARY_FIELDS:
+        rows = (
+            queryset.filter(**{f"{field}__isnull": False})
+            .annotate(salary_bucket=_bucket_annotation(field))
+            .values("salary_bucket")
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+        counts[field] = Counter({int(row["salary_bucket"]): row["n"] for row in rows})
+    return counts
+
+
+def _value_at(counts, buckets, index):
+    # Assume the values of a bucket are spread evenly across it.
+    seen = 0
+    for bucket in buckets:
+        n = counts[bucket]
+        if index < seen + n:
+            return (bucket + (index - seen + 0.5) / n) * BUCKET_WIDTH
+        seen += n
+    return (buckets[-1] + 1) * BUCKET_WIDTH
+
+
+def _percentile(counts, buckets, total, percent):
+    # Linear interpolation between the closest ranks, like numpy's default.
+    position = (total - 1) * percent / 100
+    lower = math.floor(position)
+    value = _value_at(counts, buckets, lower)
+    if position > lower:
+        upper = _value_at(counts, buckets, lower + 1)
+        value += (position - lower) * (upper - value)
+    return round(value)
+
+
+def summarize(counts, histogram_width=DEFAULT_HISTOGRAM_WIDTH):
+    """Min/max/median/percentiles and a histogram from ``{bucket: count}``."""
+    buckets = sorted(bucket for bucket, n in counts.items() if n > 0)
+    total = sum(counts[bucket] for bucket in buckets)
+    if not total:
+        return {
+            "count": 0, "min": None, "max": None, "median": None,
+            "percentiles": {}, "histogram": [],
+        }
+    percentiles = {
+        f"p{percent}": _percentile(counts, buckets, total, percent) for percent in PERCENTILES
+    }
+    histogram = Counter()
+    for bucket in buckets:
+        histogram[bucket * BUCKET_WIDTH // histogram_width * histogram_width] += counts[bucket]
+    return {
+        "count": total,
+        "min": buckets[0] * BUCKET_WIDTH,
+        "max": (buckets[-1] + 1) * BUCKET_WIDTH,
+        "median": percentiles["p50"],
+        "percentiles": percentiles,
+        "histogram": [
+            {"from": start, "to": start + histogram_width, "count": n}
+            for start, n in sorted(histogram.items())
+        ],
+    }
+
+
+def salary_stats(queryset, params, histogram_width=DEFAULT_HISTOGRAM_WIDTH):
+    """
+    Salary statistics of the postings selected by the ``JobPostingFilter``
+    parameters in ``params``; only active postings unless ``is_active`` is given.
+    """
+    data = params.copy()
+    if data.get("is_active") in (None, ""):
+        data["is_active"] = "true"
+    filterset = JobPostingFilter(data, queryset=queryset)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+
+    selected = {
+        name: value for name, value in filterset.form.cleaned_data.items()
+        if value not in (None, "")
+    }
+    lookup = _bucket_lookup(selected)
+    if lookup is not None:
+        source, counts = "buckets", _bucket_counts(lookup)
+    else:
+        source, counts = "query", _query_counts(filterset.qs)
+    return {
+        "source": source,
+        "bucket_width": histogram_width,
+        **{field: summarize(counts[field], histogram_width) for field in SALARY_FIELDS},
+    }
@@ -0,0 +1,226 @@
+"""
+Full-text search backends for job postings.
+
+The search index lives next to ``jobs_jobposting`` and is keyed by the
+posting id:
+
+    - PostgreSQL: ``jobs_jobpostingsearch`` holds a weighted ``tsvector``
+      per posting, covered by a GIN index.
+    - SQLite: ``jobs_jobposting_fts`` is an FTS5 virtual table whose
+      ``rowid`` is the posting id.
+
+Any other database falls back to the original ``icontains`` scan so the
+API keeps working everywhere.  The index tables are created by migration
+``0003_search_index`` and kept up to date by the signal handlers in
+``jobs.signals``; ``manage.py rebuild_search_index`` repopulates them.
+Searches join them through the unmanaged ``JobPostingSearch`` and
+``JobPostingFTS`` models.
+"""
+
+import abc
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection, models
+
+# Name of the annotation carrying the relevance score (higher is better).
+RANK_ANNOTATION = "search_rank"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(value):
+    """Split a raw search string into lowercase word tokens."""
+    return [token.lower() for token in TOKEN_RE.findall(value or "")]
+
+
+class FTS5Column(models.TextField):
+    """The hidden column of an FTS5 table, named after the table."""
+
+
+@FTS5Column.register_lookup
+class Match(models.Lookup):
+    """``column MATCH query`` against an FTS5 table."""
+
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class BaseSearchBackend(abc.ABC):
+    """Interface shared by all search backends."""
+
+    #: Whether this backend can order results by relevance.
+    supports_ranking = False
+
+    @abc.abstractmethod
+    def search(self, queryset, value):
+        """Filter ``queryset`` to the postings matching ``value``, annotated with ``RANK_ANNOTATION`` if ranked."""
+
+    def index(self, job_ids):
+        """Insert or refresh the index entries for the given posting ids."""
+
+    def remove(self, job_ids):
+        """Drop the index entries for the given posting ids."""
+
+    def rebuild(self):
+        """Repopulate the whole index from ``jobs_jobposting``."""
+        return 0
+
+
+class FallbackSearchBackend(BaseSearchBackend):
+    """Unindexed substring search, used when no FTS engine is available."""
+
+    def search(self, queryset, value):
+        return queryset.filter(
+            models.Q(title__icontains=value)
+            | models.Q(description__icontains=value)
+            | models.Q(location__icontains=value)
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """``tsvector`` + GIN backed search with ``ts_rank`` relevance."""
+
+    supports_ranking = True
+    table = "jobs_jobpostingsearch"
+    config = "english"
+
+    # Title matches outrank location matches, which outrank description.
+    document_sql = (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    )
+
+    def build_query(self, value):
+        # Every token must match; the last one also matches as a prefix so
+        # partially typed words still find results.
+        tokens = tokenize(value)
+        if not tokens:
+            return None
+        terms = tokens[:-1] + [f"{tokens[-1]}:*"]
+        return " & ".join(terms)
+
+    def search(self, queryset, value):
+        query = self.build_query(value)
+        if query is None:
+            return queryset
+        # Join the index (JobPostingSearch), so that ts_rank() is computed
+        # on the joined row rather than in a subquery per posting.
+        tsquery = SearchQuery(query, config=self.config, search_type="raw")
+        return queryset.filter(search_document__document=tsquery).annotate(
+            **{RANK_ANNOTATION: SearchRank(models.F("search_document__document"), tsquery)}
+        )
+
+    def index(self, job_ids):
+        if not job_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table} (job_id, document) "
+                f"SELECT id, {self.document_sql} FROM jobs_jobposting WHERE id = ANY(%s) "
+                f"ON CONFLICT (job_id) DO UPDATE SET document = EXCLUDED.document",
+                [list(job_ids)],
+            )
+
+    def remove(self, job_ids):
+        if not job_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE job_id = ANY(%s)", [list(job_ids)]
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (job_id, document) "
+                f"SELECT id, {self.document_sql} FROM jobs_jobposting"
+            )
+            return cursor.rowcount
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """FTS5 backed search with ``bm25`` relevance."""
+
+    supports_ranking = True
+    table = "jobs_jobposting_fts"
+
+    # bm25() column weights, in table column order: title, location, description.
+    weights = (10.0, 4.0, 1.0)
+
+    def build_query(self, value):
+        tokens = tokenize(value)
+        if not tokens:
+            return None
+        # Quote every token so user input can never inject FTS5 operators.
+        terms = [f'"{token}"' for token in tokens[:-1]] + [f'"{tokens[-1]}"*']
+        return " ".join(terms)
+
+    def search(self, queryset, value):
+        query = self.build_query(value)
+        if query is None:
+            return queryset
+        # Join the index (JobPostingFTS) rather than ranking in a correlated
+        # subquery: the MATCH then runs once and bm25() is read off the
+        # joined rows, where a subquery re-runs the MATCH for every
+        # matching posting.  bm25() is "lower is better", so negate it to
+        # share the ordering convention of the PostgreSQL backend.
+        bm25 = models.Func(
+            models.F("fts_document__document"),
+            *(models.Value(weight) for weight in self.weights),
+            function="bm25",
+            output_field=models.FloatField(),
+        )
+        return queryset.filter(fts_document__document__match=query).annotate(**{RANK_ANNOTATION: -bm25})
+
+    def index(self, job_ids):
+        if not job_ids:
+            return
+        job_ids = list(job_ids)
+        placeholders = ", ".join(["%s"] * len(job_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid IN ({placeholders})", job_ids
+            )
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, location, description) "
+                f"SELECT id, title, location, description FROM jobs_jobposting "
+                f"WHERE id IN ({placeholders})",
+                job_ids,
+            )
+
+    def remove(self, job_ids):
+        if not job_ids:
+            return
+        job_ids = list(job_ids)
+        placeholders = ", ".join(["%s"] * len(job_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid IN ({placeholders})", job_ids
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, location, description) "
+                f"SELECT id, title, location, description FROM jobs_jobposting"
+            )
+            return cursor.rowcount
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+def get_search_backend():
+    """Return the search backend matching the default database."""
+    return BACKENDS.get(connection.vendor, FallbackSearchBackend)()
@@ -4,24 +4,23 @@ Serializers for JobCategory and JobPosting.
 
 from rest_framework import serializers
 from accounts.serializers import UserMinimalSerializer
+from .counters import read_job_counter
+from .fieldsets import SparseFieldsetSerializerMixin
 from .models import JobCategory, JobPosting
 
 
 class JobCategorySerializer(serializers.ModelSerializer):
     """Full serializer for job categories."""
 
-    job_count = serializers.SerializerMethodField()
+    job_count = serializers.IntegerField(source="active_job_count", read_only=True)
 
     class Meta:
         model = JobCategory
         fields = ["id", "name", "description", "job_count", "created_at"]
         read_only_fields = ["id", "created_at"]
 
-    def get_job_count(self, obj):
-        return obj.job_postings.filter(is_active=True).count()
 
-
-class JobPostingListSerializer(serializers.ModelSerializer):
+class JobPostingListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for listing jobs (lightweight)."""
 
     company = UserMinimalSerializer(read_only=True)
@@ -47,13 +46,14 @@ class JobPostingListSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "company", "created_at"]
 
 
-class JobPostingDetailSerializer(serializers.ModelSerializer):
+class JobPostingDetailSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Full serializer for job detail / create / update."""
 
     company = UserMinimalSerializer(read_only=True)
     category_name = serializers.CharField(source="category.name", read_only=True)
     job_type_display = serializers.CharField(source="get_job_type_display", read_only=True)
     application_count = serializers.SerializerMethodField()
+    saved_count = serializers.SerializerMethodField()
 
     class Meta:
         model = JobPosting
@@ -65,6 +65,10 @@ class JobPostingDetailSerializer(serializers.ModelSerializer):
             "category",
             "category_name",
             "location",
+            "location_city",
+            "location_region",
+            "location_country",
+            "location_key",
             "job_type",
             "job_type_display",
             "salary_min",
@@ -72,13 +76,22 @@ class JobPostingDetailSerializer(serializers.ModelSerializer):
             "requirements",
             "is_active",
             "application_count",
+            "saved_count",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["id", "company", "created_at", "updated_at"]
+        # Columns read by the method fields, for sparse fieldsets.
+        sparse_sources = {
+            "application_count": ("application_count", "counter_shards"),
+            "saved_count": ("saved_count", "counter_shards"),
+        }
 
     def get_application_count(self, obj):
-        return obj.applications.count()
+        return read_job_counter(obj, "application_count")
+
+    def get_saved_count(self, obj):
+        return read_job_counter(obj, "saved_count")
 
     def validate(self, data):
         salary_min = data.get("salary_min")
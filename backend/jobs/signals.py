@@ -0,0 +1,251 @@
+"""
+Signal handlers keeping derived job data in sync with writes.
+
+``JobPosting`` instances remember the database values of the fields in
+``TRACKED_FIELDS`` when they are loaded or saved, so handlers can tell
+what changed without querying the old row.
+"""
+
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import cache, counters, locations, salaries, stats, typeahead
+from .models import JobCategory, JobPosting, SalaryBucket, SavedJob
+from .search import get_search_backend
+
+TRACKED_FIELDS = (
+    "company_id",
+    "category_id",
+    "is_active",
+    "title",
+    "job_type",
+    "location",
+    "salary_min",
+    "salary_max",
+)
+
+_deleting = threading.local()
+
+
+def _snapshot(instance):
+    # Read from __dict__ so deferred fields are never loaded here.
+    return {field: instance.__dict__.get(field) for field in TRACKED_FIELDS}
+
+
+def previous_state(instance):
+    """Database values of ``TRACKED_FIELDS`` before the pending save/delete."""
+    return getattr(instance, "_tracked_state", None)
+
+
+def is_job_being_deleted(job_id):
+    """
+    Whether ``job_id`` is in the middle of a cascading delete.
+
+    Handlers for dependent rows (applications, saves) skip their per-row
+    bookkeeping in that case; ``job_posting_deleted`` settles it in bulk.
+    """
+    return job_id in getattr(_deleting, "job_ids", ())
+
+
+def invalidate_list_cache():
+    """
+    Bump the list cache version now and again once the write commits.
+
+    The second bump discards entries that a concurrent reader rebuilt from
+    the pre-commit state in between.
+    """
+    cache.bump_version()
+    transaction.on_commit(cache.bump_version)
+
+
+@receiver(post_init, sender=JobPosting)
+def remember_job_posting_state(sender, instance, **kwargs):
+    instance._tracked_state = _snapshot(instance) if instance.pk else None
+
+
+@receiver(pre_save, sender=JobPosting)
+def normalize_job_location(sender, instance, **kwargs):
+    location = locations.normalize(instance.location)
+    instance.location_city = location["city"]
+    instance.location_region = location["region"]
+    instance.location_country = location["country"]
+    instance.location_key = location["key"]
+
+
+@receiver(post_save, sender=JobPosting)
+def job_posting_saved(sender, instance, created, raw=False, **kwargs):
+    """Refresh the search index, counters and salary buckets of a saved posting."""
+    if raw:
+        return
+    old = None if created else previous_state(instance)
+    new = _snapshot(instance)
+    with transaction.atomic():
+        get_search_backend().index([instance.pk])
+        _adjust_category_counts(old, new)
+        stats.job_changed(old, new)
+        salaries.job_changed(old, new)
+    invalidate_list_cache()
+    _update_typeahead(old, new, instance)
+    instance._tracked_state = new
+
+
+@receiver(pre_delete, sender=JobPosting)
+def job_posting_deleting(sender, instance, **kwargs):
+    """Snapshot the applications about to be cascaded away with a posting."""
+    from applications.models import JobApplication
+
+    if not hasattr(_deleting, "job_ids"):
+        _deleting.job_ids = set()
+    _deleting.job_ids.add(instance.pk)
+    instance._deleted_applications = dict(
+        JobApplication.objects.filter(job_id=instance.pk)
+        .values_list("status")
+        .annotate(n=Count("pk"))
+        .order_by()
+    )
+
+
+@receiver(post_delete, sender=JobPosting)
+def job_posting_deleted(sender, instance, **kwargs):
+    """Drop the search index entry, counters, stats and salary buckets of a deleted posting."""
+    old = previous_state(instance) or _snapshot(instance)
+    applications = getattr(instance, "_deleted_applications", {})
+    try:
+        with transaction.atomic():
+            get_search_backend().remove([instance.pk])
+            _adjust_category_counts(old, None)
+            deltas = {"total_applications": -sum(applications.values())}
+            for status, count in applications.items():
+                if status in stats.STATUS_FIELDS:
+                    deltas[stats.STATUS_FIELDS[status]] = -count
+            stats.job_changed(old, None, **deltas)
+            salaries.job_changed(old, None)
+        invalidate_list_cache()
+        _update_typeahead(old, None)
+    finally:
+        _deleting.job_ids.discard(instance.pk)
+
+
+@receiver(post_save, sender=JobCategory)
+@receiver(post_delete, sender=JobCategory)
+def job_category_changed(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_list_cache()
+
+
+@receiver(post_save, sender=JobCategory)
+def job_category_saved(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        name = instance.name
+        transaction.on_commit(lambda: typeahead.index.apply(renamed=[(instance.pk, name)]))
+
+
+@receiver(post_delete, sender=JobCategory)
+def job_category_deleted(sender, instance, **kwargs):
+    # Postings fall back to no category via SET_NULL, which sends no signals.
+    SalaryBucket.objects.filter(
+        dimension=SalaryBucket.Dimension.CATEGORY, value=str(instance.pk)
+    ).delete()
+    pk = instance.pk
+    transaction.on_commit(lambda: typeahead.index.apply(renamed=[(pk, None)]))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def employer_profile_changed(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Employer details are embedded in job list rows."""
+    if raw or instance.role != "employer":
+        return
+    if update_fields and set(update_fields) <= {"last_login", "password"}:
+        return
+    invalidate_list_cache()
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def employer_deleting(sender, instance, **kwargs):
+    """The stats row is cascaded away with the user; keep the postings' handlers off it."""
+    stats.deleting_employers().add(instance.pk)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def employer_deleted(sender, instance, **kwargs):
+    stats.deleting_employers().discard(instance.pk)
+
+
+def job_postings_bulk_created(postings):
+    """
+    Apply the side effects of ``job_posting_saved`` to postings inserted
+    with ``bulk_create`` (which sends no signals), batched per table.
+    """
+    if not postings:
+        return
+    states = [_snapshot(posting) for posting in postings]
+    active = [state for state in states if state["is_active"]]
+    with transaction.atomic():
+        get_search_backend().index([posting.pk for posting in postings])
+        for category_id, n in Counter(state["category_id"] for state in active).items():
+            counters.adjust_category_count(category_id, n)
+        jobs_by_company = Counter(state["company_id"] for state in states)
+        active_by_company = Counter(state["company_id"] for state in active)
+        for company_id, n in jobs_by_company.items():
+            stats.adjust(
+                company_id,
+                total_jobs=n,
+                active_jobs=active_by_company[company_id],
+            )
+        salaries.jobs_created(states)
+    invalidate_list_cache()
+
+    category_counts = Counter(state["category_id"] for state in active if state["category_id"])
+    names = dict(JobCategory.objects.filter(pk__in=category_counts).values_list("pk", "name"))
+    titles = [(state["title"], 1) for state in active]
+    categories = [(pk, names[pk], n) for pk, n in category_counts.items() if pk in names]
+    transaction.on_commit(lambda: typeahead.index.apply(titles=titles, categories=categories))
+    for posting, state in zip(postings, states):
+        posting._tracked_state = state
+
+
+def _update_typeahead(old, new, instance=None):
+    """Patch the in-process typeahead index once the write has committed."""
+    old_active = old if old and old["is_active"] else None
+    new_active = new if new and new["is_active"] else None
+    titles, categories = [], []
+    if old_active and not (new_active and new_active["title"] == old_active["title"]):
+        titles.append((old_active["title"], -1))
+    if new_active and not (old_active and old_active["title"] == new_active["title"]):
+        titles.append((new_active["title"], 1))
+    old_category = old_active and old_active["category_id"]
+    new_category = new_active and new_active["category_id"]
+    if old_category != new_category:
+        if old_category:
+            categories.append((old_category, "", -1))
+        if new_category:
+            categories.append((new_category, instance.category.name, 1))
+    if titles or categories:
+        transaction.on_commit(lambda: typeahead.index.apply(titles=titles, categories=categories))
+
+
+def _adjust_category_counts(old, new):
+    old_category = old["category_id"] if old and old["is_active"] else None
+    new_category = new["category_id"] if new and new["is_active"] else None
+    if old_category == new_category:
+        return
+    counters.adjust_category_count(old_category, -1)
+    counters.adjust_category_count(new_category, 1)
+
+
+@receiver(post_save, sender=SavedJob)
+def saved_job_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.adjust_job_counter(instance.job, "saved_count", 1)
+
+
+@receiver(post_delete, sender=SavedJob)
+def saved_job_deleted(sender, instance, **kwargs):
+    if not is_job_being_deleted(instance.job_id):
+        counters.adjust_job_counter(instance.job_id, "saved_count", -1)
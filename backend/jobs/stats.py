@@ -0,0 +1,252 @@
+"""
+Incremental maintenance of ``EmployerStats``.
+
+Job and application writes translate into small ``F()`` deltas on the
+employer's stats row.  When the row does not exist yet (first write, or
+a new employer) it is rebuilt from the source tables instead, which
+already include the triggering write.  Application deltas for postings
+with ``counter_shards`` go to a random ``EmployerStatsShard`` row, as the
+posting counters do (``jobs.counters``), so applies to a hot posting do
+not queue on the employer's row; ``get_stats()`` adds the pending shard
+totals.  The ``top_jobs`` list is read from the indexed ``(company,
+-application_count)`` lookup when the stats are served, with the pending
+deltas of sharded postings added to the rows read.
+"""
+
+import random
+import threading
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from rest_framework import serializers
+
+from applications.models import JobApplication
+from .models import EmployerStats, EmployerStatsShard, JobPosting, JobPostingCounterShard
+
+TOP_JOBS_LIMIT = 5
+
+STATUS_FIELDS = {
+    status: f"{status}_applications" for status in JobApplication.Status.values
+}
+COUNTER_FIELDS = ("total_jobs", "active_jobs", "total_applications", *STATUS_FIELDS.values())
+
+_datetime_field = serializers.DateTimeField()
+
+_deleting = threading.local()
+
+
+def deleting_employers():
+    """
+    Ids of the users this thread is deleting.
+
+    Their stats row is deleted in the same cascade as their postings, so
+    the postings' handlers must not rebuild it (``jobs.signals``).
+    """
+    if not hasattr(_deleting, "employer_ids"):
+        _deleting.employer_ids = set()
+    return _deleting.employer_ids
+
+
+def _top_job_entry(job):
+    return {
+        "id": job["id"],
+        "title": job["title"],
+        "app_count": job["app_count"],
+        "is_active": job["is_active"],
+        "created_at": _datetime_field.to_representation(job["created_at"]),
+    }
+
+
+def top_jobs(employer_id):
+    """
+    An employer's most-applied postings, including pending counter shards.
+
+    The postings are read in ``(company, -application_count)`` index order.
+    Only postings with pending shard deltas can move in that order, so one
+    extra row per such posting is enough to keep the top list exact; they
+    are merged in Python.
+    """
+    pending = dict(
+        JobPostingCounterShard.objects.filter(job__company_id=employer_id)
+        .order_by()
+        .values("job")
+        .annotate(total=Sum("application_count"))
+        .exclude(total=0)
+        .values_list("job", "total")
+    )
+    fields = ("id", "title", "application_count", "is_active", "created_at")
+    postings = JobPosting.objects.filter(company_id=employer_id)
+    jobs = list(
+        postings.order_by("-application_count", "-created_at").values(*fields)[:TOP_JOBS_LIMIT + len(pending)]
+    )
+    missing = pending.keys() - {job["id"] for job in jobs}
+    if missing:
+        jobs += postings.filter(pk__in=missing).values(*fields)
+    for job in jobs:
+        job["app_count"] = max(job["application_count"] + pending.get(job["id"], 0), 0)
+    jobs.sort(key=lambda job: (job["app_count"], job["created_at"]), reverse=True)
+    return [_top_job_entry(job) for job in jobs[:TOP_JOBS_LIMIT]]
+
+
+def adjust(employer_id, **deltas):
+    """
+    Apply counter ``deltas`` (e.g. ``total_jobs=1``) to an employer's stats.
+
+    Returns ``False`` when the stats row was missing and got rebuilt.
+    """
+    if employer_id is None or employer_id in deleting_employers():
+        return False
+    updates = {
+        field: Greatest(F(field) + delta, Value(0))
+        for field, delta in deltas.items()
+        if delta
+    }
+    if not updates:
+        return True
+    updates["updated_at"] = timezone.now()
+    if not EmployerStats.objects.filter(pk=employer_id).update(**updates):
+        rebuild(employer_id)
+        return False
+    return True
+
+
+def _adjust_shard(employer_id, shards, deltas):
+    shard = random.randrange(shards)
+    updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not updates:
+        return
+    queryset = EmployerStatsShard.objects.filter(employer_id=employer_id, shard=shard)
+    if queryset.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            EmployerStatsShard.objects.create(employer_id=employer_id, shard=shard, **deltas)
+    except IntegrityError:
+        # Another writer created the shard row first.
+        queryset.update(**updates)
+
+
+def job_changed(old, new, **extra_deltas):
+    """
+    Apply the stats delta of a job posting create/update/delete.
+
+    ``old`` and ``new`` are the tracked field snapshots from
+    ``jobs.signals`` (``None`` for a created or deleted posting).
+    """
+    if old and new and old["company_id"] != new["company_id"]:
+        rebuild(old["company_id"])
+        rebuild(new["company_id"])
+        return
+    employer_id = (new or old)["company_id"]
+    deltas = {
+        "total_jobs": int(new is not None) - int(old is not None),
+        "active_jobs": int(bool(new and new["is_active"])) - int(bool(old and old["is_active"])),
+        **extra_deltas,
+    }
+    adjust(employer_id, **deltas)
+
+
+def application_changed(employer_id, old_status, new_status, shards=0):
+    """
+    Apply the stats delta of an application create/status change/delete.
+
+    ``shards`` is the posting's ``counter_shards``.
+    """
+    deltas = {
+        "total_applications": int(new_status is not None) - int(old_status is not None)
+    }
+    if old_status != new_status:
+        if old_status in STATUS_FIELDS:
+            deltas[STATUS_FIELDS[old_status]] = -1
+        if new_status in STATUS_FIELDS:
+            deltas[STATUS_FIELDS[new_status]] = deltas.get(STATUS_FIELDS[new_status], 0) + 1
+    if shards and employer_id is not None and employer_id not in deleting_employers():
+        _adjust_shard(employer_id, shards, deltas)
+    else:
+        adjust(employer_id, **deltas)
+
+
+def rebuild(employer_id=None):
+    """Recompute stats from the source tables; return the number of rows written."""
+    jobs = JobPosting.objects.all()
+    applications = JobApplication.objects.all()
+    if employer_id is not None:
+        jobs = jobs.filter(company_id=employer_id)
+        applications = applications.filter(job__company_id=employer_id)
+
+    rows = {}
+
+    def row(pk):
+        return rows.setdefault(pk, dict.fromkeys(COUNTER_FIELDS, 0))
+
+    job_totals = (
+        jobs.values("company_id")
+        .annotate(total=Count("pk"), active=Count("pk", filter=Q(is_active=True)))
+        .order_by()
+    )
+    for entry in job_totals:
+        data = row(entry["company_id"])
+        data["total_jobs"] = entry["total"]
+        data["active_jobs"] = entry["active"]
+
+    status_totals = (
+        applications.values("job__company_id", "status").annotate(n=Count("pk")).order_by()
+    )
+    for entry in status_totals:
+        data = row(entry["job__company_id"])
+        data["total_applications"] += entry["n"]
+        if entry["status"] in STATUS_FIELDS:
+            data[STATUS_FIELDS[entry["status"]]] = entry["n"]
+
+    shards = EmployerStatsShard.objects.all()
+    if employer_id is not None:
+        row(employer_id)
+        shards = shards.filter(employer_id=employer_id)
+    else:
+        # Employers whose last job was deleted still need zeroed stats.
+        for pk in EmployerStats.objects.values_list("pk", flat=True):
+            row(pk)
+
+    # The counts above already include the pending shard deltas.
+    shards.delete()
+    # One upsert: a concurrent first write may have created the row.
+    EmployerStats.objects.bulk_create(
+        [EmployerStats(employer_id=pk, **data) for pk, data in rows.items()],
+        update_conflicts=True,
+        unique_fields=["employer"],
+        update_fields=[*COUNTER_FIELDS, "updated_at"],
+    )
+    return len(rows)
+
+
+def _pending(field):
+    return Coalesce(
+        Subquery(
+            EmployerStatsShard.objects.filter(employer=OuterRef("pk"))
+            .order_by()
+            .values("employer")
+            .annotate(total=Sum(field))
+            .values("total")
+        ),
+        Value(0),
+    )
+
+
+def get_stats(employer_id):
+    """
+    Return an employer's stats row, building it on first access.
+
+    The application counts include the pending shard deltas.
+    """
+    queryset = EmployerStats.objects.annotate(
+        **{f"pending_{field}": _pending(field) for field in EmployerStatsShard.COUNTERS}
+    )
+    stats = queryset.filter(pk=employer_id).first()
+    if stats is None:
+        rebuild(employer_id)
+        stats = queryset.get(pk=employer_id)
+    for field in EmployerStatsShard.COUNTERS:
+        setattr(stats, field, max(getattr(stats, field) + getattr(stats, f"pending_{field}"), 0))
+    return stats
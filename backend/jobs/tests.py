@@ -2,19 +2,72 @@
 Tests for the jobs app — categories and job postings.
 """
 
-from django.test import TestCase
+import datetime
+import gzip
+import io
+import json
+import threading
+import time
+from collections import Counter
+from decimal import Decimal
+from unittest import skipUnless
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.urls import include, path
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 from rest_framework import status
-from .models import JobCategory, JobPosting
+from accounts.authentication import RefreshToken
+from config.query_budgets import get_query_budget
+from config.compression import _codecs, _Gzip, negotiate
+from config.renderers import ORJSONRenderer, msgpack
+from applications.models import JobApplication
+from .conditional import ConditionalGetMixin
+from .counters import fold_counter_shards, reconcile
+from .dataset import generate as generate_dataset, parse_count
+from .imports import import_jobs
+from .models import (
+    EmployerStats,
+    EmployerStatsShard,
+    JobCategory,
+    JobPosting,
+    JobPostingCounterShard,
+    SalaryBucket,
+    SavedJob,
+)
+from .locations import normalize as normalize_location
+from .salaries import rebuild as rebuild_salary_buckets
+from .search import RANK_ANNOTATION, get_search_backend
+from .fuzzy import _count as _count_words, edit_distance, index as fuzzy_index
+from .views import JobCategoryListCreateView, JobPostingDetailView, JobPostingListCreateView
+from .typeahead import FINGERPRINT_INTERVAL, TypeaheadIndex, index as typeahead_index
+from .stats import TOP_JOBS_LIMIT, rebuild as rebuild_employer_stats
 
 User = get_user_model()
 
+# The API with the async read views (ASYNC_VIEWS is off by default).
+urlpatterns = [
+    path("api/jobs/", JobPostingListCreateView.as_async_view(), name="job-list-create"),
+    path("api/jobs/<int:pk>/", JobPostingDetailView.as_async_view(), name="job-detail"),
+    path("api/categories/", JobCategoryListCreateView.as_async_view(), name="category-list-create"),
+    path("", include("config.urls")),
+]
+
 
 class JobCategoryTests(TestCase):
     """Test job category CRUD endpoints."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.url = "/api/categories/"
         self.admin = User.objects.create_user(
@@ -64,6 +117,7 @@ class JobPostingTests(TestCase):
     """Test job posting CRUD and filtering."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.url = "/api/jobs/"
         self.employer = User.objects.create_user(
@@ -157,3 +211,1605 @@ class JobPostingTests(TestCase):
             format="json",
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SparseFieldsetTests(TestCase):
+    """Test ``?fields=`` / ``?omit=`` on the job endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.employer = User.objects.create_user(
+            email="emp@example.com", password="emppass123", role="employer"
+        )
+        self.category = JobCategory.objects.create(name="Engineering")
+        self.job = JobPosting.objects.create(
+            title="Python Developer",
+            description="Test",
+            company=self.employer,
+            category=self.category,
+            location="Addis Ababa",
+            salary_min=50000,
+            salary_max=70000,
+        )
+
+    def test_fields_trims_payload_and_sql(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/jobs/", {"fields": "id,title,location,salary_min,salary_max"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(response.data["results"][0]),
+            ["id", "title", "location", "salary_min", "salary_max"],
+        )
+        select = queries[-1]["sql"]
+        self.assertNotIn("JOIN", select)
+        self.assertNotIn('"description"', select)
+
+    def test_omit_keeps_needed_joins(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/jobs/", {"omit": "company"})
+        row = response.data["results"][0]
+        self.assertNotIn("company", row)
+        self.assertEqual(row["category_name"], "Engineering")
+        self.assertEqual(row["job_type_display"], "Full Time")
+        self.assertIn("jobs_jobcategory", queries[-1]["sql"])
+        self.assertNotIn("accounts_user", queries[-1]["sql"])
+
+    def test_detail_fields(self):
+        response = self.client.get(f"/api/jobs/{self.job.id}/", {"fields": "title,application_count,company"})
+        self.assertEqual(response.data["application_count"], 0)
+        self.assertEqual(response.data["company"]["email"], "emp@example.com")
+        self.assertEqual(set(response.data), {"title", "application_count", "company"})
+
+    def test_keyset_pages_with_fields(self):
+        for i in range(10):
+            JobPosting.objects.create(title=f"Job {i}", description="Test", company=self.employer, location="Remote")
+        response = self.client.get("/api/jobs/", {"fields": "title", "cursor": ""})
+        self.assertEqual(response.data["results"][0], {"title": "Job 9"})
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"], [{"title": "Python Developer"}])
+
+    def test_unknown_field_rejected(self):
+        response = self.client.get("/api/jobs/", {"fields": "title,secret"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
+
+    def test_writes_ignore_fieldsets(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.patch(
+            f"/api/jobs/{self.job.id}/?fields=title", {"salary_max": 90000}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("description", response.data)
+
+
+class ProjectedListTests(TestCase):
+    """Test that the projected job list matches ``JobPostingListSerializer``."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.employer = User.objects.create_user(
+            email="emp@example.com", password="x", role="employer", first_name="Emp", company_name="TechCorp"
+        )
+        other = User.objects.create_user(email="other@example.com", password="x", role="employer")
+        category = JobCategory.objects.create(name="Engineering")
+        for i in range(12):
+            JobPosting.objects.create(
+                title=f"Python Developer {i}",
+                description="Build APIs " * 50,
+                requirements="Python",
+                company=self.employer if i % 2 else other,
+                category=category if i % 3 else None,
+                location="Addis Ababa" if i % 2 else "Remote",
+                job_type=["full_time", "remote", "contract"][i % 3],
+                salary_min=50000 + i * 1234.5 if i % 4 else None,
+                salary_max=90000 if i % 4 else None,
+                is_active=i != 5,
+            )
+
+    def assert_parity(self, params):
+        projected = self.client.get("/api/jobs/", params)
+        with patch.object(JobPostingListCreateView, "projected_list", False):
+            serialized = self.client.get("/api/jobs/", params)
+        self.assertEqual(projected.status_code, status.HTTP_200_OK)
+        self.assertEqual(projected.content, serialized.content, params)
+        return projected
+
+    def test_parity(self):
+        for params in [
+            {},
+            {"page": 2},
+            {"ordering": "salary_min"},
+            {"cursor": "", "ordering": "-salary_max"},
+            {"search": "python"},
+            {"is_active": "false"},
+            {"fields": "id,title,company,salary_min"},
+            {"omit": "category_name,created_at"},
+        ]:
+            self.assert_parity(params)
+
+    def test_cursor_pages_match(self):
+        first = self.assert_parity({"cursor": "", "ordering": "title"})
+        self.assert_parity({"cursor": first.data["next"].split("cursor=")[1].split("&")[0], "ordering": "title"})
+
+    def test_skips_text_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/jobs/")
+        self.assertNotIn('"description"', queries[-1]["sql"])
+        self.assertNotIn('"requirements"', queries[-1]["sql"])
+
+    def test_benchmark_command(self):
+        out = io.StringIO()
+        call_command("benchmark_job_list", rows=5, repeat=1, stdout=out)
+        self.assertIn("Speedup", out.getvalue())
+
+
+class RendererTests(TestCase):
+    """Test the orjson and MessagePack renderers/parsers."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.employer = User.objects.create_user(
+            email="emp@example.com", password="x", role="employer", company_name="Café\u2028Co"
+        )
+        JobPosting.objects.create(
+            title="Développeur Python",
+            description="Test",
+            company=self.employer,
+            location="Addis Ababa",
+            salary_min=50000.5,
+        )
+
+    def test_orjson_matches_stdlib_renderer(self):
+        data = {
+            "results": self.client.get("/api/jobs/").data["results"],
+            "decimal": Decimal("1.50"),
+            "when": datetime.datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=datetime.timezone.utc),
+            "day": datetime.date(2024, 5, 1),
+            1: "non-string key",
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_falls_back_without_orjson(self):
+        with patch("config.renderers.orjson", None):
+            response = self.client.get("/api/jobs/")
+        self.assertEqual(response.json()["count"], 1)
+
+    def test_indent_uses_stdlib(self):
+        response = self.client.get("/api/jobs/", HTTP_ACCEPT="application/json; indent=2")
+        self.assertIn(b'\n  "count": 1', response.content)
+
+    @override_settings(
+        STORAGES={"staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}}
+    )
+    def test_browsable_api_still_served(self):
+        response = self.client.get("/api/jobs/", HTTP_ACCEPT="text/html")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("text/html", response["Content-Type"])
+
+    def test_json_body_parsed(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.post(
+            "/api/jobs/",
+            data=json.dumps({"title": "Tester", "description": "Test", "location": "Remote"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post("/api/jobs/", data="{bad", content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @skipUnless(msgpack, "msgpack is not installed")
+    def test_msgpack_round_trip(self):
+        response = self.client.get("/api/jobs/", HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        payload = msgpack.unpackb(response.content)
+        self.assertEqual(payload["results"][0]["salary_min"], "50000.50")
+        self.assertEqual(payload["results"][0]["company"]["company_name"], "Café\u2028Co")
+
+        self.client.force_authenticate(user=self.employer)
+        body = msgpack.packb({"title": "Packed", "description": "Test", "location": "Remote"})
+        response = self.client.post(
+            "/api/jobs/", data=body, content_type="application/msgpack", HTTP_ACCEPT="application/msgpack"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(msgpack.unpackb(response.content)["title"], "Packed")
+
+
+class CompressionTests(TestCase):
+    """Test the response compression middleware."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.employer = User.objects.create_user(email="emp@example.com", password="x", role="employer")
+        self.jobs = [
+            JobPosting.objects.create(
+                title=f"Python Developer {i}", description="Test", company=self.employer, location="Remote"
+            )
+            for i in range(10)
+        ]
+
+    def test_gzip_list(self):
+        plain = self.client.get("/api/jobs/")
+        response = self.client.get("/api/jobs/", HTTP_ACCEPT_ENCODING="br;q=0.5, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        revalidated = self.client.get(
+            "/api/jobs/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_skipped_responses(self):
+        response = self.client.get("/api/jobs/")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        response = self.client.get("/api/jobs/", HTTP_ACCEPT_ENCODING="gzip;q=0, identity")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        # Below COMPRESSION["MIN_SIZE"].
+        response = self.client.get("/api/categories/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_negotiate(self):
+        codecs = [codec for codec in _codecs({"gzip": 6, "br": 5, "zstd": 3}) if codec.name == "gzip"]
+        self.assertEqual(negotiate("deflate, gzip;q=0.8", codecs).name, "gzip")
+        self.assertEqual(negotiate("*", codecs).name, "gzip")
+        self.assertIsNone(negotiate("br, *;q=0", codecs))
+        self.assertIsNone(negotiate("", codecs))
+
+    def test_streaming_export(self):
+        seeker = User.objects.create_user(email="seeker@example.com", password="x")
+        JobApplication.objects.create(job=self.jobs[0], applicant=seeker, cover_letter="Hello " * 500)
+        self.client.force_authenticate(user=self.employer)
+        url = f"/api/applications/job/{self.jobs[0].id}/export/"
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        content = gzip.decompress(b"".join(response.streaming_content)).decode()
+        self.assertIn("seeker@example.com", content)
+
+    @override_settings(RESPONSE_CACHE={"ENABLED": True, "BACKGROUND_REFRESH": False})
+    def test_cache_hits_reuse_compressed_body(self):
+        cache.clear()
+        real_compress = _Gzip.compress
+        with patch.object(_Gzip, "compress", autospec=True, side_effect=real_compress) as compress:
+            first = self.client.get("/api/jobs/", HTTP_ACCEPT_ENCODING="gzip")
+            second = self.client.get("/api/jobs/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(second.content, first.content)
+
+
+class JobSearchTests(TestCase):
+    """Test full-text search and relevance ranking."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = "/api/jobs/"
+        self.employer = User.objects.create_user(
+            email="emp@example.com",
+            password="emppass123",
+            first_name="Emp",
+            last_name="User",
+            role="employer",
+        )
+        self.title_match = JobPosting.objects.create(
+            title="Python Engineer",
+            description="Build APIs.",
+            company=self.employer,
+            location="Remote",
+        )
+        self.description_match = JobPosting.objects.create(
+            title="Backend Developer",
+            description="Work with our Python engineering team.",
+            company=self.employer,
+            location="Addis Ababa",
+        )
+        JobPosting.objects.create(
+            title="UI Designer",
+            description="Figma and prototyping.",
+            company=self.employer,
+            location="Lagos",
+        )
+
+    def test_search_ranks_title_matches_first(self):
+        response = self.client.get(f"{self.url}?search=python")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [job["id"] for job in response.data["results"]]
+        self.assertEqual(ids, [self.title_match.id, self.description_match.id])
+
+    def test_search_matches_prefix_and_stems(self):
+        response = self.client.get(f"{self.url}?search=engineering")
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(f"{self.url}?search=desig")
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_explicit_ordering_overrides_relevance(self):
+        response = self.client.get(f"{self.url}?search=python&ordering=title")
+        ids = [job["id"] for job in response.data["results"]]
+        self.assertEqual(ids, [self.description_match.id, self.title_match.id])
+
+    # The response cache would serve the stale list while it refreshes, and
+    # the emptied search would be spelling-corrected.
+    @override_settings(RESPONSE_CACHE={"ENABLED": False}, FUZZY_SEARCH_ENABLED=False)
+    def test_index_follows_updates_and_deletes(self):
+        self.title_match.title = "Rust Engineer"
+        self.title_match.save()
+        response = self.client.get(f"{self.url}?search=rust")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.title_match.delete()
+        response = self.client.get(f"{self.url}?search=rust")
+        self.assertEqual(len(response.data["results"]), 0)
+
+    def test_search_joins_index(self):
+        backend = get_search_backend()
+        if not backend.supports_ranking:
+            self.skipTest("No full-text index on this database.")
+        queryset = backend.search(JobPosting.objects.all(), "python")
+        # Matched and ranked in one join, not a subquery per posting.
+        sql = str(queryset.query)
+        self.assertEqual(sql.count("SELECT"), 1)
+        self.assertEqual(sql.count("JOIN"), 1)
+        ranks = dict(queryset.values_list("id", RANK_ANNOTATION))
+        self.assertEqual(set(ranks), {self.title_match.id, self.description_match.id})
+        self.assertGreater(ranks[self.title_match.id], ranks[self.description_match.id])
+
+
+class KeysetPaginationTests(TestCase):
+    """Test the opt-in cursor pagination mode of the job list."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = "/api/jobs/"
+        self.employer = User.objects.create_user(
+            email="emp@example.com",
+            password="emppass123",
+            first_name="Emp",
+            last_name="User",
+            role="employer",
+        )
+        for i in range(25):
+            JobPosting.objects.create(
+                title=f"Job {i:02d}",
+                description="Test",
+                company=self.employer,
+                location="Remote",
+                job_type="contract" if i % 2 else "full_time",
+                # Several ties and NULLs to exercise the id tie-breaker.
+                salary_min=None if i % 5 == 0 else (i % 3) * 1000,
+            )
+
+    def walk(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            ids.extend(job["id"] for job in response.data["results"])
+            url, pages = response.data["next"], pages + 1
+        return ids, pages
+
+    def test_cursor_pages_cover_every_row_once(self):
+        for ordering in ["-created_at", "salary_min", "-salary_min", "title"]:
+            ids, pages = self.walk(f"{self.url}?cursor=&ordering={ordering}")
+            self.assertEqual(len(ids), 25, ordering)
+            self.assertEqual(len(set(ids)), 25, ordering)
+            self.assertEqual(pages, 3)
+
+    def test_cursor_respects_filters_and_order(self):
+        ids, _ = self.walk(f"{self.url}?cursor=&job_type=contract&ordering=salary_min")
+        jobs = JobPosting.objects.filter(job_type="contract")
+        self.assertEqual(len(ids), jobs.count())
+        salaries = [JobPosting.objects.get(pk=pk).salary_min for pk in ids]
+        non_null = [s for s in salaries if s is not None]
+        self.assertEqual(non_null, sorted(non_null))
+        self.assertEqual(salaries[len(non_null):], [None] * (len(salaries) - len(non_null)))
+
+    def test_cursor_over_ranked_search(self):
+        ids, pages = self.walk(f"{self.url}?cursor=&search=job")
+        self.assertEqual(len(set(ids)), 25)
+        self.assertEqual(pages, 3)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get(f"{self.url}?cursor=&ordering=salary_min")
+        second = self.client.get(first.data["next"])
+        self.assertIsNone(first.data["previous"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f"{self.url}?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_mode_unchanged(self):
+        response = self.client.get(f"{self.url}?page=3")
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(len(response.data["results"]), 5)
+
+
+class CounterTests(TestCase):
+    """Test the denormalized category and job posting counters."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.employer = User.objects.create_user(
+            email="emp@example.com",
+            password="emppass123",
+            first_name="Emp",
+            last_name="User",
+            role="employer",
+        )
+        self.seeker = User.objects.create_user(
+            email="seeker@example.com",
+            password="seekpass123",
+            first_name="Seeker",
+            last_name="User",
+            role="job_seeker",
+        )
+        self.engineering = JobCategory.objects.create(name="Engineering")
+        self.design = JobCategory.objects.create(name="Design")
+        self.job = JobPosting.objects.create(
+            title="Python Developer",
+            description="Test",
+            company=self.employer,
+            category=self.engineering,
+            location="Remote",
+        )
+
+    def counts(self):
+        self.engineering.refresh_from_db()
+        self.design.refresh_from_db()
+        return self.engineering.active_job_count, self.design.active_job_count
+
+    def test_category_count_follows_job_lifecycle(self):
+        self.assertEqual(self.counts(), (1, 0))
+        self.job.is_active = False
+        self.job.save()
+        self.assertEqual(self.counts(), (0, 0))
+        self.job.is_active = True
+        self.job.category = self.design
+        self.job.save()
+        self.assertEqual(self.counts(), (0, 1))
+        JobPosting.objects.get(pk=self.job.pk).delete()
+        self.assertEqual(self.counts(), (0, 0))
+
+    @override_settings(RESPONSE_CACHE={"ENABLED": False})
+    def test_category_list_has_no_per_row_count(self):
+        for i in range(5):
+            JobCategory.objects.create(name=f"Category {i}")
+        # Conditional GET validators, page count, page rows.
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/categories/")
+        job_counts = {c["name"]: c["job_count"] for c in response.data["results"]}
+        self.assertEqual(job_counts["Engineering"], 1)
+
+    def test_application_and_saved_counts(self):
+        self.client.force_authenticate(user=self.seeker)
+        self.client.post("/api/applications/apply/", {"job": self.job.id}, format="json")
+        self.client.post(f"/api/jobs/{self.job.id}/save/")
+        response = self.client.get(f"/api/jobs/{self.job.id}/")
+        self.assertEqual(response.data["application_count"], 1)
+        self.assertEqual(response.data["saved_count"], 1)
+        self.client.post(f"/api/jobs/{self.job.id}/save/")
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.saved_count, 0)
+
+    def test_sharded_counters(self):
+        self.job.counter_shards = 4
+        self.job.save()
+        for i in range(6):
+            seeker = User.objects.create_user(email=f"s{i}@example.com", password="x")
+            JobApplication.objects.create(job=self.job, applicant=seeker)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.application_count, 0)
+        response = self.client.get(f"/api/jobs/{self.job.id}/")
+        self.assertEqual(response.data["application_count"], 6)
+        fold_counter_shards()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.application_count, 6)
+        self.assertFalse(JobPostingCounterShard.objects.exists())
+
+    def test_reconcile_repairs_drift(self):
+        SavedJob.objects.create(user=self.seeker, job=self.job)
+        JobPosting.objects.filter(pk=self.job.pk).update(saved_count=7, application_count=3)
+        JobCategory.objects.filter(pk=self.design.pk).update(active_job_count=2)
+        drift = reconcile(dry_run=True)
+        self.assertEqual(drift["job.saved_count"], 1)
+        self.assertEqual(drift["category.active_job_count"], 1)
+        reconcile()
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.saved_count, self.job.application_count), (1, 0))
+        self.assertEqual(self.counts(), (1, 0))
+        self.assertEqual(sum(reconcile(dry_run=True).values()), 0)
+
+
+class EmployerStatsTests(TestCase):
+    """Test the incrementally maintained employer dashboard statistics."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/jobs/stats/"
+        self.employer = User.objects.create_user(
+            email="emp@example.com",
+            password="emppass123",
+            first_name="Emp",
+            last_name="User",
+            role="employer",
+        )
+        self.jobs = [
+            JobPosting.objects.create(
+                title=f"Job {i}",
+                description="Test",
+                company=self.employer,
+                location="Remote",
+            )
+            for i in range(3)
+        ]
+        self.seekers = [
+            User.objects.create_user(email=f"seeker{i}@example.com", password="x")
+            for i in range(3)
+        ]
+        for seeker in self.seekers:
+            JobApplication.objects.create(job=self.jobs[1], applicant=seeker)
+        JobApplication.objects.create(job=self.jobs[2], applicant=self.seekers[0])
+        self.client.force_authenticate(user=self.employer)
+
+    def get_stats(self, queries=3):
+        # The stats row with its pending shards, the postings' pending
+        # shards and the top postings (plus sharded postings beyond them).
+        with self.assertNumQueries(queries):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def assert_matches_rebuild(self):
+        served = self.get_stats()
+        EmployerStats.objects.all().delete()
+        rebuild_employer_stats()
+        self.assertEqual(self.get_stats(), served)
+
+    def test_stats_follow_writes(self):
+        data = self.get_stats()
+        self.assertEqual(data["total_jobs"], 3)
+        self.assertEqual(data["active_jobs"], 3)
+        self.assertEqual(data["total_applications"], 4)
+        self.assertEqual(data["applications_by_status"]["pending"], 4)
+        self.assertEqual(
+            [(job["id"], job["app_count"]) for job in data["top_jobs"][:2]],
+            [(self.jobs[1].id, 3), (self.jobs[2].id, 1)],
+        )
+        self.assert_matches_rebuild()
+
+    def test_status_change_and_deactivation(self):
+        application = JobApplication.objects.filter(job=self.jobs[1]).first()
+        application.status = "accepted"
+        application.save()
+        self.jobs[0].is_active = False
+        self.jobs[0].save()
+        data = self.get_stats()
+        self.assertEqual(data["active_jobs"], 2)
+        self.assertEqual(data["applications_by_status"]["accepted"], 1)
+        self.assertEqual(data["applications_by_status"]["pending"], 3)
+        self.assert_matches_rebuild()
+
+    def test_deleting_job_cascades_into_stats(self):
+        self.jobs[1].delete()
+        JobApplication.objects.get(job=self.jobs[2]).delete()
+        data = self.get_stats()
+        self.assertEqual(data["total_jobs"], 2)
+        self.assertEqual(data["total_applications"], 0)
+        self.assertNotIn(self.jobs[1].id, [job["id"] for job in data["top_jobs"]])
+        self.assert_matches_rebuild()
+
+    def test_top_jobs_include_pending_shards_beyond_the_top_rows(self):
+        extra = [
+            JobPosting.objects.create(title=f"Extra {i}", description="Test", company=self.employer, location="Remote")
+            for i in range(TOP_JOBS_LIMIT)
+        ]
+        JobPosting.objects.filter(pk__in=[job.pk for job in extra]).update(application_count=2)
+        JobPosting.objects.filter(pk=self.jobs[0].pk).update(counter_shards=4)
+        JobPostingCounterShard.objects.create(job=self.jobs[0], shard=0, application_count=5)
+        # The top postings' counters have not moved yet: one with a pending decrement drops out.
+        JobPosting.objects.filter(pk=extra[0].pk).update(counter_shards=4)
+        JobPostingCounterShard.objects.create(job=extra[0], shard=0, application_count=-2)
+        top = [(row["id"], row["app_count"]) for row in self.get_stats(queries=4)["top_jobs"]]
+        self.assertEqual(len(top), TOP_JOBS_LIMIT)
+        self.assertEqual(top[:2], [(self.jobs[0].id, 5), (self.jobs[1].id, 3)])
+        self.assertNotIn(extra[0].id, [job_id for job_id, _ in top])
+
+    def test_job_seekers_get_no_stats_row(self):
+        self.client.force_authenticate(user=self.seekers[0])
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(EmployerStats.objects.filter(pk=self.seekers[0].pk).exists())
+
+    def test_deleting_employer(self):
+        self.employer.delete()
+        self.assertFalse(EmployerStats.objects.exists())
+        self.assertFalse(JobPosting.objects.exists())
+        self.assertFalse(JobApplication.objects.exists())
+
+    def test_sharded_posting_applications(self):
+        JobPosting.objects.filter(pk=self.jobs[0].pk).update(counter_shards=4)
+        job = JobPosting.objects.get(pk=self.jobs[0].pk)
+        stats_before = EmployerStats.objects.values_list("total_applications", flat=True).get()
+        for seeker in self.seekers:
+            JobApplication.objects.create(job=job, applicant=seeker)
+        JobApplication.objects.filter(job=job).first().delete()
+        # The deltas are parked on shard rows, not the employer's row.
+        self.assertEqual(EmployerStats.objects.values_list("total_applications", flat=True).get(), stats_before)
+        self.assertTrue(EmployerStatsShard.objects.exists())
+        data = self.get_stats()
+        self.assertEqual(data["total_applications"], 6)
+        self.assertEqual(data["applications_by_status"]["pending"], 6)
+        self.assertEqual(
+            [(row["id"], row["app_count"]) for row in data["top_jobs"][:2]],
+            [(self.jobs[1].id, 3), (self.jobs[0].id, 2)],
+        )
+        reconcile()
+        self.assertFalse(EmployerStatsShard.objects.exists())
+        self.assertEqual(self.get_stats(), data)
+        self.assert_matches_rebuild()
+
+
+@override_settings(RESPONSE_CACHE={"ENABLED": True, "BACKGROUND_REFRESH": False})
+class ResponseCacheTests(TestCase):
+    """Test the versioned list response cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = "/api/jobs/"
+        self.employer = User.objects.create_user(
+            email="emp@example.com",
+            password="emppass123",
+            first_name="Emp",
+            last_name="User",
+            role="employer",
+        )
+        self.job = JobPosting.objects.create(
+            title="Python Developer",
+            description="Test",
+            company=self.employer,
+            location="Remote",
+            job_type="remote",
+        )
+
+    def test_miss_then_hit_without_queries(self):
+        response = self.client.get(f"{self.url}?job_type=remote")
+        self.assertEqual(response["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            cached = self.client.get(f"{self.url}?job_type=remote")
+        self.assertEqual(cached["X-Cache"], "HIT")
+        self.assertEqual(cached.json(), response.json())
+
+    def test_query_string_is_normalized(self):
+        self.client.get(f"{self.url}?job_type=remote&ordering=title")
+        response = self.client.get(f"{self.url}?ordering=title&utm_source=x&location=&job_type=remote")
+        self.assertEqual(response["X-Cache"], "HIT")
+        response = self.client.get(f"{self.url}?job_type=contract")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_write_serves_stale_then_refreshed(self):
+        self.client.get(self.url)
+        self.job.title = "Rust Developer"
+        self.job.save()
+        stale = self.client.get(self.url)
+        self.assertEqual(stale["X-Cache"], "STALE")
+        self.assertEqual(stale.data["results"][0]["title"], "Python Developer")
+        fresh = self.client.get(self.url)
+        self.assertEqual(fresh["X-Cache"], "HIT")
+        self.assertEqual(fresh.data["results"][0]["title"], "Rust Developer")
+
+    @override_settings(ALLOWED_HOSTS=["a.example.com", "b.example.com", "testserver"])
+    def test_links_built_per_request(self):
+        for i in range(10):
+            JobPosting.objects.create(
+                title=f"Job {i}", description="Test", company=self.employer, location="Remote", job_type="remote"
+            )
+        first = self.client.get(f"{self.url}?job_type=remote&utm_source=mail", HTTP_HOST="a.example.com")
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(first.data["next"], "http://a.example.com/api/jobs/?job_type=remote&page=2&utm_source=mail")
+        second = self.client.get(f"{self.url}?job_type=remote", HTTP_HOST="b.example.com")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data["next"], "http://b.example.com/api/jobs/?job_type=remote&page=2")
+        page2 = self.client.get(second.data["next"], HTTP_HOST="b.example.com")
+        self.assertEqual(page2.data["previous"], "http://b.example.com/api/jobs/?job_type=remote")
+
+        # The stale entry is refreshed from a request of its own.
+        self.job.title = "Rust Developer"
+        self.job.save()
+        stale = self.client.get(f"{self.url}?job_type=remote&utm_source=ad", HTTP_HOST="a.example.com")
+        self.assertEqual(stale["X-Cache"], "STALE")
+        fresh = self.client.get(f"{self.url}?job_type=remote", HTTP_HOST="b.example.com")
+        self.assertEqual(fresh["X-Cache"], "HIT")
+        self.assertEqual(fresh.data["next"], "http://b.example.com/api/jobs/?job_type=remote&page=2")
+
+    def test_category_list_cached_and_invalidated(self):
+        self.assertEqual(self.client.get("/api/categories/")["X-Cache"], "MISS")
+        JobCategory.objects.create(name="Design")
+        self.assertEqual(self.client.get("/api/categories/")["X-Cache"], "STALE")
+        response = self.client.get("/api/categories/")
+        self.assertEqual(response.data["count"], 1)
+
+    def test_cached_list_answers_conditional_request(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.job.title = "Rust Developer"
+        self.job.save()
+        self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_cache_stats_admin_only(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        url = "/api/jobs/cache-stats/"
+        self.client.force_authenticate(user=self.employer)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        admin = User.objects.create_user(email="admin@example.com", password="x", role="admin")
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["jobs"]["hit"], 1)
+        self.assertEqual(response.data["jobs"]["miss"], 1)
+        self.assertEqual(response.data["jobs"]["hit_ratio"], 0.5)
+
+
+class ConditionalGetTests(TestCase):
+    """Test ETag/Last-Modified handling on job endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.employer = User.objects.create_user(
+            email="emp@example.com",
+            password="emppass123",
+            first_name="Emp",
+            last_name="User",
+            role="employer",
+        )
+        self.seeker = User.objects.create_user(
+            email="seeker@example.com", password="seekerpass123", role="job_seeker"
+        )
+        self.job = JobPosting.objects.create(
+            title="Python Developer",
+            description="Test",
+            company=self.employer,
+            location="Remote",
+            job_type="remote",
+        )
+        self.url = f"/api/jobs/{self.job.id}/"
+
+    def test_detail_if_none_match(self):
+        response = self.client.get(self.url)
+        self.assertIn("ETag", response)
+        # The counters change without touching updated_at.
+        self.assertNotIn("Last-Modified", response)
+        # Only the validator lookup runs.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_if_modified_since_after_counter_change(self):
+        self.client.get(self.url)
+        since = http_date(JobPosting.objects.get(pk=self.job.pk).updated_at.timestamp() + 60)
+        JobPosting.objects.filter(pk=self.job.pk).update(application_count=5)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["application_count"], 5)
+
+        category = JobCategory.objects.create(name="Engineering")
+        self.client.get(f"/api/categories/{category.id}/")
+        JobCategory.objects.filter(pk=category.pk).update(active_job_count=3)
+        response = self.client.get(f"/api/categories/{category.id}/", HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["job_count"], 3)
+
+    def test_saved_jobs_if_modified_since_after_unsave(self):
+        self.client.force_authenticate(user=self.seeker)
+        self.client.post(f"/api/jobs/{self.job.id}/save/")
+        response = self.client.get("/api/jobs/saved/")
+        self.assertNotIn("Last-Modified", response)
+        self.client.post(f"/api/jobs/{self.job.id}/save/")
+        since = http_date(time.time() + 60)
+        response = self.client.get("/api/jobs/saved/", HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 0)
+
+    def test_last_modified_of_timestamp_validators(self):
+        class View(ConditionalGetMixin):
+            detail_validators = ("updated_at",)
+
+            def representation_key(self, request):
+                return ()
+
+        updated_at = self.job.updated_at
+        self.assertEqual(View().detail_etag(None, (updated_at,))[1], updated_at)
+        self.assertEqual(View().list_etag(None, {"last_modified": updated_at})[1], updated_at)
+        self.assertIsNone(View().list_etag(None, {"last_modified": updated_at, "count": 1})[1])
+
+    def test_detail_etag_changes_with_counters_and_company(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.force_authenticate(user=self.seeker)
+        self.client.post(f"/api/jobs/{self.job.id}/save/")
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["saved_count"], 1)
+
+        etag = response["ETag"]
+        self.employer.company_name = "Acme"
+        self.employer.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_etag_changes_with_sharded_counters(self):
+        JobPosting.objects.filter(pk=self.job.pk).update(counter_shards=4)
+        etag = self.client.get(self.url)["ETag"]
+        JobApplication.objects.create(job=JobPosting.objects.get(pk=self.job.pk), applicant=self.seeker)
+        self.assertTrue(JobPostingCounterShard.objects.filter(job=self.job).exists())
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["application_count"], 1)
+
+    def test_missing_detail_is_404(self):
+        response = self.client.get("/api/jobs/999999/", HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_uncached_list_if_none_match(self):
+        etag = self.client.get("/api/jobs/?job_type=remote")["ETag"]
+        response = self.client.get("/api/jobs/?job_type=remote", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get("/api/jobs/?job_type=contract", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_saved_jobs_if_none_match(self):
+        self.client.force_authenticate(user=self.seeker)
+        etag = self.client.get("/api/jobs/saved/")["ETag"]
+        response = self.client.get("/api/jobs/saved/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.client.post(f"/api/jobs/{self.job.id}/save/")
+        response = self.client.get("/api/jobs/saved/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+
+
+class JobFacetsTests(TestCase):
+    """Test the facet counts endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = "/api/jobs/facets/"
+        self.employer = User.objects.create_user(
+            email="emp@example.com", password="emppass123", role="employer"
+        )
+        self.engineering = JobCategory.objects.create(name="Engineering")
+        self.design = JobCategory.objects.create(name="Design")
+        for title, category, job_type, location, salary in [
+            ("Python Developer", self.engineering, "remote", "Remote", (60000, 90000)),
+            ("Go Developer", self.engineering, "full_time", "Berlin", (110000, 140000)),
+            ("Product Designer", self.design, "remote", "Remote", (40000, 50000)),
+            ("Brand Designer", self.design, "contract", "Berlin", None),
+        ]:
+            JobPosting.objects.create(
+                title=title,
+                description="Test",
+                company=self.employer,
+                category=category,
+                job_type=job_type,
+                location=location,
+                salary_min=salary and salary[0],
+                salary_max=salary and salary[1],
+            )
+
+    def facets(self, query=""):
+        response = self.client.get(f"{self.url}?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_counts_without_filters(self):
+        data = self.facets()
+        self.assertEqual(
+            [(c["name"], c["count"]) for c in data["category"]],
+            [("Design", 2), ("Engineering", 2)],
+        )
+        self.assertEqual(data["job_type"][0], {"value": "remote", "label": "Remote", "count": 2})
+        self.assertEqual(
+            {loc["label"]: loc["count"] for loc in data["location"]},
+            {"Remote": 2, "Berlin, Germany": 2},
+        )
+        salary = {band["key"]: band["count"] for band in data["salary"]}
+        self.assertEqual(salary, {"0-50k": 1, "50k-100k": 1, "100k-150k": 1, "150k+": 0})
+
+    def test_facet_ignores_its_own_filter(self):
+        data = self.facets(f"category={self.design.id}&job_type=remote")
+        # Category counts are narrowed by job_type only ...
+        self.assertEqual(
+            {c["name"]: c["count"] for c in data["category"]}, {"Design": 1, "Engineering": 1}
+        )
+        # ... and job type counts by category only.
+        self.assertEqual(
+            {t["value"]: t["count"] for t in data["job_type"]}, {"remote": 1, "contract": 1}
+        )
+        self.assertEqual(data["location"], [{"value": "remote", "label": "Remote", "count": 1}])
+
+    # Empty bands must list nothing, not a spelling-corrected search.
+    @override_settings(FUZZY_SEARCH_ENABLED=False)
+    def test_matches_list_counts(self):
+        data = self.facets("search=developer")
+        for band in data["salary"]:
+            query = "search=developer"
+            if band["salary_min"] is not None:
+                query += f"&salary_min={band['salary_min']}"
+            if band["salary_max"] is not None:
+                query += f"&salary_max={band['salary_max']}"
+            listed = self.client.get(f"/api/jobs/?{query}").data["count"]
+            self.assertEqual(listed, band["count"], band["key"])
+
+    @override_settings(RESPONSE_CACHE={"ENABLED": False})
+    def test_grouped_queries(self):
+        # ETag validators plus one query per facet.
+        with self.assertNumQueries(5):
+            self.facets("is_active=true&location=berlin")
+
+    def test_invalid_filter(self):
+        response = self.client.get(f"{self.url}?salary_min=abc")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(RESPONSE_CACHE={"ENABLED": True, "BACKGROUND_REFRESH": False})
+    def test_cached_and_invalidated(self):
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+        JobPosting.objects.filter(title="Brand Designer").get().delete()
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "STALE")
+        data = self.facets()
+        self.assertEqual({c["name"]: c["count"] for c in data["category"]}, {"Design": 1, "Engineering": 2})
+
+
+class SalaryStatsTests(TestCase):
+    """Test the bucketed salary statistics."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/jobs/salary-stats/"
+        self.employer = User.objects.create_user(
+            email="emp@example.com", password="emppass123", role="employer"
+        )
+        self.engineering = JobCategory.objects.create(name="Engineering")
+        self.jobs = [
+            JobPosting.objects.create(
+                title=f"Developer {i}",
+                description="Test",
+                company=self.employer,
+                category=self.engineering if i % 2 else None,
+                job_type="remote" if i < 5 else "contract",
+                location="Addis Ababa" if i < 3 else "Remote",
+                salary_min=20000 + i * 10000,
+                salary_max=40000 + i * 10000 if i != 9 else None,
+            )
+            for i in range(10)
+        ]
+
+    def stats(self, query=""):
+        response = self.client.get(f"{self.url}?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def bucket_rows(self):
+        return sorted(
+            SalaryBucket.objects.filter(count__gt=0).values_list(
+                "dimension", "value", "field", "bucket", "count"
+            )
+        )
+
+    def test_all_postings(self):
+        with self.assertNumQueries(1):
+            data = self.stats()
+        self.assertEqual(data["source"], "buckets")
+        salary_min = data["salary_min"]
+        self.assertEqual(salary_min["count"], 10)
+        self.assertEqual((salary_min["min"], salary_min["max"]), (20000, 111000))
+        # Exact median is 65000; values are resolved to the bucket width.
+        self.assertAlmostEqual(salary_min["median"], 65000, delta=1000)
+        self.assertEqual(len(salary_min["histogram"]), 10)
+        self.assertEqual(data["salary_max"]["count"], 9)
+
+    def test_buckets_match_grouped_query(self):
+        for query in ["", f"category={self.engineering.id}", "job_type=remote", "location=addis"]:
+            from_buckets = self.stats(query)
+            self.assertEqual(from_buckets["source"], "buckets", query)
+            # An extra (no-op) filter forces the grouped query path.
+            from_query = self.stats(f"{query}&salary_min=0")
+            self.assertEqual(from_query["source"], "query", query)
+            for field in ("salary_min", "salary_max"):
+                self.assertEqual(from_buckets[field], from_query[field], query)
+
+    def test_buckets_follow_writes(self):
+        job = self.jobs[0]
+        job.salary_min = 95000
+        job.location = "Nairobi"
+        job.save()
+        self.jobs[1].is_active = False
+        self.jobs[1].save()
+        self.jobs[2].delete()
+        maintained = self.bucket_rows()
+        rebuild_salary_buckets()
+        self.assertEqual(self.bucket_rows(), maintained)
+        self.assertEqual(self.stats("location=nairobi")["salary_min"]["count"], 1)
+
+    def test_inactive_postings_use_query(self):
+        self.jobs[0].is_active = False
+        self.jobs[0].save()
+        data = self.stats("is_active=false")
+        self.assertEqual(data["source"], "query")
+        self.assertEqual(data["salary_min"]["count"], 1)
+
+    def test_histogram_width(self):
+        data = self.stats("bucket_width=50000")
+        self.assertEqual(
+            [(b["from"], b["count"]) for b in data["salary_min"]["histogram"]],
+            [(0, 3), (50000, 5), (100000, 2)],
+        )
+        response = self.client.get(f"{self.url}?bucket_width=1500")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_empty_selection(self):
+        data = self.stats("job_type=internship")
+        self.assertEqual(data["salary_min"]["count"], 0)
+        self.assertIsNone(data["salary_min"]["median"])
+
+
+class LocationTests(TestCase):
+    """Test location normalization, filtering and autocomplete."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.employer = User.objects.create_user(
+            email="emp@example.com", password="emppass123", role="employer"
+        )
+        for location in [
+            "Addis Ababa, Ethiopia",
+            "addis ababa",
+            "Addis",
+            "Hawassa, Ethiopia",
+            "Nairobi, Kenya",
+            "Austin, TX, USA",
+            "Remote",
+        ]:
+            JobPosting.objects.create(
+                title="Developer", description="Test", company=self.employer, location=location
+            )
+
+    def test_normalize(self):
+        self.assertEqual(
+            normalize_location("addis ababa"),
+            {"city": "Addis Ababa", "region": "", "country": "Ethiopia", "key": "addis-ababa:ethiopia"},
+        )
+        self.assertEqual(normalize_location("Austin, TX, USA")["key"], "austin:tx:united-states")
+        self.assertEqual(normalize_location("  work from home ")["key"], "remote")
+        self.assertEqual(normalize_location("Kenya")["key"], "kenya")
+        self.assertEqual(normalize_location("addis-ababa:ethiopia")["key"], "addis-ababa:ethiopia")
+        self.assertEqual(normalize_location("")["key"], "")
+
+    def test_fields_follow_location(self):
+        job = JobPosting.objects.get(location="Addis")
+        self.assertEqual(job.location_key, "addis-ababa:ethiopia")
+        job.location = "Nairobi"
+        job.save()
+        job.refresh_from_db()
+        self.assertEqual((job.location_city, job.location_country), ("Nairobi", "Kenya"))
+
+    def count(self, location):
+        return self.client.get("/api/jobs/", {"location": location}).data["count"]
+
+    def test_filter_uses_canonical_key(self):
+        self.assertEqual(self.count("Addis Ababa"), 3)
+        self.assertEqual(self.count("addis-ababa:ethiopia"), 3)
+        self.assertEqual(self.count("Ethiopia"), 4)
+        self.assertEqual(self.count("Austin, TX"), 1)
+        self.assertEqual(self.count("REMOTE"), 1)
+        # Unknown bare words keep substring matching.
+        self.assertEqual(self.count("awas"), 1)
+        self.assertEqual(self.count("Springfield"), 0)
+
+    def test_autocomplete(self):
+        response = self.client.get("/api/jobs/locations/", {"q": "add"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [{
+                "key": "addis-ababa:ethiopia",
+                "label": "Addis Ababa, Ethiopia",
+                "city": "Addis Ababa",
+                "region": "",
+                "country": "Ethiopia",
+                "count": 3,
+            }],
+        )
+        keys = [row["key"] for row in self.client.get("/api/jobs/locations/", {"q": "ethiopia"}).data]
+        self.assertEqual(keys, ["addis-ababa:ethiopia", "hawassa:ethiopia"])
+        self.assertEqual(len(self.client.get("/api/jobs/locations/").data), 5)
+        response = self.client.get("/api/jobs/locations/", {"limit": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_autocomplete_counts_active_only(self):
+        JobPosting.objects.filter(location="Addis").get().delete()
+        JobPosting.objects.filter(location="addis ababa").update(is_active=False)
+        response = self.client.get("/api/jobs/locations/", {"q": "addis"})
+        self.assertEqual(response.data[0]["count"], 1)
+
+
+class TypeaheadTests(TestCase):
+    """Test the in-process title/category typeahead index."""
+
+    def setUp(self):
+        cache.clear()
+        typeahead_index.reset()
+        self.client = APIClient()
+        self.url = "/api/jobs/suggest/"
+        self.employer = User.objects.create_user(
+            email="emp@example.com", password="emppass123", role="employer"
+        )
+        self.engineering = JobCategory.objects.create(name="Engineering")
+        for title in ["Python Developer", "python developer", "Senior Python Engineer", "Data Analyst"]:
+            JobPosting.objects.create(
+                title=title, description="Test", company=self.employer,
+                location="Remote", category=self.engineering,
+            )
+        JobPosting.objects.create(
+            title="Python Intern", description="Test", company=self.employer,
+            location="Remote", is_active=False,
+        )
+        typeahead_index.build()
+
+    def tearDown(self):
+        typeahead_index.reset()
+
+    def suggest(self, q):
+        return [(row["text"], row["count"]) for row in typeahead_index.suggest(q)]
+
+    def test_prefix_of_any_word_ranked_by_popularity(self):
+        self.assertEqual(
+            self.suggest("pyth"), [("Python Developer", 2), ("Senior Python Engineer", 1)]
+        )
+        self.assertEqual(self.suggest("eng"), [("Engineering", 4), ("Senior Python Engineer", 1)])
+        self.assertEqual(self.suggest("intern"), [])
+        self.assertEqual(self.suggest(""), [])
+
+    def test_lookup_needs_no_queries(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {"q": "dev"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["kind"], "title")
+
+    def test_incremental_updates(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = JobPosting.objects.create(
+                title="Rust Developer", description="Test", company=self.employer, location="Remote"
+            )
+        self.assertEqual(self.suggest("rust"), [("Rust Developer", 1)])
+        with self.captureOnCommitCallbacks(execute=True):
+            job.title = "Go Developer"
+            job.save()
+        self.assertEqual(self.suggest("rust"), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            job.delete()
+        self.assertEqual(self.suggest("go"), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.engineering.name = "Software Engineering"
+            self.engineering.save()
+        self.assertEqual(self.suggest("soft"), [("Software Engineering", 4)])
+
+    def test_rebuilds_after_write_from_another_worker(self):
+        self.suggest("rust")
+        # No on-commit patch: the write committed in "another worker"
+        # whose per-process cache this one cannot see.
+        JobPosting.objects.create(
+            title="Rust Developer", description="Test", company=self.employer, location="Remote"
+        )
+        self.assertEqual(self.suggest("rust"), [])
+        typeahead_index.refresh()
+        self.assertEqual(self.suggest("rust"), [("Rust Developer", 1)])
+
+    def test_refresh_runs_off_the_request_path(self):
+        typeahead_index._checked_at -= FINGERPRINT_INTERVAL
+        with patch.object(typeahead_index, "_refresh_in_background") as refresh, self.assertNumQueries(0):
+            self.suggest("dev")
+            # One refresh at a time.
+            typeahead_index._checked_at -= FINGERPRINT_INTERVAL
+            self.suggest("dev")
+        refresh.assert_called_once_with()
+
+    def test_concurrent_first_lookups_build_once(self):
+        typeahead_index.reset()
+
+        def slow_build():
+            time.sleep(0.05)
+            typeahead_index._built = True
+
+        with patch.object(typeahead_index, "_build", side_effect=slow_build) as build:
+            threads = [threading.Thread(target=typeahead_index.suggest, args=("dev",)) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(build.call_count, 1)
+
+    @patch("jobs.typeahead.cache_is_shared", return_value=True)
+    def test_replays_patches_from_another_worker(self, _shared):
+        other = TypeaheadIndex()
+        other.build()
+        self.suggest("rust")
+        with self.captureOnCommitCallbacks(execute=True):
+            job = JobPosting.objects.create(
+                title="Rust Developer", description="Test", company=self.employer, location="Remote"
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            job.title = "Rust Engineer"
+            job.save()
+        with patch.object(other, "build", side_effect=AssertionError("rebuilt")), self.assertNumQueries(0):
+            other.refresh()
+            rows = other.suggest("rust")
+        self.assertEqual([(row["text"], row["count"]) for row in rows], [("Rust Engineer", 1)])
+
+    def test_limit_validation(self):
+        response = self.client.get(self.url, {"q": "dev", "limit": 50})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(FUZZY_SEARCH_ENABLED=True)
+class FuzzySearchTests(TestCase):
+    """Test spelling correction of job searches."""
+
+    def setUp(self):
+        cache.clear()
+        fuzzy_index.reset()
+        self.client = APIClient()
+        self.employer = User.objects.create_user(
+            email="emp@example.com", password="emppass123", role="employer"
+        )
+        JobCategory.objects.create(name="Engineering")
+        for title, description in [
+            ("Senior Software Engineer", "Build distributed systems in Python."),
+            ("Python Developer", "Maintain Django services and Python tooling."),
+            ("Frontend Developer", "Ship React interfaces and design systems."),
+        ]:
+            JobPosting.objects.create(
+                title=title, description=description, company=self.employer, location="Remote"
+            )
+        fuzzy_index.build()
+
+    def tearDown(self):
+        fuzzy_index.reset()
+
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance("enginer", "engineer", 2), 1)
+        self.assertEqual(edit_distance("devlopper", "developer", 2), 2)
+        self.assertEqual(edit_distance("pyhton", "python", 1), 1)
+        self.assertEqual(edit_distance("rust", "python", 2), 3)
+
+    def test_suggest(self):
+        self.assertEqual(fuzzy_index.suggest("enginer"), "engineer")
+        self.assertEqual(fuzzy_index.suggest("senior devlopper"), "senior developer")
+        # "systems" appears in two descriptions, "tooling" in only one.
+        self.assertEqual(fuzzy_index.suggest("sytems"), "systems")
+        self.assertIsNone(fuzzy_index.suggest("toolng"))
+        self.assertIsNone(fuzzy_index.suggest("python developer"))
+        self.assertIsNone(fuzzy_index.suggest("xyzzy"))
+
+    def test_zero_result_search_is_corrected(self):
+        response = self.client.get("/api/jobs/", {"search": "pyhton devloper"})
+        self.assertEqual(response.data["did_you_mean"], "python developer")
+        self.assertEqual([job["title"] for job in response.data["results"]], ["Python Developer"])
+
+    def test_known_words_skip_correction(self):
+        response = self.client.get("/api/jobs/", {"search": "engineer"})
+        self.assertEqual(response.data["count"], 1)
+        self.assertNotIn("did_you_mean", response.data)
+
+    def test_searches_with_results_skip_the_index(self):
+        with patch("jobs.fuzzy.suggest", side_effect=AssertionError("consulted")):
+            response = self.client.get("/api/jobs/", {"search": "python django"})
+        self.assertEqual(response.data["count"], 1)
+
+    def test_first_build_runs_in_the_background(self):
+        fuzzy_index.reset()
+        with patch.object(fuzzy_index, "_rebuild_in_background") as rebuild, self.assertNumQueries(0):
+            self.assertIsNone(fuzzy_index.suggest("enginer"))
+            self.assertIsNone(fuzzy_index.suggest("enginer"))
+        rebuild.assert_called_once_with()
+
+    @patch("jobs.fuzzy.MAX_CANDIDATES", 4)
+    def test_word_counts_stay_bounded_while_building(self):
+        counts = Counter()
+        for words in [{"a", "b", "c"}, {"a", "d"}, {"a", "b", "e"}]:
+            _count_words(counts, words)
+            self.assertLessEqual(len(counts), 4)
+        self.assertEqual(counts.most_common(2), [("a", 3), ("b", 2)])
+
+    def test_no_correction_without_match(self):
+        response = self.client.get("/api/jobs/", {"search": "qwertyuiop"})
+        self.assertEqual(response.data["count"], 0)
+        self.assertNotIn("did_you_mean", response.data)
+
+
+class JobImportTests(TestCase):
+    """Test the streaming bulk import of job postings."""
+
+    CSV = (
+        "title,description,category,location,job_type,salary_min,salary_max\n"
+        "Python Developer,Build APIs,Engineering,Addis,full_time,50000,70000\n"
+        "Data Engineer,Pipelines,engineering,\"Nairobi, Kenya\",remote,,\n"
+        "Designer,UI work,Design,Remote,contract,80000,60000\n"
+        "Accountant,Books,Finance,Lagos,full_time,,\n"
+    )
+
+    def setUp(self):
+        typeahead_index.reset()
+        self.client = APIClient()
+        self.url = "/api/jobs/import/"
+        self.employer = User.objects.create_user(
+            email="emp@example.com", password="emppass123", role="employer"
+        )
+        self.engineering = JobCategory.objects.create(name="Engineering")
+        self.design = JobCategory.objects.create(name="Design")
+        typeahead_index.build()
+
+    def tearDown(self):
+        typeahead_index.reset()
+
+    def upload(self, content, name="jobs.csv", **data):
+        self.client.force_authenticate(user=self.employer)
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post(self.url, {"file": upload, **data}, format="multipart")
+
+    def test_csv_import_reports_row_errors(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload(self.CSV)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["created"], response.data["failed"]), (2, 2))
+        errors = {error["row"]: error["errors"] for error in response.data["errors"]}
+        self.assertIn("salary_max", errors[4])
+        self.assertIn("category", errors[5])
+
+        job = JobPosting.objects.get(title="Data Engineer")
+        self.assertEqual((job.company, job.category, job.job_type), (self.employer, self.engineering, "remote"))
+        self.assertEqual(job.location_key, "nairobi:kenya")
+        self.engineering.refresh_from_db()
+        self.assertEqual(self.engineering.active_job_count, 2)
+        search = self.client.get("/api/jobs/", {"search": "pipelines"})
+        self.assertEqual([row["title"] for row in search.data["results"]], ["Data Engineer"])
+        self.assertEqual(typeahead_index.suggest("data")[0]["text"], "Data Engineer")
+
+    def test_side_effects_match_rebuilds(self):
+        lines = [
+            json.dumps({"title": f"Job {i}", "description": "Test", "category": self.design.id,
+                        "location": "Berlin", "salary_min": 1000 * i, "salary_max": 2000 * i,
+                        "is_active": i % 3 != 0})
+            for i in range(1, 8)
+        ]
+        report = import_jobs(io.BytesIO("\n".join(lines).encode()), "jsonl", self.employer, batch_size=3)
+        self.assertEqual((report["created"], report["failed"]), (7, 0))
+
+        self.assertEqual(sum(reconcile(dry_run=True).values()), 0)
+        fields = ("total_jobs", "active_jobs")
+        stats = EmployerStats.objects.values(*fields).get(employer=self.employer)
+        self.assertEqual((stats["total_jobs"], stats["active_jobs"]), (7, 5))
+        EmployerStats.objects.all().delete()
+        rebuild_employer_stats()
+        self.assertEqual(EmployerStats.objects.values(*fields).get(employer=self.employer), stats)
+        buckets = sorted(SalaryBucket.objects.filter(count__gt=0).values_list(
+            "dimension", "value", "field", "bucket", "count"
+        ))
+        rebuild_salary_buckets()
+        self.assertEqual(
+            sorted(SalaryBucket.objects.filter(count__gt=0).values_list(
+                "dimension", "value", "field", "bucket", "count"
+            )),
+            buckets,
+        )
+
+    def test_batches_use_bulk_inserts(self):
+        content = "title,description,location\n" + "".join(f"Job {i},Test,Remote\n" for i in range(10))
+        with CaptureQueriesContext(connection) as queries:
+            report = import_jobs(io.BytesIO(content.encode()), "csv", self.employer, batch_size=4)
+        self.assertEqual(report["created"], 10)
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "jobs_jobposting"')]
+        self.assertEqual(len(inserts), 3)
+
+    def test_invalid_json_lines(self):
+        content = '{"title": "Ok", "description": "Test", "location": "Remote"}\nnot json\n[1, 2]\n\n'
+        report = import_jobs(io.BytesIO(content.encode()), "jsonl", self.employer)
+        self.assertEqual(report["created"], 1)
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 3])
+
+    def test_dry_run_creates_nothing(self):
+        response = self.upload(self.CSV, dry_run="true")
+        self.assertEqual((response.data["created"], response.data["failed"]), (2, 2))
+        self.assertTrue(response.data["dry_run"])
+        self.assertFalse(JobPosting.objects.exists())
+
+    def test_unknown_format_rejected(self):
+        response = self.upload(self.CSV, name="jobs.txt")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.upload(self.CSV, name="jobs.txt", file_format="csv")
+        self.assertEqual(response.data["created"], 2)
+
+    def test_job_seeker_cannot_import(self):
+        seeker = User.objects.create_user(email="seeker@example.com", password="x")
+        self.client.force_authenticate(user=seeker)
+        upload = SimpleUploadedFile("jobs.csv", self.CSV.encode())
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class DatasetTests(TestCase):
+    """Test the synthetic dataset generator."""
+
+    SIZES = {"employers": 5, "seekers": 40, "jobs": 60, "applications": 300, "saved": 100}
+
+    def setUp(self):
+        typeahead_index.reset()
+
+    def tearDown(self):
+        typeahead_index.reset()
+
+    def test_generates_consistent_dataset(self):
+        counts = generate_dataset(**self.SIZES, domain="a.example.com")
+        self.assertEqual(counts["jobs"], 60)
+        self.assertEqual(JobPosting.objects.count(), 60)
+        self.assertEqual(JobApplication.objects.count(), 300)
+        self.assertEqual(SavedJob.objects.count(), 100)
+        self.assertEqual(User.objects.filter(role="employer").count(), 5)
+        self.assertTrue(User.objects.get(email="job_seeker0@a.example.com").check_password("password123"))
+        # Denormalized counters and locations match what signals would have written.
+        self.assertEqual(sum(reconcile(dry_run=True).values()), 0)
+        for job in JobPosting.objects.all()[:20]:
+            self.assertEqual(job.location_key, normalize_location(job.location)["key"])
+        for application in JobApplication.objects.select_related("job")[:50]:
+            self.assertGreaterEqual(application.applied_at, application.job.created_at)
+        self.assertTrue(SalaryBucket.objects.exists())
+        title = JobPosting.objects.filter(is_active=True).values_list("title", flat=True).first()
+        response = APIClient().get("/api/jobs/", {"search": title.split()[-1]})
+        self.assertGreater(response.data["count"], 0)
+
+    def test_same_seed_same_data(self):
+        fields = ("title", "location", "job_type", "salary_min", "is_active", "application_count")
+        generate_dataset(**self.SIZES, domain="a.example.com", seed=7)
+        first = list(JobPosting.objects.order_by("pk").values_list(*fields))
+        generate_dataset(**self.SIZES, domain="b.example.com", seed=7)
+        second = list(JobPosting.objects.order_by("pk").values_list(*fields))[len(first):]
+        self.assertEqual(first, second)
+
+    def test_existing_domain_rejected(self):
+        generate_dataset(employers=1, seekers=1, jobs=0, applications=0, saved=0)
+        with self.assertRaises(ValueError):
+            generate_dataset(employers=1, seekers=1, jobs=0, applications=0, saved=0)
+
+    def test_parse_count(self):
+        self.assertEqual(parse_count("10k"), 10_000)
+        self.assertEqual(parse_count("1.5M"), 1_500_000)
+        self.assertEqual(parse_count("500"), 500)
+        with self.assertRaises(ValueError):
+            parse_count("lots")
+
+
+class AsyncViewTests(TestCase):
+    """Test that the async read views answer exactly like the sync ones."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(employers=2, seekers=4, jobs=45, applications=40, saved=10)
+        cls.job = JobPosting.objects.order_by("pk").first()
+        cls.employer = cls.job.company
+
+    def setUp(self):
+        cache.clear()
+        self.async_client = AsyncClient()
+
+    def get_both(self, url, headers=None):
+        with CaptureQueriesContext(connection) as sync_queries:
+            sync = self.client.get(url, headers=headers)
+        # Both miss the response cache and run the same queries.
+        cache.clear()
+        with override_settings(ROOT_URLCONF=__name__), CaptureQueriesContext(connection) as async_queries:
+            asynchronous = async_to_sync(self.async_client.get)(url, headers=headers)
+        self.assertEqual(asynchronous.status_code, sync.status_code, url)
+        self.assertEqual(asynchronous.content, sync.content, url)
+        self.assertEqual(len(async_queries), len(sync_queries), url)
+        return sync, asynchronous
+
+    def test_as_view(self):
+        view = JobPostingListCreateView.as_async_view()
+        self.assertTrue(iscoroutinefunction(view))
+        self.assertIs(view.cls, JobPostingListCreateView)
+        self.assertEqual(get_query_budget(view, "GET"), 5)
+        self.assertFalse(iscoroutinefunction(JobPostingListCreateView.as_view()))
+        with override_settings(ASYNC_VIEWS=True):
+            self.assertTrue(iscoroutinefunction(JobPostingListCreateView.as_view()))
+
+    def test_job_list(self):
+        urls = [
+            "/api/jobs/",
+            "/api/jobs/?page=2",
+            "/api/jobs/?page=99",
+            "/api/jobs/?ordering=-salary_max&job_type=full_time",
+            "/api/jobs/?location=Remote&fields=id,title,company",
+            "/api/jobs/?omit=company",
+            "/api/jobs/?search=engineer",
+            "/api/jobs/?cursor=",
+            "/api/jobs/?cursor=&ordering=title",
+            "/api/jobs/?cursor=garbage",
+            "/api/jobs/?fields=nope",
+        ]
+        for url in urls:
+            self.get_both(url)
+
+    def test_cursor_pages(self):
+        url = "/api/jobs/?cursor=&ordering=-salary_min"
+        for _ in range(3):
+            sync, _ = self.get_both(url)
+            url = sync.json()["next"].replace("http://testserver", "")
+        previous = sync.json()["previous"].replace("http://testserver", "")
+        self.get_both(previous)
+
+    def test_non_projected_list(self):
+        with patch.object(JobPostingListCreateView, "projected_list", False):
+            self.get_both("/api/jobs/?page=2&ordering=title")
+
+    def test_detail(self):
+        self.get_both(f"/api/jobs/{self.job.pk}/")
+        self.get_both(f"/api/jobs/{self.job.pk}/?fields=id,title,application_count")
+        self.get_both("/api/jobs/999999/")
+        sync, _ = self.get_both(f"/api/jobs/{self.job.pk}/")
+        _, not_modified = self.get_both(f"/api/jobs/{self.job.pk}/", {"If-None-Match": sync["ETag"]})
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_detail_with_pending_shards(self):
+        # Serialized in the sync thread: the counters query their shards.
+        JobPosting.objects.filter(pk=self.job.pk).update(counter_shards=4)
+        JobPostingCounterShard.objects.create(job=self.job, shard=0, application_count=3)
+        sync, _ = self.get_both(f"/api/jobs/{self.job.pk}/")
+        self.assertEqual(sync.json()["application_count"], self.job.application_count + 3)
+
+    def test_categories(self):
+        self.get_both("/api/categories/")
+        self.get_both("/api/categories/?page=2")
+
+    def test_response_cache(self):
+        with override_settings(RESPONSE_CACHE={"ENABLED": True, "TTL": 60, "MAX_STALE": 300}):
+            with override_settings(ROOT_URLCONF=__name__):
+                miss = async_to_sync(self.async_client.get)("/api/jobs/?ordering=title")
+                with self.assertNumQueries(0):
+                    hit = async_to_sync(self.async_client.get)("/api/jobs/?ordering=title")
+            sync_hit = self.client.get("/api/jobs/?ordering=title")
+        self.assertEqual((miss["X-Cache"], hit["X-Cache"], sync_hit["X-Cache"]), ("MISS", "HIT", "HIT"))
+        self.assertEqual(hit.content, sync_hit.content)
+        self.assertEqual(hit["ETag"], sync_hit["ETag"])
+
+    def test_writes_use_the_sync_view(self):
+        token = RefreshToken.for_user(self.employer).access_token
+        with override_settings(ROOT_URLCONF=__name__):
+            response = async_to_sync(self.async_client.post)(
+                "/api/jobs/",
+                {"title": "Async Engineer", "description": "Await things", "location": "Remote"},
+                content_type="application/json",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            self.assertEqual(response.status_code, 201)
+            response = async_to_sync(self.async_client.delete)(f"/api/jobs/{self.job.pk}/")
+            self.assertEqual(response.status_code, 401)
+        self.assertTrue(JobPosting.objects.filter(title="Async Engineer", company=self.employer).exists())
@@ -0,0 +1,350 @@
+"""
+In-process typeahead index of active job titles and category names.
+
+Each worker keeps a sorted array of ``(term, entry)`` pairs, where the
+terms are the suffixes of an entry's normalized text starting at each
+word ("python developer", "developer"), so a typed prefix is a
+``bisect`` plus a range scan.  Entries are ranked by popularity: the
+number of active postings with that title, or in that category.  Short
+prefixes match large ranges, so rankings that needed a long scan are
+memoized until a write touches an entry under that prefix.
+
+The array is built at worker start (see ``config.wsgi`` and
+``config.asgi``), or by the first lookup if that failed, and patched in
+place from the job signal handlers once the write commits.  Lookups never
+query the database: catching up with the other workers' writes runs in a
+background thread, at most one at a time per worker, started by a lookup
+once the check interval has passed.  How it catches up depends on the
+cache backend:
+
+    - Shared cache (Redis): the patch is published under a new version
+      number.  Every ``CHECK_INTERVAL`` seconds the worker compares the
+      version and replays the patches it missed, in order; it only
+      rebuilds when a patch has already expired.
+    - Per-process cache (``LocMemCache``, the default): workers cannot
+      see each other's versions, so every ``FINGERPRINT_INTERVAL``
+      seconds they compare a database fingerprint (row count and latest
+      ``updated_at`` of postings and categories) and rebuild when it
+      moved.  Staleness is bounded by that interval plus the rebuild.
+"""
+
+import heapq
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+from django.db.models import Count, Max
+
+from .models import JobCategory, JobPosting
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "jobs:typeahead-version"
+DELTA_PREFIX = "jobs:typeahead-delta"
+CHECK_INTERVAL = 1.0
+FINGERPRINT_INTERVAL = 5.0
+# Seconds a published patch stays replayable, and the most patches a
+# worker replays instead of rebuilding.
+DELTA_TIMEOUT = 300
+MAX_REPLAY = 1000
+LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 20
+# Memoize rankings whose range scan visited more keys than this.
+MEMO_MIN_SCAN = 256
+MEMO_SIZE = 4096
+
+TITLE, CATEGORY = "title", "category"
+
+
+def normalize(text):
+    return re.sub(r"\s+", " ", (text or "").strip().lower())
+
+
+def _terms(text):
+    words = normalize(text).split(" ")
+    return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+def cache_is_shared():
+    """Whether the default cache is seen by all workers."""
+    return settings.CACHES["default"]["BACKEND"] not in LOCAL_CACHES
+
+
+def fingerprint():
+    """Changes with every create, update and delete of a posting or category."""
+    jobs = JobPosting.objects.aggregate(n=Count("pk"), last=Max("updated_at"))
+    categories = JobCategory.objects.aggregate(n=Count("pk"), last=Max("updated_at"))
+    return jobs["n"], jobs["last"], categories["n"], categories["last"]
+
+
+def _publish(delta):
+    """Store a patch for the other workers; returns its version, ``None`` if unversioned."""
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 0, timeout=None)
+        return None
+    cache.set(f"{DELTA_PREFIX}:{version}", delta, timeout=DELTA_TIMEOUT)
+    return version
+
+
+class TypeaheadIndex:
+    """Sorted-array prefix index; one module-level instance per worker."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # Serializes builds, so concurrent first lookups build once.
+        self._build_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything; the next lookup rebuilds from the database."""
+        with self._lock:
+            self._keys = []
+            # (kind, ident) -> {"text", "count", "id"}
+            self._entries = {}
+            self._memo = OrderedDict()
+            self._built = False
+            self._shared = False
+            self._version = None
+            self._fingerprint = None
+            self._checked_at = 0.0
+            self._refreshing = False
+
+    # -- building --------------------------------------------------------
+
+    def build(self):
+        """(Re)load every entry from the database."""
+        with self._build_lock:
+            return self._build()
+
+    def _build(self):
+        shared = cache_is_shared()
+        version = current = None
+        if shared:
+            cache.add(VERSION_KEY, 0, timeout=None)
+            version = cache.get(VERSION_KEY)
+        else:
+            # Taken before the rows are read: a write in between only
+            # makes the next check rebuild once more.
+            current = fingerprint()
+        entries = {}
+        titles = (
+            JobPosting.objects.filter(is_active=True)
+            .values_list("title")
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+        for title, n in titles:
+            entry = entries.setdefault((TITLE, normalize(title)), {"text": title, "count": 0, "id": None})
+            entry["count"] += n
+        categories = JobCategory.objects.filter(active_job_count__gt=0).values_list(
+            "pk", "name", "active_job_count"
+        )
+        for pk, name, n in categories:
+            entries[CATEGORY, pk] = {"text": name, "count": n, "id": pk}
+        keys = sorted(
+            (term, entry_key)
+            for entry_key, entry in entries.items()
+            for term in _terms(entry["text"])
+        )
+        with self._lock:
+            self._entries, self._keys = entries, keys
+            self._memo = OrderedDict()
+            self._built = True
+            self._shared = shared
+            self._version = version
+            self._fingerprint = current
+            self._checked_at = time.monotonic()
+        return len(entries)
+
+    def _ensure_fresh(self):
+        if not self._built:
+            with self._build_lock:
+                if not self._built:
+                    self._build()
+            return
+        now = time.monotonic()
+        with self._lock:
+            interval = CHECK_INTERVAL if self._shared else FINGERPRINT_INTERVAL
+            if self._refreshing or now - self._checked_at < interval:
+                return
+            self._checked_at = now
+            self._refreshing = True
+        self._refresh_in_background()
+
+    def _refresh_in_background(self):
+        def run():
+            close_old_connections()
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Refreshing the typeahead index failed")
+            finally:
+                self._refreshing = False
+                connections.close_all()
+
+        threading.Thread(target=run, name="typeahead index refresh", daemon=True).start()
+
+    def refresh(self):
+        """Catch up with the other workers' writes: replay their patches, or rebuild."""
+        if not self._shared:
+            if fingerprint() != self._fingerprint:
+                self.build()
+            return
+        version = cache.get(VERSION_KEY)
+        if version != self._version and not self._replay(version):
+            self.build()
+
+    def _replay(self, version):
+        """Apply the patches published since our version; ``False`` if one is missing."""
+        if version is None or self._version is None or not 0 < version - self._version <= MAX_REPLAY:
+            return False
+        keys = [f"{DELTA_PREFIX}:{v}" for v in range(self._version + 1, version + 1)]
+        deltas = cache.get_many(keys)
+        if len(deltas) < len(keys):
+            return False
+        with self._lock:
+            for key in keys:
+                self._patch(**deltas[key])
+            self._version = version
+        return True
+
+    # -- incremental updates ----------------------------------------------
+
+    def _invalidate(self, text):
+        terms = _terms(text)
+        for prefix in [p for p in self._memo if any(term.startswith(p) for term in terms)]:
+            del self._memo[prefix]
+
+    def _add_keys(self, entry_key, text):
+        self._invalidate(text)
+        for term in _terms(text):
+            insort(self._keys, (term, entry_key))
+
+    def _remove_keys(self, entry_key, text):
+        self._invalidate(text)
+        for term in _terms(text):
+            i = bisect_left(self._keys, (term, entry_key))
+            if i < len(self._keys) and self._keys[i] == (term, entry_key):
+                del self._keys[i]
+
+    def _adjust(self, entry_key, text, delta, ident=None):
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            if delta <= 0:
+                return
+            entry = self._entries[entry_key] = {"text": text, "count": 0, "id": ident}
+            self._add_keys(entry_key, text)
+        entry["count"] += delta
+        self._invalidate(entry["text"])
+        if entry["count"] <= 0:
+            self._remove_keys(entry_key, entry["text"])
+            del self._entries[entry_key]
+
+    def apply(self, titles=(), categories=(), renamed=()):
+        """
+        Patch the index after a committed write.
+
+        ``titles`` and ``categories`` are ``(title, delta)`` and
+        ``(category_id, name, delta)`` pairs; ``renamed`` holds
+        ``(category_id, new_name)`` (``None`` for a deleted category).
+        """
+        delta = {"titles": list(titles), "categories": list(categories), "renamed": list(renamed)}
+        with self._lock:
+            if not self._shared or not self._built:
+                if self._built:
+                    # Our own write moved the fingerprint too; the next
+                    # check rebuilds, which also picks up concurrent writes.
+                    self._patch(**delta)
+                if cache_is_shared():
+                    _publish(delta)
+                return
+            version = _publish(delta)
+            if version is not None and version == self._version + 1:
+                self._patch(**delta)
+                self._version = version
+            else:
+                # Other workers published in between: replay everything,
+                # ours included, in order on the next lookup.
+                self._checked_at = 0.0
+
+    def _patch(self, titles, categories, renamed):
+        with self._lock:
+            if self._built:
+                for title, delta in titles:
+                    self._adjust((TITLE, normalize(title)), title, delta)
+                for pk, name, delta in categories:
+                    self._adjust((CATEGORY, pk), name, delta, ident=pk)
+                for pk, name in renamed:
+                    entry = self._entries.get((CATEGORY, pk))
+                    if entry is None:
+                        continue
+                    self._remove_keys((CATEGORY, pk), entry["text"])
+                    if name is None:
+                        del self._entries[CATEGORY, pk]
+                    else:
+                        entry["text"] = name
+                        self._add_keys((CATEGORY, pk), name)
+
+    # -- lookups ------------------------------------------------------------
+
+    def _ranked(self, prefix):
+        ranked = self._memo.get(prefix)
+        if ranked is not None:
+            self._memo.move_to_end(prefix)
+            return ranked
+        matches = set()
+        start = i = bisect_left(self._keys, (prefix,))
+        while i < len(self._keys) and self._keys[i][0].startswith(prefix):
+            matches.add(self._keys[i][1])
+            i += 1
+        ranked = heapq.nsmallest(
+            MAX_LIMIT,
+            matches,
+            key=lambda key: (-self._entries[key]["count"], self._entries[key]["text"].lower()),
+        )
+        if i - start > MEMO_MIN_SCAN:
+            self._memo[prefix] = ranked
+            if len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return ranked
+
+    def suggest(self, prefix, limit=DEFAULT_LIMIT):
+        """Top ``limit`` entries with a word starting with ``prefix``, most popular first."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        self._ensure_fresh()
+        with self._lock:
+            best = self._ranked(prefix)[:limit]
+            return [
+                {
+                    "text": self._entries[key]["text"],
+                    "kind": key[0],
+                    "id": self._entries[key]["id"],
+                    "count": self._entries[key]["count"],
+                }
+                for key in best
+            ]
+
+
+index = TypeaheadIndex()
+
+
+def warm_up():
+    """Build the index at worker start; failures only delay it to the first lookup."""
+    try:
+        index.build()
+    except Exception:
+        logger.exception("Could not build the typeahead index at startup")
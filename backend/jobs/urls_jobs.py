@@ -6,15 +6,27 @@ from django.urls import path
 from .views import (
     JobPostingListCreateView,
     JobPostingDetailView,
+    JobFacetsView,
     SavedJobListView,
     toggle_save_job,
     employer_stats,
+    import_jobs,
+    salary_stats,
+    location_suggestions,
+    search_suggestions,
+    list_cache_stats,
 )
 
 urlpatterns = [
     path("", JobPostingListCreateView.as_view(), name="job-list-create"),
+    path("import/", import_jobs, name="job-import"),
+    path("facets/", JobFacetsView.as_view(), name="job-facets"),
     path("saved/", SavedJobListView.as_view(), name="saved-jobs"),
     path("stats/", employer_stats, name="employer-stats"),
+    path("suggest/", search_suggestions, name="search-suggestions"),
+    path("locations/", location_suggestions, name="location-suggestions"),
+    path("salary-stats/", salary_stats, name="salary-stats"),
+    path("cache-stats/", list_cache_stats, name="list-cache-stats"),
     path("<int:pk>/", JobPostingDetailView.as_view(), name="job-detail"),
     path("<int:job_id>/save/", toggle_save_job, name="toggle-save-job"),
 ]
@@ -2,13 +2,29 @@
 Views for Job Categories, Job Postings, Saved Jobs, and Employer Stats.
 """
 
-from django.db.models import Count
+import math
+
+from django.db import transaction
+from django.db.models import Count, Max
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes, throttle_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema
-
-from accounts.permissions import IsAdminUser, IsEmployerOrAdmin, IsOwnerOrAdmin
+from rest_framework.throttling import UserRateThrottle
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+from accounts.authentication import resolve_user
+from accounts.permissions import IsAdminUser, IsEmployer, IsEmployerOrAdmin, IsOwnerOrAdmin
+from config.query_budgets import query_budget
+from .async_views import AsyncReadMixin
+from .cache import CachedListMixin, get_stats as get_cache_stats
+from .conditional import ConditionalGetMixin
+from .counters import pending_shards
+from .facets import FacetCountsMixin
+from .fieldsets import SPARSE_FIELDSET_PARAMETERS, SparseFieldsetMixin
 from .models import JobCategory, JobPosting, SavedJob
 from .serializers import (
     JobCategorySerializer,
@@ -16,7 +32,14 @@ from .serializers import (
     JobPostingDetailSerializer,
     SavedJobSerializer,
 )
-from .filters import JobPostingFilter
+from .filters import JobOrderingFilter, JobPostingFilter, SpellingCorrectionMixin
+from .imports import BATCH_SIZE as IMPORT_BATCH_SIZE, detect_format, import_jobs as run_import
+from .locations import suggest as suggest_locations
+from .pagination import KeysetPagination
+from .projections import ProjectedListMixin
+from .salaries import BUCKET_WIDTH, DEFAULT_HISTOGRAM_WIDTH, salary_stats as compute_salary_stats
+from .stats import STATUS_FIELDS, get_stats as get_employer_stats, top_jobs
+from .typeahead import MAX_LIMIT as TYPEAHEAD_MAX_LIMIT, index as typeahead_index
 
 
 # ==========================================================================
@@ -24,14 +47,17 @@ from .filters import JobPostingFilter
 # ==========================================================================
 
 @extend_schema(tags=["Categories"])
-class JobCategoryListCreateView(generics.ListCreateAPIView):
+class JobCategoryListCreateView(CachedListMixin, AsyncReadMixin, generics.ListCreateAPIView):
     """
-    GET  – List all job categories (public).
+    GET  – List all job categories (public, cached).
     POST – Create a new category (admin only).
     """
 
     queryset = JobCategory.objects.all()
     serializer_class = JobCategorySerializer
+    query_budget = {"GET": 3, "POST": 3}
+    cache_scope = "categories"
+    list_validators = {"last_modified": Max("updated_at"), "count": Count("pk")}
 
     def get_permissions(self):
         if self.request.method == "POST":
@@ -40,7 +66,7 @@ class JobCategoryListCreateView(generics.ListCreateAPIView):
 
 
 @extend_schema(tags=["Categories"])
-class JobCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class JobCategoryDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET    – Category detail (public).
     PUT    – Update category (admin only).
@@ -49,6 +75,8 @@ class JobCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     queryset = JobCategory.objects.all()
     serializer_class = JobCategorySerializer
+    query_budget = {"GET": 2, "PUT": 3, "PATCH": 3, "DELETE": 5}
+    detail_validators = ("updated_at", "active_job_count")
 
     def get_permissions(self):
         if self.request.method in ("PUT", "PATCH", "DELETE"):
@@ -60,15 +88,27 @@ class JobCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
 # Job Posting Views
 # ==========================================================================
 
-@extend_schema(tags=["Jobs"])
-class JobPostingListCreateView(generics.ListCreateAPIView):
+@extend_schema(tags=["Jobs"], parameters=SPARSE_FIELDSET_PARAMETERS)
+class JobPostingListCreateView(
+    CachedListMixin,
+    SpellingCorrectionMixin,
+    ProjectedListMixin,
+    SparseFieldsetMixin,
+    AsyncReadMixin,
+    generics.ListCreateAPIView,
+):
     """
-    GET  – List jobs with filtering, sorting, and pagination (public).
+    GET  – List jobs with filtering, sorting, and pagination (public, cached).
     POST – Create a job posting (employer or admin only).
     """
 
+    # A search without results is retried once with its spelling correction.
+    query_budget = {"GET": 5, "POST": 17}
+    cache_scope = "jobs"
+    cache_query_params = (*JobPostingFilter.base_filters, "ordering", "page", "cursor", "fields", "omit")
+    filter_backends = [DjangoFilterBackend, JobOrderingFilter]
     filterset_class = JobPostingFilter
-    search_fields = ["title", "description", "location"]
+    pagination_class = KeysetPagination
     ordering_fields = ["created_at", "salary_min", "salary_max", "title"]
     ordering = ["-created_at"]
 
@@ -85,47 +125,164 @@ class JobPostingListCreateView(generics.ListCreateAPIView):
             return [permissions.IsAuthenticated(), IsEmployerOrAdmin()]
         return [permissions.AllowAny()]
 
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        suggestion = getattr(self.request, "did_you_mean", None)
+        if suggestion:
+            response.data["did_you_mean"] = suggestion
+        return response
+
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(company=self.request.user)
+        serializer.save(company=resolve_user(self.request.user))
 
 
 @extend_schema(tags=["Jobs"])
-class JobPostingDetailView(generics.RetrieveUpdateDestroyAPIView):
+class JobFacetsView(CachedListMixin, FacetCountsMixin, generics.GenericAPIView):
+    """
+    GET – Facet counts (category, job type, location, salary band) for the
+    job list filters given in the query string (public, cached).
+    """
+
+    queryset = JobPosting.objects.all()
+    permission_classes = [permissions.AllowAny]
+    query_budget = 5
+    cache_scope = "facets"
+    cache_query_params = tuple(JobPostingFilter.base_filters)
+    # Facets ignore their own filter, so validate against every posting;
+    # the full path in the ETag already tells the selections apart.
+    filter_backends = []
+    pagination_class = None
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
+
+
+@extend_schema(tags=["Jobs"], parameters=SPARSE_FIELDSET_PARAMETERS)
+class JobPostingDetailView(
+    ConditionalGetMixin, SparseFieldsetMixin, AsyncReadMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
-    GET    – Job detail (public).
+    GET    – Job detail (public, supports conditional requests).
     PUT    – Update job (owner or admin).
     DELETE – Delete job (owner or admin).
     """
 
     serializer_class = JobPostingDetailSerializer
+    query_budget = {"GET": 2, "PUT": 16, "PATCH": 16, "DELETE": 17}
+    # Everything the detail payload shows that can change without
+    # touching the posting's updated_at, including the counter deltas
+    # pending on the shards of a sharded posting.
+    detail_validators = (
+        "updated_at",
+        "application_count",
+        "saved_count",
+        pending_shards("application_count"),
+        pending_shards("saved_count"),
+        "category__name",
+        "company__email",
+        "company__first_name",
+        "company__last_name",
+        "company__company_name",
+    )
 
     def get_queryset(self):
         return JobPosting.objects.select_related("company", "category").all()
 
+    def serializer_queries(self, serializer):
+        # The counters add up the deltas pending on the posting's shards.
+        return bool(serializer.instance.counter_shards)
+
     def get_permissions(self):
         if self.request.method in ("PUT", "PATCH", "DELETE"):
             return [permissions.IsAuthenticated(), IsOwnerOrAdmin()]
         return [permissions.AllowAny()]
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+
+def import_query_budget(response):
+    """
+    Loading the user and the category map, plus 40 queries per inserted
+    batch: its INSERTs (split further on SQLite), search index, counters
+    and salary buckets.
+    """
+    data = getattr(response, "data", None)
+    created = data.get("created", 0) if isinstance(data, dict) and not data.get("dry_run") else 0
+    return 2 + 40 * math.ceil(created / IMPORT_BATCH_SIZE)
+
+
+@extend_schema(
+    tags=["Jobs"],
+    request={
+        "multipart/form-data": {
+            "type": "object",
+            "properties": {
+                "file": {"type": "string", "format": "binary"},
+                "file_format": {"type": "string", "enum": ["csv", "jsonl"]},
+                "dry_run": {"type": "boolean"},
+            },
+            "required": ["file"],
+        }
+    },
+    responses={200: OpenApiTypes.OBJECT},
+)
+@query_budget(import_query_budget)
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated, IsEmployerOrAdmin])
+@parser_classes([MultiPartParser])
+def import_jobs(request):
+    """
+    Bulk-create job postings from an uploaded CSV or JSON Lines file
+    (employer or admin only). Returns a per-row error report.
+    """
+    upload = request.FILES.get("file")
+    if upload is None:
+        raise ValidationError({"file": ["No file was submitted."]})
+    try:
+        file_format = detect_format(upload.name, request.data.get("file_format"))
+    except ValueError as exc:
+        raise ValidationError({"file_format": [str(exc)]})
+    dry_run = str(request.data.get("dry_run", "")).lower() in ("true", "1", "yes")
+    report = run_import(upload.file, file_format, resolve_user(request.user), dry_run=dry_run)
+    return Response(report)
+
 
 # ==========================================================================
 # Saved / Bookmarked Jobs
 # ==========================================================================
 
 @extend_schema(tags=["Saved Jobs"])
-class SavedJobListView(generics.ListAPIView):
+class SavedJobListView(ConditionalGetMixin, generics.ListAPIView):
     """List all jobs saved by the authenticated user."""
 
     serializer_class = SavedJobSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 4
+    list_validators = {
+        "last_modified": Max("saved_at"),
+        "last_modified_job": Max("job__updated_at"),
+        "count": Count("pk"),
+    }
+    pagination_class = KeysetPagination
+    ordering_fields = ["saved_at"]
+    ordering = ["-saved_at"]
 
     def get_queryset(self):
-        return SavedJob.objects.filter(user=self.request.user).select_related(
+        return SavedJob.objects.filter(user_id=self.request.user.pk).select_related(
             "job__company", "job__category"
         )
 
 
 @extend_schema(tags=["Saved Jobs"])
+@query_budget(10)
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated])
 def toggle_save_job(request, job_id):
@@ -135,9 +292,11 @@ def toggle_save_job(request, job_id):
     except JobPosting.DoesNotExist:
         return Response({"error": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
 
-    saved, created = SavedJob.objects.get_or_create(user=request.user, job=job)
+    with transaction.atomic():
+        saved, created = SavedJob.objects.get_or_create(user_id=request.user.pk, job=job)
+        if not created:
+            saved.delete()
     if not created:
-        saved.delete()
         return Response({"saved": False, "message": "Job unsaved."})
     return Response({"saved": True, "message": "Job saved."}, status=status.HTTP_201_CREATED)
 
@@ -147,25 +306,111 @@ def toggle_save_job(request, job_id):
 # ==========================================================================
 
 @extend_schema(tags=["Jobs"])
+@query_budget(8)  # including building the stats row on first access
 @api_view(["GET"])
-@permission_classes([permissions.IsAuthenticated])
+@permission_classes([permissions.IsAuthenticated, IsEmployer])
 def employer_stats(request):
     """Dashboard statistics for the authenticated employer."""
-    user = request.user
-    jobs = JobPosting.objects.filter(company=user)
-    jobs_with_counts = jobs.annotate(app_count=Count("applications"))
+    stats = get_employer_stats(request.user.id)
+    return Response({
+        "total_jobs": stats.total_jobs,
+        "active_jobs": stats.active_jobs,
+        "total_applications": stats.total_applications,
+        "applications_by_status": {
+            status: getattr(stats, field) for status, field in STATUS_FIELDS.items()
+        },
+        "top_jobs": top_jobs(request.user.id),
+    })
 
-    total_jobs = jobs.count()
-    active_jobs = jobs.filter(is_active=True).count()
-    total_applications = sum(j.app_count for j in jobs_with_counts)
 
-    top_jobs = jobs_with_counts.order_by("-app_count")[:5].values(
-        "id", "title", "app_count", "is_active", "created_at"
-    )
+@extend_schema(
+    tags=["Jobs"],
+    parameters=[
+        OpenApiParameter(
+            "bucket_width",
+            int,
+            description=f"Histogram bucket width; a multiple of {BUCKET_WIDTH}.",
+        ),
+    ],
+    responses={200: OpenApiTypes.OBJECT},
+)
+@query_budget(2)
+@api_view(["GET"])
+@permission_classes([permissions.AllowAny])
+def salary_stats(request):
+    """
+    Salary percentiles and histogram for the job list filters given in the
+    query string (active postings unless ``is_active`` is given).
+    """
+    try:
+        width = int(request.query_params.get("bucket_width", DEFAULT_HISTOGRAM_WIDTH))
+    except ValueError:
+        width = 0
+    if width <= 0 or width % BUCKET_WIDTH:
+        raise ValidationError({"bucket_width": [f"Must be a positive multiple of {BUCKET_WIDTH}."]})
+    return Response(compute_salary_stats(JobPosting.objects.all(), request.query_params, width))
+
+
+@extend_schema(
+    tags=["Jobs"],
+    parameters=[
+        OpenApiParameter("q", str, description="Typed prefix, alias or country."),
+        OpenApiParameter("limit", int, description="Maximum suggestions (1-50, default 10)."),
+    ],
+    responses={200: OpenApiTypes.OBJECT},
+)
+@query_budget(1)
+@api_view(["GET"])
+@permission_classes([permissions.AllowAny])
+def location_suggestions(request):
+    """Autocomplete canonical job locations, most active postings first."""
+    try:
+        limit = int(request.query_params.get("limit", 10))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= 50:
+        raise ValidationError({"limit": ["Must be between 1 and 50."]})
+    query = request.query_params.get("q", "").strip()
+    return Response(suggest_locations(JobPosting.objects.all(), query, limit))
 
-    return Response({
-        "total_jobs": total_jobs,
-        "active_jobs": active_jobs,
-        "total_applications": total_applications,
-        "top_jobs": list(top_jobs),
-    })
+
+class TypeaheadRateThrottle(UserRateThrottle):
+    """Per-keystroke requests get their own, larger budget."""
+
+    scope = "typeahead"
+
+
+@extend_schema(
+    tags=["Jobs"],
+    parameters=[
+        OpenApiParameter("q", str, description="Typed prefix of any word."),
+        OpenApiParameter("limit", int, description="Maximum suggestions (1-20, default 10)."),
+    ],
+    responses={200: OpenApiTypes.OBJECT},
+)
+@query_budget(0)  # the in-process index is built at worker start and refreshed in the background
+@api_view(["GET"])
+@permission_classes([permissions.AllowAny])
+@throttle_classes([TypeaheadRateThrottle])
+def search_suggestions(request):
+    """Typeahead suggestions from active job titles and category names."""
+    try:
+        limit = int(request.query_params.get("limit", 10))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= TYPEAHEAD_MAX_LIMIT:
+        raise ValidationError({"limit": [f"Must be between 1 and {TYPEAHEAD_MAX_LIMIT}."]})
+    return Response(typeahead_index.suggest(request.query_params.get("q", ""), limit))
+
+
+@extend_schema(tags=["Jobs"])
+@query_budget(1)
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated, IsAdminUser])
+def list_cache_stats(request):
+    """Hit/stale/miss counts of the public list response cache (admin only)."""
+    return Response(get_cache_stats([
+        JobPostingListCreateView.cache_scope,
+        JobFacetsView.cache_scope,
+        JobCategoryListCreateView.cache_scope,
+    ]))
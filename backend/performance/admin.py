@@ -0,0 +1,41 @@
+"""
+Admin configuration for performance app.
+"""
+
+from django.contrib import admin
+from .models import RequestProfile, SlowQuery
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ["method", "path", "status_code", "duration_ms", "sql_count", "trigger", "created_at"]
+    list_filter = ["trigger", "mode", "method"]
+    search_fields = ["path", "view_name"]
+    ordering = ["-created_at"]
+    readonly_fields = ["user"]
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ["short_sql", "count", "total_ms", "mean_ms", "max_ms", "example_view", "last_seen"]
+    search_fields = ["normalized_sql", "example_view"]
+    ordering = ["-total_ms"]
+    fields = [
+        "normalized_sql", "fingerprint", "count", "total_ms", "max_ms", "views",
+        "example_view", "example_sql", "example_params", "plan", "first_seen", "last_seen",
+    ]
+    readonly_fields = fields
+
+    @admin.display(description="Query")
+    def short_sql(self, obj):
+        return obj.normalized_sql[:120]
+
+    @admin.display(description="Mean ms")
+    def mean_ms(self, obj):
+        return round(obj.mean_ms, 1)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,591 @@
+"""
+Endpoint benchmarks.
+
+``SCENARIOS`` drives every route in ``config/urls.py`` with a realistic
+mix of parameters (filters, searches, orderings, cursors, sparse
+fieldsets, writes) picked from the data in the database - typically a
+``generate_dataset`` dataset.  ``run()`` replays them in-process through
+the full middleware stack with ``django.test.Client``, authenticated
+with real JWTs, and records the latency, SQL query count and response
+size of every request.  Everything runs in a transaction that is rolled
+back, so write scenarios leave the data untouched.
+
+``compare()`` diffs a report against a saved baseline and lists the
+endpoints whose latency, query count or response size regressed.
+"""
+
+import csv
+import datetime
+import io
+import json
+import math
+import random
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from accounts.authentication import RefreshToken
+from applications.models import JobApplication
+from config.query_budgets import get_query_budget
+from jobs import cache as list_cache
+from jobs.models import JobCategory, JobPosting
+from .models import RequestProfile
+
+User = get_user_model()
+
+ITERATIONS = 30
+WARMUP = 3
+PASSWORD = "benchmark-password"
+EMAIL_DOMAIN = "benchmark.invalid"
+
+# Latency differences below this are noise, whatever the ratio.
+MIN_DELTA_MS = 1.0
+
+# Namespaces whose routes need no scenario (beyond the admin index):
+# the admin's model pages.
+IGNORED_NAMESPACES = ("admin",)
+
+
+class Call:
+    """One request: path, payload, (optionally) the user making it and extra headers."""
+
+    def __init__(self, path, data=None, user=None, multipart=False, headers=None):
+        self.path = path
+        self.data = data
+        self.user = user
+        self.multipart = multipart
+        self.headers = headers or {}
+
+
+class Scenario:
+    """
+    A route and a ``prepare(context)`` callable returning the ``Call`` of
+    each request.  ``actor`` names the context user sending it (``None``
+    for anonymous requests).
+    """
+
+    def __init__(self, name, route, method, prepare, actor=None, session=False, iterations=None):
+        self.name = name
+        self.route = route
+        self.method = method
+        self.prepare = prepare
+        self.actor = actor
+        self.session = session
+        self.iterations = iterations
+
+
+class Context:
+    """Users, ids and parameter values sampled from the database."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self._serial = 0
+        self._tokens = {}
+
+        self.employer = (
+            User.objects.filter(role=User.Role.EMPLOYER)
+            .annotate(n=Count("job_postings"))
+            .filter(n__gt=0)
+            .order_by("-n", "pk")
+            .first()
+        )
+        if self.employer is None:
+            raise ValueError("No employer with job postings; run generate_dataset first.")
+        self.employer_job_ids = list(
+            JobPosting.objects.filter(company=self.employer)
+            .order_by("-application_count", "pk")
+            .values_list("pk", flat=True)[:200]
+        )
+        self.top_job_id = self.employer_job_ids[0]
+        self.application_ids = list(
+            JobApplication.objects.filter(job__company=self.employer).values_list("pk", flat=True)[:2000]
+        )
+
+        top_applicant = (
+            JobApplication.objects.values("applicant").annotate(n=Count("pk")).order_by("-n").first()
+        )
+        seekers = User.objects.filter(role=User.Role.JOB_SEEKER)
+        if top_applicant is not None:
+            seekers = seekers.filter(pk=top_applicant["applicant"])
+        self.seeker = seekers.order_by("pk").first()
+        if self.seeker is None:
+            raise ValueError("No job seeker; run generate_dataset first.")
+        self.admin = User.objects.create(
+            email=f"admin@{EMAIL_DOMAIN}", role=User.Role.ADMIN, is_staff=True, is_superuser=True
+        )
+        self.login_user = User.objects.create_user(email=f"login@{EMAIL_DOMAIN}", password=PASSWORD)
+        self.refresh_token = str(RefreshToken.for_user(self.seeker))
+
+        active = JobPosting.objects.filter(is_active=True)
+        self.job_ids = list(active.values_list("pk", flat=True)[:5000]) or self.employer_job_ids
+        page_size = api_settings.PAGE_SIZE or 1
+        self.pages = min(20, math.ceil(active.count() / page_size))
+        self.category_ids = list(JobCategory.objects.values_list("pk", flat=True))
+        titles = list(active.values_list("title", flat=True)[:500])
+        self.words = sorted({word.lower() for title in titles for word in title.split() if len(word) > 3})
+        self.locations = [
+            row["location"] for row in active.values("location").annotate(n=Count("pk")).order_by("-n")[:30]
+        ]
+
+    def serial(self):
+        self._serial += 1
+        return self._serial
+
+    def token(self, user):
+        if user.pk not in self._tokens:
+            self._tokens[user.pk] = str(RefreshToken.for_user(user).access_token)
+        return self._tokens[user.pk]
+
+    def new_seeker(self):
+        """A job seeker without applications (no password hashing)."""
+        user = User(email=f"seeker-{self.serial()}@{EMAIL_DOMAIN}", role=User.Role.JOB_SEEKER)
+        user.set_unusable_password()
+        user.save()
+        return user
+
+    def pick(self, values):
+        return self.rng.choice(values) if values else None
+
+
+# -- parameter mixes -----------------------------------------------------------
+
+
+def _job_filters(ctx):
+    rng = ctx.rng
+    options = [
+        lambda: {"category": ctx.pick(ctx.category_ids)},
+        lambda: {"job_type": rng.choice(JobPosting.JobType.values)},
+        lambda: {"location": ctx.pick(ctx.locations)},
+        lambda: {"search": ctx.pick(ctx.words)},
+        lambda: {"salary_min": rng.choice([20000, 40000, 60000, 90000])},
+        lambda: {"is_active": "true"},
+    ]
+    params = {}
+    for option in rng.sample(options, rng.choice([0, 1, 1, 2, 3])):
+        params.update(option())
+    return {key: value for key, value in params.items() if value is not None}
+
+
+def _job_list(ctx):
+    rng = ctx.rng
+    params = _job_filters(ctx)
+    extra = rng.random()
+    if extra < 0.2:
+        if not params and ctx.pages > 1:
+            # Deep pages only exist for unfiltered lists.
+            params["page"] = rng.randint(2, ctx.pages)
+    elif extra < 0.35:
+        params["cursor"] = ""
+    elif extra < 0.5:
+        params["ordering"] = rng.choice(["-created_at", "salary_min", "-salary_max", "title"])
+    elif extra < 0.6:
+        params["fields"] = "id,title,company,location,created_at"
+    return Call(reverse("job-list-create"), params)
+
+
+def _job_payload(ctx):
+    rng = ctx.rng
+    low = rng.randrange(20, 120) * 1000
+    return {
+        "title": f"Benchmark {ctx.pick(ctx.words) or 'engineer'} {ctx.serial()}",
+        "description": "Build and run services. " * 20,
+        "category": ctx.pick(ctx.category_ids),
+        "location": ctx.pick(ctx.locations) or "Remote",
+        "job_type": rng.choice(JobPosting.JobType.values),
+        "salary_min": low,
+        "salary_max": low + 20000,
+        "requirements": "- Python\n- SQL",
+    }
+
+
+def _job_changes(ctx):
+    rng = ctx.rng
+    change = rng.random()
+    if change < 0.6:
+        return {"description": f"Updated description {ctx.serial()}. " * 10}
+    if change < 0.8:
+        low = rng.randrange(20, 120) * 1000
+        return {"salary_min": low, "salary_max": low + rng.randrange(5, 40) * 1000}
+    return {"location": ctx.pick(ctx.locations) or "Remote", "category": ctx.pick(ctx.category_ids)}
+
+
+def _category_to_delete(ctx):
+    category = JobCategory.objects.create(name=f"Delete me {ctx.serial()}")
+    return Call(reverse("category-detail", args=[category.pk]))
+
+
+def _import_file(ctx):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["title", "description", "location", "job_type"])
+    for _ in range(20):
+        location = ctx.pick(ctx.locations) or "Remote"
+        writer.writerow([f"Imported role {ctx.serial()}", "Do things", location, "full_time"])
+    return Call(
+        reverse("job-import"),
+        {"file": SimpleUploadedFile("jobs.csv", buffer.getvalue().encode())},
+        multipart=True,
+    )
+
+
+def _posting_to_delete(ctx):
+    job = JobPosting.objects.create(
+        title=f"Delete me {ctx.serial()}", description="Temporary", location="Remote", company=ctx.employer
+    )
+    return Call(reverse("job-detail", args=[job.pk]))
+
+
+def _application_list(ctx):
+    rng = ctx.rng
+    params = {}
+    extra = rng.random()
+    if extra < 0.25:
+        params["cursor"] = ""
+    elif extra < 0.5:
+        params["ordering"] = rng.choice(["-applied_at", "status", "-updated_at"])
+    elif extra < 0.65:
+        params["fields"] = "id,status,applied_at,updated_at"
+    return params
+
+
+def _metrics(ctx):
+    token = settings.METRICS["TOKEN"]
+    return Call(reverse("metrics"), headers={"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else None)
+
+
+def _profile(ctx):
+    return RequestProfile.objects.create(
+        method="GET",
+        path=reverse("job-list-create"),
+        view_name="job-list-create",
+        status_code=200,
+        trigger=RequestProfile.Trigger.SAMPLE,
+        mode=RequestProfile.Mode.SAMPLING,
+        duration_ms=ctx.rng.uniform(5, 50),
+        sql_count=3,
+        queries=[{"sql": "SELECT 1", "time_ms": 0.1, "many": False}] * 3,
+        stacks="config/wsgi.py:application;jobs/views.py:list 12\njobs/views.py:list 3",
+    )
+
+
+SCENARIOS = [
+    # config/urls.py
+    Scenario("root", "api-root", "GET", lambda ctx: Call(reverse("api-root"))),
+    Scenario(
+        "admin.index", "admin:index", "GET", lambda ctx: Call(reverse("admin:index")),
+        actor="admin", session=True,
+    ),
+    Scenario("metrics", "metrics", "GET", _metrics),
+    Scenario("schema", "schema", "GET", lambda ctx: Call(reverse("schema")), iterations=5),
+    Scenario("docs", "swagger-ui", "GET", lambda ctx: Call(reverse("swagger-ui"))),
+    Scenario("redoc", "redoc", "GET", lambda ctx: Call(reverse("redoc"))),
+    # accounts
+    Scenario(
+        "auth.register", "register", "POST",
+        lambda ctx: Call(reverse("register"), {
+            "email": f"register-{ctx.serial()}@{EMAIL_DOMAIN}",
+            "first_name": "Bench",
+            "last_name": "Mark",
+            "role": "job_seeker",
+            "password": PASSWORD,
+            "password_confirm": PASSWORD,
+        }),
+        iterations=10,
+    ),
+    Scenario(
+        "auth.login", "login", "POST",
+        lambda ctx: Call(reverse("login"), {"email": ctx.login_user.email, "password": PASSWORD}),
+        iterations=10,
+    ),
+    Scenario(
+        "auth.refresh", "token-refresh", "POST",
+        lambda ctx: Call(reverse("token-refresh"), {"refresh": ctx.refresh_token}),
+    ),
+    Scenario("auth.profile", "profile", "GET", lambda ctx: Call(reverse("profile")), actor="seeker"),
+    Scenario(
+        "auth.profile.update", "profile", "PATCH",
+        lambda ctx: Call(reverse("profile"), {"bio": f"Bio {ctx.serial()}"}), actor="seeker",
+    ),
+    # categories
+    Scenario("categories.list", "category-list-create", "GET", lambda ctx: Call(reverse("category-list-create"))),
+    Scenario(
+        "categories.detail", "category-detail", "GET",
+        lambda ctx: Call(reverse("category-detail", args=[ctx.pick(ctx.category_ids)])),
+    ),
+    Scenario(
+        "categories.create", "category-list-create", "POST",
+        lambda ctx: Call(reverse("category-list-create"), {"name": f"Benchmark category {ctx.serial()}"}),
+        actor="admin",
+    ),
+    Scenario(
+        "categories.update", "category-detail", "PATCH",
+        lambda ctx: Call(
+            reverse("category-detail", args=[ctx.pick(ctx.category_ids)]),
+            {"description": f"Updated {ctx.serial()}"},
+        ),
+        actor="admin",
+    ),
+    Scenario("categories.delete", "category-detail", "DELETE", _category_to_delete, actor="admin"),
+    # jobs
+    Scenario("jobs.list", "job-list-create", "GET", _job_list),
+    Scenario(
+        "jobs.create", "job-list-create", "POST",
+        lambda ctx: Call(reverse("job-list-create"), _job_payload(ctx)), actor="employer",
+    ),
+    Scenario(
+        "jobs.detail", "job-detail", "GET",
+        lambda ctx: Call(reverse("job-detail", args=[ctx.pick(ctx.job_ids)])),
+    ),
+    Scenario(
+        "jobs.update", "job-detail", "PATCH",
+        lambda ctx: Call(reverse("job-detail", args=[ctx.pick(ctx.employer_job_ids)]), _job_changes(ctx)),
+        actor="employer",
+    ),
+    Scenario("jobs.delete", "job-detail", "DELETE", _posting_to_delete, actor="employer"),
+    Scenario("jobs.import", "job-import", "POST", _import_file, actor="employer", iterations=10),
+    Scenario(
+        "jobs.facets", "job-facets", "GET",
+        lambda ctx: Call(reverse("job-facets"), _job_filters(ctx)),
+    ),
+    Scenario("jobs.saved", "saved-jobs", "GET", lambda ctx: Call(reverse("saved-jobs")), actor="seeker"),
+    Scenario(
+        "jobs.save", "toggle-save-job", "POST",
+        lambda ctx: Call(reverse("toggle-save-job", args=[ctx.pick(ctx.job_ids)])), actor="seeker",
+    ),
+    Scenario("jobs.stats", "employer-stats", "GET", lambda ctx: Call(reverse("employer-stats")), actor="employer"),
+    Scenario(
+        "jobs.suggest", "search-suggestions", "GET",
+        lambda ctx: Call(reverse("search-suggestions"), {"q": (ctx.pick(ctx.words) or "dev")[:ctx.rng.randint(2, 5)]}),
+    ),
+    Scenario(
+        "jobs.locations", "location-suggestions", "GET",
+        lambda ctx: Call(
+            reverse("location-suggestions"), {"q": (ctx.pick(ctx.locations) or "add")[:ctx.rng.randint(2, 4)]}
+        ),
+    ),
+    Scenario(
+        "jobs.salary_stats", "salary-stats", "GET",
+        lambda ctx: Call(reverse("salary-stats"), _job_filters(ctx)),
+    ),
+    Scenario(
+        "jobs.cache_stats", "list-cache-stats", "GET", lambda ctx: Call(reverse("list-cache-stats")), actor="admin",
+    ),
+    # applications
+    Scenario(
+        "applications.apply", "apply-to-job", "POST",
+        lambda ctx: Call(
+            reverse("apply-to-job"),
+            {"job": ctx.pick(ctx.job_ids), "cover_letter": "I would love to join."},
+            user=ctx.new_seeker(),
+        ),
+    ),
+    Scenario(
+        "applications.my", "my-applications", "GET",
+        lambda ctx: Call(reverse("my-applications"), _application_list(ctx)), actor="seeker",
+    ),
+    Scenario(
+        "applications.job", "job-applications", "GET",
+        lambda ctx: Call(reverse("job-applications", args=[ctx.top_job_id]), _application_list(ctx)),
+        actor="employer",
+    ),
+    Scenario(
+        "applications.export", "job-applications-export", "GET",
+        lambda ctx: Call(
+            reverse("job-applications-export", args=[ctx.top_job_id]),
+            {"export_format": ctx.rng.choice(["csv", "ndjson"])},
+        ),
+        actor="employer", iterations=10,
+    ),
+    Scenario(
+        "applications.status", "update-application-status", "PATCH",
+        lambda ctx: Call(
+            reverse("update-application-status", args=[ctx.pick(ctx.application_ids)]),
+            {"status": ctx.rng.choice(["reviewed", "accepted", "rejected"])},
+        ),
+        actor="employer",
+    ),
+    # performance/urls.py
+    Scenario(
+        "performance.profiles", "request-profiles", "GET",
+        lambda ctx: Call(reverse("request-profiles"), {"min_duration": 1} if ctx.rng.random() < 0.5 else {}),
+        actor="admin",
+    ),
+    Scenario(
+        "performance.profile", "request-profile-detail", "GET",
+        lambda ctx: Call(reverse("request-profile-detail", args=[_profile(ctx).pk])), actor="admin",
+    ),
+    Scenario(
+        "performance.stacks", "request-profile-stacks", "GET",
+        lambda ctx: Call(reverse("request-profile-stacks", args=[_profile(ctx).pk])), actor="admin",
+    ),
+]
+
+
+def route_views(patterns=None, namespace=""):
+    """``{url name: view}`` of all named URL patterns, namespace-qualified."""
+    views = {}
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            inner = f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace
+            views.update(route_views(pattern.url_patterns, inner))
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            views[namespace + pattern.name] = pattern.callback
+    return views
+
+
+def uncovered_routes(scenarios=SCENARIOS):
+    """Named routes no scenario exercises (the admin's model pages excepted)."""
+    covered = {scenario.route for scenario in scenarios} | {f"{ns}:index" for ns in IGNORED_NAMESPACES}
+    return sorted(
+        name for name in route_views()
+        if name not in covered and not (":" in name and name.split(":")[0] in IGNORED_NAMESPACES)
+    )
+
+
+@contextmanager
+def _unthrottled():
+    # Thousands of requests from one client would trip the rate limits.
+    original = SimpleRateThrottle.allow_request
+    SimpleRateThrottle.allow_request = lambda self, request, view: True
+    try:
+        yield
+    finally:
+        SimpleRateThrottle.allow_request = original
+
+
+def _percentile(ordered, percent):
+    # Nearest-rank percentile of an ascending list.
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def summarize(scenario, samples):
+    latencies = sorted(elapsed for elapsed, _, _, _, _ in samples)
+    statuses = {}
+    for _, _, _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    total = sum(latencies)
+    return {
+        "route": scenario.route,
+        "method": scenario.method,
+        "requests": len(samples),
+        "errors": sum(1 for _, _, _, status, _ in samples if status >= 400),
+        "status": statuses,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(total / len(latencies) * 1000, 3),
+        "requests_per_second": round(len(latencies) / total, 1) if total else None,
+        "queries": round(sum(queries for _, queries, _, _, _ in samples) / len(samples), 2),
+        "queries_min": min(queries for _, queries, _, _, _ in samples),
+        "queries_max": max(queries for _, queries, _, _, _ in samples),
+        # Requests that ran more queries than their view's query_budget.
+        "over_budget": sum(1 for _, queries, _, _, budget in samples if budget is not None and queries > budget),
+        "bytes": round(sum(size for _, _, size, _, _ in samples) / len(samples)),
+    }
+
+
+def _send(client, scenario, call, headers):
+    method = getattr(client, scenario.method.lower())
+    if scenario.method == "GET":
+        return method(call.path, call.data or {}, **headers)
+    if call.multipart:
+        return method(call.path, call.data, **headers)
+    body = json.dumps(call.data) if call.data is not None else ""
+    return method(call.path, body, content_type="application/json", **headers)
+
+
+def _host():
+    for host in settings.ALLOWED_HOSTS:
+        host = host.strip().lstrip(".")
+        if host and host != "*":
+            return host
+    return "localhost"
+
+
+def _measure(context, scenario, iterations, warmup, accept_encoding):
+    client = Client(HTTP_HOST=_host())
+    default_user = getattr(context, scenario.actor) if scenario.actor else None
+    if scenario.session and default_user is not None:
+        client.force_login(default_user)
+    samples = []
+    for i in range(warmup + min(iterations, scenario.iterations or iterations)):
+        call = scenario.prepare(context)
+        user = call.user or default_user
+        headers = {"HTTP_ACCEPT_ENCODING": accept_encoding, **call.headers}
+        if user is not None and not scenario.session:
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {context.token(user)}"
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = _send(client, scenario, call, headers)
+            body = b"".join(response.streaming_content) if response.streaming else response.content
+            elapsed = time.perf_counter() - start
+        if i >= warmup:
+            budget = get_query_budget(response.resolver_match.func, scenario.method, response)
+            samples.append((elapsed, len(queries), len(body), response.status_code, budget))
+    return summarize(scenario, samples)
+
+
+def run(scenarios=SCENARIOS, iterations=ITERATIONS, warmup=WARMUP, seed=42, accept_encoding="gzip", log=None):
+    """Benchmark ``scenarios``; returns the report as a JSON-serializable dict."""
+    log = log or (lambda message: None)
+    report = {
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "database": connection.vendor,
+        "seed": seed,
+        "iterations": iterations,
+        "warmup": warmup,
+        "dataset": {
+            "users": User.objects.count(),
+            "jobs": JobPosting.objects.count(),
+            "applications": JobApplication.objects.count(),
+        },
+        "endpoints": {},
+    }
+    try:
+        with transaction.atomic(), _unthrottled():
+            context = Context(seed)
+            for scenario in scenarios:
+                log(f"{scenario.name} ({scenario.method} {scenario.route})")
+                report["endpoints"][scenario.name] = _measure(
+                    context, scenario, iterations, warmup, accept_encoding
+                )
+            transaction.set_rollback(True)
+    finally:
+        # Cached list responses may include the rolled-back writes.
+        list_cache.bump_version()
+    return report
+
+
+def compare(report, baseline, threshold=0.2):
+    """
+    Regressions of ``report`` against ``baseline``: latency percentiles or
+    response size up by more than ``threshold`` (a fraction), or more SQL
+    queries per request.  Returns ``[{endpoint, metric, baseline, current}]``.
+    """
+    regressions = []
+    for name, current in report["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(name)
+        if base is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if current[metric] > base[metric] * (1 + threshold) and current[metric] - base[metric] > MIN_DELTA_MS:
+                regressions.append(_regression(name, metric, base, current))
+        if current["queries"] > base["queries"] + 0.01:
+            regressions.append(_regression(name, "queries", base, current))
+        if current["bytes"] > base["bytes"] * (1 + threshold):
+            regressions.append(_regression(name, "bytes", base, current))
+    return regressions
+
+
+def _regression(name, metric, base, current):
+    return {"endpoint": name, "metric": metric, "baseline": base[metric], "current": current[metric]}
@@ -0,0 +1,233 @@
+"""
+Concurrent throughput of the WSGI and ASGI servers.
+
+``run()`` starts each server in ``SERVERS`` as a subprocess - gunicorn
+with its sync workers, and gunicorn with uvicorn workers serving the
+async read views (``jobs.async_views``) - and keeps ``concurrency``
+connections busy for ``duration`` seconds with the public read requests
+of the endpoint benchmarks (``jobs.list``, ``jobs.detail``,
+``categories.list``).  The client is a minimal asyncio HTTP/1.1 client,
+so that it is not the bottleneck.  The servers get the environment of
+the command, with ``DEBUG`` off and the anonymous rate limit lifted; the
+ASGI server also gets ``ASYNC_VIEWS`` on.
+"""
+
+import asyncio
+import math
+import os
+import random
+import shlex
+import signal
+import socket
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from .benchmarks import SCENARIOS, Context, _percentile
+
+SERVERS = {
+    "wsgi": "gunicorn config.wsgi:application --workers {workers} --bind {bind} --pid {pid}",
+    "asgi": (
+        "gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker "
+        "--workers {workers} --bind {bind} --pid {pid}"
+    ),
+}
+READ_SCENARIOS = ("jobs.list", "jobs.detail", "categories.list")
+SERVER_ENV = {"DEBUG": "False", "ANON_THROTTLE_RATE": "1000000/second", "SLOW_QUERY_LOG_ENABLED": "False"}
+MODE_ENV = {"asgi": {"ASYNC_VIEWS": "True"}}
+
+CONCURRENCY = 50
+DURATION = 10
+WARMUP = 2
+WORKERS = 3
+REQUEST_TIMEOUT = 30
+START_TIMEOUT = 30
+
+
+def sample_paths(count, seed=42, scenarios=READ_SCENARIOS):
+    """``count`` request paths (with query strings) per read scenario."""
+    by_name = {scenario.name: scenario for scenario in SCENARIOS}
+    paths = []
+    # Context() creates benchmark users; roll them back.
+    with transaction.atomic():
+        context = Context(seed)
+        for name in scenarios:
+            for _ in range(count):
+                call = by_name[name].prepare(context)
+                query = urlencode(call.data or {}, doseq=True)
+                paths.append(f"{call.path}?{query}" if query else call.path)
+        transaction.set_rollback(True)
+    random.Random(seed).shuffle(paths)
+    return paths
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """A server subprocess, stopped through its gunicorn pid file."""
+
+    def __init__(self, command, workers=WORKERS, env=None):
+        self.port = free_port()
+        self.pid_file = Path(tempfile.gettempdir()) / f"job-board-benchmark-{self.port}.pid"
+        self.command = command.format(workers=workers, bind=f"127.0.0.1:{self.port}", pid=self.pid_file)
+        self.env = {**os.environ, **SERVER_ENV, **(env or {})}
+
+    def __enter__(self):
+        # A file rather than a pipe: nobody reads the log while the server
+        # runs, and a full pipe would block its workers.
+        self.log = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            shlex.split(self.command), cwd=settings.BASE_DIR, env=self.env,
+            stdout=subprocess.DEVNULL, stderr=self.log,
+        )
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                self.log.seek(0)
+                output = self.log.read().decode(errors="replace")[-2000:]
+                self.__exit__()
+                raise RuntimeError(f"`{self.command}` exited: {output}")
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=1).close()
+                return self
+            except OSError:
+                time.sleep(0.1)
+        self.__exit__()
+        raise RuntimeError(f"`{self.command}` did not start listening within {START_TIMEOUT}s.")
+
+    def __exit__(self, *exc_info):
+        self.process.send_signal(signal.SIGTERM)
+        try:
+            self.process.wait(timeout=START_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.log.close()
+        self.pid_file.unlink(missing_ok=True)
+
+
+async def _read_body(reader, headers):
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            # Each chunk (and the last, empty one) ends with CRLF.
+            chunks.append((await reader.readexactly(size + 2))[:-2])
+            if size == 0:
+                return b"".join(chunks)
+    return await reader.read()
+
+
+async def fetch(reader, writer, host, path):
+    """Send one ``GET``; returns ``(status, body size, keep-alive)``."""
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\n"
+        f"Accept-Encoding: identity\r\n\r\n".encode()
+    )
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split()[1])
+    headers = {}
+    for line in head[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    body = await _read_body(reader, headers)
+    keep_alive = "content-length" in headers or "transfer-encoding" in headers
+    return status, len(body), keep_alive and headers.get("connection", "").lower() != "close"
+
+
+async def _connection(port, paths, offset, warmup_until, deadline, samples):
+    # One client connection, reopened whenever the server closes it (the
+    # sync workers close every connection).
+    streams = None
+    index = offset
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            if streams is None:
+                streams = await asyncio.open_connection("127.0.0.1", port)
+            status, size, keep_alive = await asyncio.wait_for(
+                fetch(*streams, "127.0.0.1", path), REQUEST_TIMEOUT
+            )
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            status, size, keep_alive = None, 0, False
+        end = time.perf_counter()
+        if start >= warmup_until and end <= deadline:
+            samples.append((end - start, status, size))
+        if not keep_alive and streams is not None:
+            streams[1].close()
+            streams = None
+    if streams is not None:
+        streams[1].close()
+
+
+async def load(port, paths, concurrency=CONCURRENCY, duration=DURATION, warmup=WARMUP):
+    """Samples ``(seconds, status or None, bytes)`` of the requests completed in ``duration``."""
+    samples = []
+    warmup_until = time.perf_counter() + warmup
+    deadline = warmup_until + duration
+    step = max(1, len(paths) // concurrency)
+    await asyncio.gather(*(
+        _connection(port, paths, i * step, warmup_until, deadline, samples) for i in range(concurrency)
+    ))
+    return samples
+
+
+def summarize(samples, duration):
+    latencies = sorted(elapsed for elapsed, _, _ in samples)
+    statuses = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(1 for _, status, _ in samples if status is None or status >= 400)
+    if not latencies:
+        return {"requests": 0, "errors": 0, "status": {}, "requests_per_second": 0.0}
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "status": statuses,
+        "requests_per_second": round(len(samples) / duration, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "bytes": round(sum(size for _, _, size in samples) / len(samples)),
+    }
+
+
+def run(
+    modes=tuple(SERVERS), concurrency=CONCURRENCY, duration=DURATION, warmup=WARMUP, workers=WORKERS,
+    seed=42, env=None, commands=None, log=None,
+):
+    """Load each server in ``modes`` in turn; returns the report as a JSON-serializable dict."""
+    log = log or (lambda message: None)
+    commands = {**SERVERS, **(commands or {})}
+    paths = sample_paths(max(100, math.ceil(concurrency / len(READ_SCENARIOS))), seed)
+    # An idle SQLite connection can keep the database locked for the servers.
+    connections.close_all()
+    report = {
+        "concurrency": concurrency,
+        "duration": duration,
+        "workers": workers,
+        "paths": len(paths),
+        "servers": {},
+    }
+    for mode in modes:
+        with Server(commands[mode], workers, {**MODE_ENV.get(mode, {}), **(env or {})}) as server:
+            log(f"{mode}: {server.command}")
+            samples = asyncio.run(load(server.port, paths, concurrency, duration, warmup))
+        report["servers"][mode] = {"command": server.command, **summarize(samples, duration)}
+    return report
@@ -0,0 +1,66 @@
+"""
+Management command comparing the concurrent throughput of the WSGI and ASGI servers.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from performance.concurrency import CONCURRENCY, DURATION, SERVERS, WARMUP, WORKERS, run
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn with sync workers (WSGI) and with uvicorn workers (ASGI, "
+        "async read views) in turn, keep N concurrent connections busy with the "
+        "public read endpoints and report requests/second and p50/p95/p99 latency. "
+        "Run generate_dataset first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", nargs="+", choices=list(SERVERS), default=list(SERVERS))
+        parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Concurrent connections.")
+        parser.add_argument("--duration", type=float, default=DURATION, help="Measured seconds per server.")
+        parser.add_argument("--warmup", type=float, default=WARMUP, help="Unmeasured seconds per server.")
+        parser.add_argument("--workers", type=int, default=WORKERS, help="Worker processes per server.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Turn the response cache off in the servers, so that every request reaches the database.",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        env = {"RESPONSE_CACHE_ENABLED": "False"} if options["no_cache"] else None
+        try:
+            report = run(
+                modes=options["modes"],
+                concurrency=options["concurrency"],
+                duration=options["duration"],
+                warmup=options["warmup"],
+                workers=options["workers"],
+                seed=options["seed"],
+                env=env,
+                log=lambda message: self.stderr.write(f"  {message}") if options["verbosity"] > 1 else None,
+            )
+        except (ValueError, RuntimeError) as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            f"{'server':<8} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+        )
+        for mode, result in report["servers"].items():
+            self.stdout.write(
+                f"{mode:<8} {result['requests']:>9} {result['errors']:>7} {result['requests_per_second']:>9.1f} "
+                f"{result.get('p50_ms', 0):>9.2f} {result.get('p95_ms', 0):>9.2f} {result.get('p99_ms', 0):>9.2f}"
+            )
+        servers = report["servers"]
+        if "wsgi" in servers and "asgi" in servers and servers["wsgi"]["requests_per_second"]:
+            ratio = servers["asgi"]["requests_per_second"] / servers["wsgi"]["requests_per_second"]
+            self.stdout.write(f"ASGI/WSGI throughput: {ratio:.2f}x")
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Report written to {options['output']}.")
@@ -0,0 +1,91 @@
+"""
+Management command to benchmark every API endpoint and compare against a baseline.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from performance.benchmarks import ITERATIONS, SCENARIOS, WARMUP, compare, run, uncovered_routes
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay realistic requests against every endpoint (inside a rolled-back "
+        "transaction) and report p50/p95/p99 latency, requests/second, SQL queries "
+        "and bytes per response. Run generate_dataset first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=ITERATIONS, help="Measured requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=WARMUP, help="Unmeasured requests per endpoint.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--only", nargs="+", metavar="NAME", help="Benchmarks whose name starts with NAME.")
+        parser.add_argument("--accept-encoding", default="gzip", help="Accept-Encoding sent with every request.")
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+        parser.add_argument("--baseline", help="JSON report to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Latency/size increase (fraction) counted as a regression.",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error when the baseline comparison finds regressions.",
+        )
+
+    def handle(self, *args, **options):
+        scenarios = SCENARIOS
+        if options["only"]:
+            scenarios = [s for s in SCENARIOS if s.name.startswith(tuple(options["only"]))]
+            if not scenarios:
+                raise CommandError("No benchmark matches --only.")
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+        for name in uncovered_routes():
+            self.stderr.write(self.style.WARNING(f"No benchmark covers route '{name}'."))
+
+        try:
+            report = run(
+                scenarios,
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                seed=options["seed"],
+                accept_encoding=options["accept_encoding"],
+                log=lambda message: self.stderr.write(f"  {message}") if options["verbosity"] > 1 else None,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            f"{'endpoint':<24} {'status':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'req/s':>8} {'queries':>8} {'bytes':>9}"
+        )
+        for name, result in report["endpoints"].items():
+            status = "ok" if not result["errors"] else f"{result['errors']} err"
+            self.stdout.write(
+                f"{name:<24} {status:>8} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                f"{result['p99_ms']:>9.2f} {result['requests_per_second'] or 0:>8.1f} "
+                f"{result['queries']:>8.1f} {result['bytes']:>9}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Report written to {options['output']}.")
+
+        if baseline is None:
+            return
+        regressions = compare(report, baseline, options["threshold"])
+        for row in regressions:
+            self.stdout.write(self.style.WARNING(
+                f"Regression: {row['endpoint']} {row['metric']} {row['baseline']} -> {row['current']}"
+            ))
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+        elif options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} regression(s) against the baseline.")
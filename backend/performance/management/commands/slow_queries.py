@@ -0,0 +1,57 @@
+"""
+Management command to report the slow query log.
+"""
+
+from django.core.management.base import BaseCommand
+
+from performance.models import SlowQuery
+
+ORDERINGS = {"total": "-total_ms", "max": "-max_ms", "count": "-count", "recent": "-last_seen"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the SQL statements slower than SLOW_QUERIES['THRESHOLD_MS'], "
+        "aggregated by fingerprint, with their EXPLAIN plans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20, help="Fingerprints to show.")
+        parser.add_argument("--order", choices=sorted(ORDERINGS), default="total", help="Sort order.")
+        parser.add_argument("--view", help="Only queries run by this URL name.")
+        parser.add_argument("--plans", action="store_true", help="Show the slowest example and the plan.")
+        parser.add_argument("--clear", action="store_true", help="Delete the log instead of reporting it.")
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            deleted, _ = SlowQuery.objects.all().delete()
+            self.stdout.write(f"Deleted {deleted} slow query fingerprints.")
+            return
+
+        queryset = SlowQuery.objects.order_by(ORDERINGS[options["order"]])
+        if options["view"]:
+            queryset = queryset.filter(views__has_key=options["view"])
+        entries = list(queryset[:options["limit"]])
+        if not entries:
+            self.stdout.write("No slow queries recorded.")
+            return
+
+        self.stdout.write(f"{'total ms':>10} {'count':>6} {'mean ms':>9} {'max ms':>9}  query")
+        for entry in entries:
+            self.stdout.write(
+                f"{entry.total_ms:>10.1f} {entry.count:>6} {entry.mean_ms:>9.1f} {entry.max_ms:>9.1f}  "
+                f"{entry.normalized_sql[:120]}"
+            )
+            by_count = sorted(entry.views.items(), key=lambda item: -item[1])
+            views = ", ".join(f"{name or '-'} ({count})" for name, count in by_count)
+            self.stdout.write(f"{'':>38}views: {views}")
+            if options["plans"]:
+                self.stdout.write(f"  fingerprint: {entry.fingerprint}")
+                self.stdout.write(f"  slowest ({entry.max_ms:.1f} ms, {entry.example_view or '-'}):")
+                self.stdout.write(f"    {entry.example_sql}")
+                if entry.example_params:
+                    self.stdout.write(f"    params: {entry.example_params}")
+                self.stdout.write("  plan:")
+                for line in (entry.plan or "(not captured)").splitlines():
+                    self.stdout.write(f"    {line}")
+                self.stdout.write("")
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.CharField(max_length=2000)),
+                ('query_string', models.TextField(blank=True, default='')),
+                ('view_name', models.CharField(blank=True, default='', max_length=200)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('trigger', models.CharField(choices=[('header', 'Header'), ('query', 'Query parameter'), ('sample', 'Sampled')], max_length=10)),
+                ('mode', models.CharField(choices=[('sampling', 'Sampling'), ('deterministic', 'Deterministic')], max_length=15)),
+                ('duration_ms', models.FloatField()),
+                ('sql_count', models.PositiveIntegerField(default=0)),
+                ('sql_time_ms', models.FloatField(default=0)),
+                ('queries', models.JSONField(blank=True, default=list, help_text='Executed SQL with timings, in order (capped).')),
+                ('stacks', models.TextField(blank=True, default='', help_text='Collapsed stacks.')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40, unique=True)),
+                ('normalized_sql', models.TextField()),
+                ('example_sql', models.TextField()),
+                ('example_params', models.TextField(blank=True, default='')),
+                ('example_view', models.CharField(blank=True, default='', max_length=200)),
+                ('views', models.JSONField(blank=True, default=dict, help_text='Executions per calling view.')),
+                ('plan', models.TextField(blank=True, default='')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'verbose_name_plural': 'slow queries',
+                'ordering': ['-total_ms'],
+            },
+        ),
+    ]
@@ -0,0 +1,95 @@
+"""
+Models for stored request profiles.
+"""
+
+from django.conf import settings
+from django.db import models
+
+
+class RequestProfile(models.Model):
+    """
+    A profiled request: its metadata, the SQL it ran and its call stacks.
+
+    ``stacks`` holds the profile in collapsed-stack format (one
+    ``frame;frame;frame weight`` line per distinct stack), ready for
+    ``flamegraph.pl`` or speedscope.  Weights are samples for the sampling
+    profiler and microseconds for the deterministic one.  Written by
+    ``performance.profiling.ProfilingMiddleware``.
+    """
+
+    class Trigger(models.TextChoices):
+        HEADER = "header", "Header"
+        QUERY = "query", "Query parameter"
+        SAMPLE = "sample", "Sampled"
+
+    class Mode(models.TextChoices):
+        SAMPLING = "sampling", "Sampling"
+        DETERMINISTIC = "deterministic", "Deterministic"
+
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2000)
+    query_string = models.TextField(blank=True, default="")
+    view_name = models.CharField(max_length=200, blank=True, default="")
+    status_code = models.PositiveSmallIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    trigger = models.CharField(max_length=10, choices=Trigger.choices)
+    mode = models.CharField(max_length=15, choices=Mode.choices)
+    duration_ms = models.FloatField()
+    sql_count = models.PositiveIntegerField(default=0)
+    sql_time_ms = models.FloatField(default=0)
+    queries = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Executed SQL with timings, in order (capped).",
+    )
+    stacks = models.TextField(blank=True, default="", help_text="Collapsed stacks.")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+class SlowQuery(models.Model):
+    """
+    Every SQL statement slower than ``SLOW_QUERIES["THRESHOLD_MS"]``,
+    aggregated by fingerprint (the SQL with literals and placeholders
+    normalized away).
+
+    The example is the slowest execution seen, with its parameters and
+    the view that ran it; ``plan`` is the ``EXPLAIN`` output captured
+    when the fingerprint was first seen.  Written by
+    ``performance.slow_queries.SlowQueryMiddleware``.
+    """
+
+    fingerprint = models.CharField(max_length=40, unique=True)
+    normalized_sql = models.TextField()
+    example_sql = models.TextField()
+    example_params = models.TextField(blank=True, default="")
+    example_view = models.CharField(max_length=200, blank=True, default="")
+    views = models.JSONField(default=dict, blank=True, help_text="Executions per calling view.")
+    plan = models.TextField(blank=True, default="")
+    count = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        ordering = ["-total_ms"]
+        verbose_name_plural = "slow queries"
+
+    def __str__(self):
+        return f"{self.normalized_sql[:80]} ({self.count}x)"
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0
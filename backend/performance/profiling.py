@@ -0,0 +1,268 @@
+"""
+On-demand request profiling.
+
+An admin profiles one request by sending ``X-Profile: 1`` (or adding
+``?profile=1``); the value ``deterministic`` picks the tracing profiler
+instead of the default sampling one.  ``PROFILING["SAMPLE_RATE"]`` of all
+other requests are profiled at random.
+
+The request runs under the profiler with every SQL statement recorded
+(placeholders only, never parameters), and a ``RequestProfile`` row
+stores the request metadata, the SQL and the collapsed call stacks.
+Explicitly profiled responses carry the row id in ``X-Profile-Id``; the
+profiles are read back from ``/api/performance/profiles/``.
+
+The sampling profiler walks the request thread's stack from a background
+thread every ``INTERVAL`` seconds, so its overhead does not depend on how
+many calls the request makes.  The deterministic one hooks
+``sys.setprofile`` and charges the time between events to the current
+stack: exact, but several times slower.  Both follow one thread, so
+under ASGI a profiled request runs its view from the request's sync
+thread and the profile covers the code executed there.
+"""
+
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connection
+from rest_framework.exceptions import APIException
+
+from accounts.authentication import StatelessJWTAuthentication, resolve_user
+from .models import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_PARAM = "profile"
+MAX_SQL_LENGTH = 2000
+OFF_VALUES = ("", "0", "false", "no", "off")
+STDLIB = f"lib/python{sys.version_info.major}.{sys.version_info.minor}/"
+
+
+@lru_cache(maxsize=8192)
+def frame_name(code):
+    """``path/to/module.py:Class.function`` for a code object."""
+    filename = code.co_filename
+    for root in (f"{settings.BASE_DIR}/", "site-packages/", STDLIB):
+        if root in filename:
+            filename = filename.split(root, 1)[1]
+            break
+    return f"{filename}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse(stacks):
+    """Collapsed-stack text for ``{stack tuple: weight}``."""
+    return "\n".join(
+        f"{';'.join(stack)} {weight}" for stack, weight in sorted(stacks.items()) if weight > 0
+    )
+
+
+class SamplingProfiler:
+    """Samples the calling thread's stack every ``interval`` seconds."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+
+    def start(self):
+        self._thread_id = threading.get_ident()
+        # Stacks are recorded up to the frame that started the profiler.
+        self._root = sys._getframe(1)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_name(frame.f_code))
+                if frame is self._root:
+                    break
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def collapsed(self):
+        return collapse(self.stacks)
+
+
+class TracingProfiler:
+    """Charges the wall time between profile events to the current stack."""
+
+    def __init__(self):
+        self.stacks = Counter()
+        self._stack = []
+
+    def start(self):
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self._trace)
+
+    def stop(self):
+        sys.setprofile(None)
+        self._charge(time.perf_counter_ns())
+
+    def _charge(self, now):
+        if self._stack:
+            self.stacks[tuple(self._stack)] += now - self._last
+        self._last = now
+
+    def _trace(self, frame, event, arg):
+        self._charge(time.perf_counter_ns())
+        if event == "call":
+            self._stack.append(frame_name(frame.f_code))
+        elif event == "c_call":
+            module = getattr(arg, "__module__", None) or "builtins"
+            self._stack.append(f"{module}:{getattr(arg, '__qualname__', repr(arg))}")
+        elif self._stack:
+            # return, c_return, c_exception; the first events return from
+            # frames entered before profiling started.
+            self._stack.pop()
+
+    def collapsed(self):
+        # Nanoseconds -> microseconds.
+        return collapse({stack: ns // 1000 for stack, ns in self.stacks.items()})
+
+
+class SQLRecorder:
+    """``connection.execute_wrapper`` hook recording statements and timings."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.queries = []
+        self.count = 0
+        self.time_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.count += 1
+            self.time_ms += elapsed
+            if len(self.queries) < self.limit:
+                self.queries.append({"sql": sql[:MAX_SQL_LENGTH], "time_ms": round(elapsed, 3), "many": many})
+
+
+def _requested(request):
+    # (value, trigger) of an explicit profile request, None if absent.
+    value = request.META.get(PROFILE_HEADER)
+    trigger = RequestProfile.Trigger.HEADER
+    if value is None:
+        value = request.GET.get(PROFILE_PARAM)
+        trigger = RequestProfile.Trigger.QUERY
+    if value is None or value.lower() in OFF_VALUES:
+        return None
+    return value, trigger
+
+
+def _admin(request):
+    # JWTs are checked by the views, after this middleware; authenticate here.
+    try:
+        result = StatelessJWTAuthentication().authenticate(request)
+    except APIException:
+        return None
+    if result is None or result[0].role != "admin":
+        return None
+    return resolve_user(result[0])
+
+
+class ProfilingMiddleware:
+    """Profile admin-requested and randomly sampled requests; store the profiles."""
+
+    sync_capable = async_capable = True
+
+    def __init__(self, get_response):
+        config = settings.PROFILING
+        if not config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = config["SAMPLE_RATE"]
+        self.mode = config["MODE"]
+        self.interval = config["INTERVAL"]
+        self.max_queries = config["MAX_QUERIES"]
+        self.max_profiles = config["MAX_PROFILES"]
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        requested = _requested(request)
+        user = _admin(request) if requested else None
+        chosen = self.choose(requested, user)
+        if chosen is None:
+            return self.get_response(request)
+        return self.profile(request, *chosen, user, self.get_response)
+
+    async def __acall__(self, request):
+        requested = _requested(request)
+        user = await sync_to_async(_admin)(request) if requested else None
+        chosen = self.choose(requested, user)
+        if chosen is None:
+            return await self.get_response(request)
+        return await sync_to_async(self.profile)(request, *chosen, user, async_to_sync(self.get_response))
+
+    def choose(self, requested, user):
+        """``(trigger, mode)`` of a request to profile, ``None`` to leave it alone."""
+        if user is not None:
+            value, trigger = requested
+            return trigger, value if value in RequestProfile.Mode.values else self.mode
+        if self.sample_rate and random.random() < self.sample_rate:
+            return RequestProfile.Trigger.SAMPLE, self.mode
+        return None
+
+    def profile(self, request, trigger, mode, user, get_response):
+        recorder = SQLRecorder(self.max_queries)
+        if mode == RequestProfile.Mode.DETERMINISTIC:
+            profiler = TracingProfiler()
+        else:
+            profiler = SamplingProfiler(self.interval)
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            with connection.execute_wrapper(recorder):
+                response = get_response(request)
+        finally:
+            profiler.stop()
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        match = request.resolver_match
+        try:
+            profile = RequestProfile.objects.create(
+                method=request.method,
+                path=request.path[:2000],
+                query_string=request.META.get("QUERY_STRING", ""),
+                view_name=match.view_name[:200] if match else "",
+                status_code=response.status_code,
+                user=user,
+                trigger=trigger,
+                mode=mode,
+                duration_ms=round(duration_ms, 3),
+                sql_count=recorder.count,
+                sql_time_ms=round(recorder.time_ms, 3),
+                queries=recorder.queries,
+                stacks=profiler.collapsed(),
+            )
+            RequestProfile.objects.filter(pk__lte=profile.pk - self.max_profiles).delete()
+        except DatabaseError:
+            logger.exception("Could not store the profile of %s %s.", request.method, request.path)
+            return response
+        if trigger != RequestProfile.Trigger.SAMPLE:
+            response["X-Profile-Id"] = str(profile.pk)
+        return response
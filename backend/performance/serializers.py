@@ -0,0 +1,29 @@
+"""
+Serializers for stored request profiles.
+"""
+
+from rest_framework import serializers
+from .models import RequestProfile
+
+
+class RequestProfileListSerializer(serializers.ModelSerializer):
+    """Profile metadata, without the SQL and stacks."""
+
+    user = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta:
+        model = RequestProfile
+        fields = [
+            "id", "method", "path", "query_string", "view_name", "status_code",
+            "user", "trigger", "mode", "duration_ms", "sql_count", "sql_time_ms",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
+class RequestProfileDetailSerializer(RequestProfileListSerializer):
+    """Profile metadata with the recorded SQL."""
+
+    class Meta(RequestProfileListSerializer.Meta):
+        fields = RequestProfileListSerializer.Meta.fields + ["queries"]
+        read_only_fields = fields
@@ -0,0 +1,165 @@
+"""
+Slow query log.
+
+``SlowQueryMiddleware`` times every SQL statement a request runs (through
+``connection.execute_wrapper``) and records those slower than
+``SLOW_QUERIES["THRESHOLD_MS"]`` as ``SlowQuery`` rows, one per
+fingerprint: the SQL with string and number literals, placeholders and
+``IN`` lists normalized, so that the same ``JobPostingFilter``
+combination matches whatever its values.  The first time a fingerprint
+is seen its plan is captured with ``EXPLAIN`` (``EXPLAIN QUERY PLAN`` on
+SQLite), using the statement's own parameters.
+
+Recording happens when the server closes the response, after the body
+has been sent and outside the wrapper, so neither the row lock nor the
+``EXPLAIN`` delays the client and the log's own queries are never timed.  The report is the admin's
+"Slow queries" page and ``python manage.py slow_queries``.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connection, transaction
+
+from config.db import aexecute_wrapper
+from .models import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+MAX_PARAMS_LENGTH = 2000
+EXPLAIN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN ", "mysql": "EXPLAIN "}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize(sql):
+    """``sql`` with literals and placeholders as ``?`` and lists as ``(...)``."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _LIST.sub("(...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()
+
+
+def explain(sql, params):
+    """The plan of a ``SELECT``, or ``""`` for other statements and backends."""
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return ""
+    try:
+        # A savepoint, so that a failing EXPLAIN cannot break the transaction.
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+    except DatabaseError as exc:
+        return f"EXPLAIN failed: {exc}"
+    if connection.vendor == "sqlite":
+        # (id, parent, notused, detail): indent each step under its parent.
+        depth = {0: -1}
+        lines = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node] + detail)
+        return "\n".join(lines)
+    return "\n".join(" | ".join(str(column) for column in row) for row in rows)
+
+
+class SlowQueryCollector:
+    """``connection.execute_wrapper`` hook keeping the statements over a threshold."""
+
+    def __init__(self, threshold_ms):
+        self.threshold_ms = threshold_ms
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if elapsed_ms >= self.threshold_ms:
+                self.queries.append((sql, params, many, elapsed_ms))
+
+
+def record(sql, params, many, elapsed_ms, view_name="", capture_params=False, capture_plan=True):
+    """Add one execution to its fingerprint's ``SlowQuery`` row."""
+    normalized = normalize(sql)
+    key = fingerprint(normalized)
+    with transaction.atomic():
+        entry = SlowQuery.objects.select_for_update().filter(fingerprint=key).first()
+        if entry is None:
+            entry = SlowQuery(fingerprint=key, normalized_sql=normalized)
+            if capture_plan and not many:
+                entry.plan = explain(sql, params)
+        if elapsed_ms >= entry.max_ms:
+            entry.max_ms = elapsed_ms
+            entry.example_sql = sql
+            entry.example_params = repr(params)[:MAX_PARAMS_LENGTH] if capture_params else ""
+            entry.example_view = view_name
+        entry.count += 1
+        entry.total_ms += elapsed_ms
+        entry.views[view_name] = entry.views.get(view_name, 0) + 1
+        entry.save()
+    return entry
+
+
+class SlowQueryMiddleware:
+    """Record the SQL statements of a request that exceed the threshold."""
+
+    sync_capable = async_capable = True
+
+    def __init__(self, get_response):
+        config = settings.SLOW_QUERIES
+        if not config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold_ms = config["THRESHOLD_MS"]
+        self.capture_params = config["CAPTURE_PARAMS"]
+        self.capture_plan = config["EXPLAIN"]
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        collector = SlowQueryCollector(self.threshold_ms)
+        with connection.execute_wrapper(collector):
+            response = self.get_response(request)
+        return self.defer(request, response, collector)
+
+    async def __acall__(self, request):
+        collector = SlowQueryCollector(self.threshold_ms)
+        async with aexecute_wrapper(collector):
+            response = await self.get_response(request)
+        return self.defer(request, response, collector)
+
+    def defer(self, request, response, collector):
+        if collector.queries:
+            # Run by response.close() - in the request's sync thread under
+            # ASGI too - before request_finished closes the connection.
+            response._resource_closers.append(partial(self.record_all, request, collector.queries))
+        return response
+
+    def record_all(self, request, queries):
+        match = request.resolver_match
+        view_name = match.view_name if match else ""
+        for sql, params, many, elapsed_ms in queries:
+            try:
+                record(sql, params, many, elapsed_ms, view_name, self.capture_params, self.capture_plan)
+            except DatabaseError:
+                logger.exception("Could not record a slow query of %s %s.", request.method, request.path)
@@ -0,0 +1,571 @@
+"""
+Tests for the endpoint and concurrency benchmarks, the per-view query
+budgets, request profiling and the metrics endpoint.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from io import StringIO
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import AsyncClient, AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.utils.module_loading import import_string
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from accounts.authentication import RefreshToken
+from accounts.models import User
+
+from applications.models import JobApplication
+from config.metrics import REQUESTS, registry
+from config.query_budgets import get_query_budget, query_budget
+from jobs.dataset import generate as generate_dataset
+from jobs.models import JobPosting
+from jobs.typeahead import index as typeahead_index
+from jobs.views import JobFacetsView
+from .models import RequestProfile, SlowQuery
+from .benchmarks import SCENARIOS, compare, route_views, run, uncovered_routes
+from .concurrency import load, sample_paths, summarize
+from .slow_queries import SlowQueryMiddleware, normalize
+
+STATIC_STORAGES = {"staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}}
+# Outside DEBUG /metrics needs a token, so the benchmarks send this one.
+METRICS = {"ENABLED": True, "DIR": None, "FLUSH_INTERVAL": 1, "TOKEN": "s3cret"}
+
+
+class BenchmarkTests(TestCase):
+    """Test the benchmark runner on a small generated dataset."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(employers=3, seekers=20, jobs=30, applications=120, saved=40)
+
+    def setUp(self):
+        cache.clear()
+        typeahead_index.reset()
+
+    def tearDown(self):
+        typeahead_index.reset()
+
+    def test_every_route_is_benchmarked(self):
+        self.assertEqual(uncovered_routes(), [])
+
+    # The admin pages need static files, which tests run without collecting.
+    @override_settings(STORAGES=STATIC_STORAGES, METRICS=METRICS)
+    def test_run_reports_every_endpoint_and_rolls_back(self):
+        jobs, applications = JobPosting.objects.count(), JobApplication.objects.count()
+        report = run(iterations=2, warmup=0)
+        self.assertEqual(set(report["endpoints"]), {scenario.name for scenario in SCENARIOS})
+        for name, result in report["endpoints"].items():
+            self.assertEqual(result["errors"], 0, f"{name}: {result['status']}")
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        self.assertGreater(report["endpoints"]["jobs.list"]["bytes"], 0)
+        self.assertGreater(report["endpoints"]["jobs.detail"]["queries"], 0)
+        self.assertEqual(JobPosting.objects.count(), jobs)
+        self.assertEqual(JobApplication.objects.count(), applications)
+
+    def test_concurrency_paths(self):
+        users = User.objects.count()
+        paths = sample_paths(4)
+        self.assertEqual(len(paths), 12)
+        self.assertEqual(User.objects.count(), users)
+        for path in paths:
+            self.assertEqual(self.client.get(path).status_code, 200, path)
+
+    def test_concurrency_client(self):
+        # Content-Length with keep-alive, chunked, and close-delimited bodies.
+        async def handle(reader, writer):
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                path = head.split()[1]
+                if path == b"/chunked":
+                    writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+                    writer.write(b"3\r\nabc\r\n2\r\nde\r\n0\r\n\r\n")
+                elif path == b"/close":
+                    writer.write(b"HTTP/1.1 404 Not Found\r\nConnection: close\r\n\r\nmissing")
+                    await writer.drain()
+                    break
+                else:
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 4\r\n\r\nbody")
+                await writer.drain()
+            writer.close()
+
+        async def main():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            async with server:
+                port = server.sockets[0].getsockname()[1]
+                return await load(port, ["/", "/chunked", "/close"], concurrency=2, duration=0.3, warmup=0)
+
+        samples = asyncio.run(main())
+        self.assertEqual({(status, size) for _, status, size in samples}, {(200, 4), (200, 5), (404, 7)})
+        report = summarize(samples, 0.3)
+        self.assertEqual(report["requests"], len(samples))
+        self.assertEqual(report["errors"], report["status"]["404"])
+
+    def test_compare_flags_regressions(self):
+        endpoint = {"p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0, "queries": 2.0, "bytes": 1000}
+        baseline = {"endpoints": {"jobs.list": endpoint}}
+        same = {"endpoints": {"jobs.list": dict(endpoint, p99_ms=33.0)}}
+        self.assertEqual(compare(same, baseline), [])
+        slower = {"endpoints": {"jobs.list": dict(endpoint, p95_ms=40.0, queries=3.0)}}
+        self.assertEqual(
+            [(row["metric"], row["current"]) for row in compare(slower, baseline)],
+            [("p95_ms", 40.0), ("queries", 3.0)],
+        )
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class QueryBudgetTests(TestCase):
+    """
+    Every endpoint stays within its view's ``query_budget`` at 10x, 100x
+    and 1000x data volumes, and runs as many queries at 1000x as at 10x
+    and for a page five times larger.  Query counts, unlike timings, are
+    stable enough to assert on in CI.
+    """
+
+    VOLUMES = (10, 100, 1000)
+    LOCAL_APPS = ("accounts.", "jobs.", "applications.")
+
+    def setUp(self):
+        cache.clear()
+        typeahead_index.reset()
+
+    def tearDown(self):
+        typeahead_index.reset()
+
+    def grow(self, previous, volume):
+        added = volume - previous
+        generate_dataset(
+            employers=max(1, added // 10),
+            seekers=max(5, added // 2),
+            jobs=added,
+            applications=added * 5,
+            saved=added * 2,
+            domain=f"v{volume}.example.com",
+        )
+
+    # Measures how the database queries scale: cached lists would hide them
+    # and spelling-corrected searches would add a background index build.
+    @override_settings(
+        STORAGES=STATIC_STORAGES, METRICS=METRICS, RESPONSE_CACHE={"ENABLED": False}, FUZZY_SEARCH_ENABLED=False
+    )
+    def test_endpoints_within_budget_at_every_volume(self):
+        reports, previous = {}, 0
+        # Writes made here patch the typeahead index directly, so its periodic
+        # check has nothing to catch up on; its thread would only contend for
+        # the test database.
+        with patch.object(typeahead_index, "_refresh_in_background"):
+            for volume in self.VOLUMES:
+                self.grow(previous, volume)
+                previous = volume
+                reports[volume] = run(iterations=3, warmup=1)["endpoints"]
+        with patch.object(PageNumberPagination, "page_size", 50):
+            large_pages = run(
+                [scenario for scenario in SCENARIOS if scenario.method == "GET"], iterations=3, warmup=1
+            )["endpoints"]
+
+        views = route_views()
+        for scenario in SCENARIOS:
+            view = views[scenario.route]
+            budget = get_query_budget(view, scenario.method)
+            with self.subTest(scenario.name):
+                if budget is None:
+                    self.assertFalse(view.__module__.startswith(self.LOCAL_APPS), "no query_budget declared")
+                    continue
+                counts = [reports[volume][scenario.name]["queries_max"] for volume in self.VOLUMES]
+                over = [reports[volume][scenario.name]["over_budget"] for volume in self.VOLUMES]
+                self.assertEqual(over, [0] * len(self.VOLUMES), f"queries per volume: {counts}")
+                if scenario.method == "GET":
+                    self.assertLessEqual(counts[-1], counts[0], f"queries per volume: {counts}")
+                else:
+                    # Writes take different branches (first stats row, new
+                    # salary bucket, save vs. unsave) from request to request.
+                    fewest = reports[self.VOLUMES[-1]][scenario.name]["queries_min"]
+                    self.assertLessEqual(fewest, counts[0], f"queries per volume: {counts}")
+                if scenario.name in large_pages:
+                    self.assertLessEqual(large_pages[scenario.name]["queries_max"], counts[-1])
+
+    def test_declared_budgets(self):
+        views = route_views()
+        self.assertEqual(get_query_budget(views["job-detail"], "PATCH"), 16)
+        self.assertEqual(get_query_budget(views["job-detail"], "HEAD"), 2)
+        self.assertEqual(get_query_budget(views["salary-stats"], "GET"), 2)
+        self.assertIsNone(get_query_budget(views["schema"], "GET"))
+        self.assertEqual(get_query_budget(query_budget(7)(lambda request: None), "POST"), 7)
+
+    def test_import_budget_grows_per_batch(self):
+        view = route_views()["job-import"]
+        self.assertEqual(get_query_budget(view, "POST", Response({"created": 0})), 2)
+        self.assertEqual(get_query_budget(view, "POST", Response({"created": 500})), 42)
+        self.assertEqual(get_query_budget(view, "POST", Response({"created": 501})), 82)
+        self.assertEqual(get_query_budget(view, "POST", Response({"created": 501, "dry_run": True})), 2)
+
+    def test_middleware_logs_violations(self):
+        with override_settings(QUERY_BUDGETS={"LOG_VIOLATIONS": True}):
+            client = APIClient()
+            with patch.object(JobFacetsView, "query_budget", 0):
+                with self.assertLogs("config.query_budgets", "WARNING") as logs:
+                    client.get("/api/jobs/facets/")
+            self.assertIn("budget of job-facets is 0", logs.output[0])
+            with self.assertNoLogs("config.query_budgets", "WARNING"):
+                client.get("/api/jobs/facets/")
+
+    def test_middleware_logs_violations_under_asgi(self):
+        with override_settings(QUERY_BUDGETS={"LOG_VIOLATIONS": True}):
+            with patch.object(JobFacetsView, "query_budget", 1):
+                with self.assertLogs("config.query_budgets", "WARNING") as logs:
+                    async_to_sync(AsyncClient().get)("/api/jobs/facets/")
+        self.assertRegex(logs.output[0], r"ran [2-9]\d* SQL queries; the budget of job-facets is 1")
+
+    def test_middleware_is_async_capable(self):
+        # An async-only view path must not hop to a thread between middleware.
+        for path in settings.MIDDLEWARE:
+            with self.subTest(path):
+                self.assertTrue(getattr(import_string(path), "async_capable", False))
+
+
+PROFILING = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 0,
+    "MODE": "sampling",
+    "INTERVAL": 0.0005,
+    "MAX_QUERIES": 500,
+    "MAX_PROFILES": 1000,
+}
+
+
+@override_settings(PROFILING=PROFILING)
+class ProfilingTests(TestCase):
+    """Test on-demand profiling and the profile endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="adminpass123", first_name="Ad", last_name="Min", role="admin"
+        )
+        self.seeker = User.objects.create_user(
+            email="seeker@example.com", password="seekerpass123", first_name="Se", last_name="Eker", role="job_seeker"
+        )
+        generate_dataset(employers=1, seekers=2, jobs=5, applications=0, saved=0)
+        # Created after override_settings, so the middleware sees PROFILING.
+        self.client = APIClient()
+
+    def _auth(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+
+    def test_admin_profiles_request_with_header(self):
+        self._auth(self.admin)
+        response = self.client.get("/api/jobs/", HTTP_X_PROFILE="1")
+        self.assertEqual(response.status_code, 200)
+        profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.assertEqual(profile.view_name, "job-list-create")
+        self.assertEqual(profile.trigger, RequestProfile.Trigger.HEADER)
+        self.assertEqual(profile.mode, RequestProfile.Mode.SAMPLING)
+        self.assertEqual(profile.user, self.admin)
+        self.assertGreater(profile.sql_count, 0)
+        self.assertEqual(len(profile.queries), profile.sql_count)
+        self.assertNotIn("dataset.example.com", str(profile.queries))
+
+    def test_profiles_under_asgi(self):
+        token = RefreshToken.for_user(self.admin).access_token
+        response = async_to_sync(AsyncClient().get)(
+            "/api/jobs/", headers={"Authorization": f"Bearer {token}", "X-Profile": "deterministic"}
+        )
+        self.assertEqual(response.status_code, 200)
+        profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.assertEqual(profile.user, self.admin)
+        self.assertGreater(profile.sql_count, 0)
+        self.assertIn("jobs/views.py", profile.stacks)
+
+    def test_deterministic_mode_and_query_parameter(self):
+        self._auth(self.admin)
+        response = self.client.get("/api/jobs/", {"profile": "deterministic"})
+        profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.assertEqual(profile.trigger, RequestProfile.Trigger.QUERY)
+        self.assertEqual(profile.mode, RequestProfile.Mode.DETERMINISTIC)
+        self.assertIn("jobs/views.py", profile.stacks)
+        for line in profile.stacks.splitlines():
+            stack, weight = line.rsplit(" ", 1)
+            self.assertGreater(int(weight), 0)
+
+    def test_non_admins_are_not_profiled(self):
+        self._auth(self.seeker)
+        response = self.client.get("/api/jobs/", HTTP_X_PROFILE="1")
+        self.assertNotIn("X-Profile-Id", response)
+        self.client.credentials()
+        response = self.client.get("/api/jobs/", HTTP_X_PROFILE="1")
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_sampling(self):
+        with override_settings(PROFILING={**PROFILING, "SAMPLE_RATE": 1}):
+            response = APIClient().get("/api/categories/")
+        self.assertNotIn("X-Profile-Id", response)
+        profile = RequestProfile.objects.get()
+        self.assertEqual(profile.trigger, RequestProfile.Trigger.SAMPLE)
+        self.assertIsNone(profile.user)
+
+    def test_old_profiles_are_pruned(self):
+        with override_settings(PROFILING={**PROFILING, "MAX_PROFILES": 2}):
+            self.client = APIClient()
+            self._auth(self.admin)
+            ids = [
+                self.client.get("/api/categories/", HTTP_X_PROFILE="1")["X-Profile-Id"] for _ in range(4)
+            ]
+        self.assertEqual(
+            sorted(RequestProfile.objects.values_list("pk", flat=True)), [int(pk) for pk in ids[2:]]
+        )
+
+    def test_profile_endpoints(self):
+        self._auth(self.admin)
+        profile_id = self.client.get("/api/jobs/", HTTP_X_PROFILE="deterministic")["X-Profile-Id"]
+        self.client.get("/api/categories/", HTTP_X_PROFILE="1")
+
+        response = self.client.get("/api/performance/profiles/", {"view_name": "job-list-create"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.data["results"]], [int(profile_id)])
+        self.assertNotIn("queries", response.data["results"][0])
+        response = self.client.get("/api/performance/profiles/", {"path": "/api/categories"})
+        self.assertEqual(response.data["count"], 1)
+        response = self.client.get("/api/performance/profiles/", {"min_duration": "fast"})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(f"/api/performance/profiles/{profile_id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["queries"][0]["sql"].startswith("SELECT"))
+        response = self.client.get(f"/api/performance/profiles/{profile_id}/collapsed/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+        self.assertRegex(response.content.decode().splitlines()[0], r"^\S.* \d+$")
+
+        self._auth(self.seeker)
+        for url in ("/api/performance/profiles/", f"/api/performance/profiles/{profile_id}/collapsed/"):
+            self.assertEqual(self.client.get(url).status_code, 403)
+
+
+@override_settings(METRICS=METRICS)
+class MetricsTests(TestCase):
+    """Test request metrics and their aggregation across processes."""
+
+    def setUp(self):
+        cache.clear()
+        generate_dataset(employers=1, seekers=2, jobs=5, applications=0, saved=0)
+        self.client = APIClient()
+
+    def scrape(self, token="s3cret"):
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        return response.content.decode()
+
+    def value(self, text, sample):
+        for line in text.splitlines():
+            if line.startswith(sample + " "):
+                return float(line.rsplit(" ", 1)[1])
+        return 0
+
+    def test_requests_are_recorded_per_view(self):
+        before = self.scrape()
+        self.client.get("/api/jobs/")
+        self.client.get("/api/jobs/")
+        self.client.get("/api/no-such-endpoint/")
+        after = self.scrape()
+
+        def delta(sample):
+            return self.value(after, sample) - self.value(before, sample)
+
+        self.assertEqual(delta('jobboard_http_requests_total{view="job-list-create",method="GET",status="200"}'), 2)
+        self.assertEqual(
+            delta('jobboard_http_request_duration_seconds_count{view="job-list-create",method="GET"}'), 2
+        )
+        self.assertEqual(
+            delta('jobboard_http_request_duration_seconds_bucket{view="job-list-create",method="GET",le="+Inf"}'), 2
+        )
+        self.assertGreater(delta('jobboard_http_request_duration_seconds_sum{view="job-list-create",method="GET"}'), 0)
+        self.assertGreaterEqual(delta('jobboard_db_queries_total{view="job-list-create"}'), 2)
+        self.assertGreater(delta('jobboard_db_query_seconds_total{view="job-list-create"}'), 0)
+        self.assertEqual(delta('jobboard_http_requests_total{view="unmatched",method="GET",status="404"}'), 1)
+        self.assertIn("# TYPE jobboard_http_request_duration_seconds histogram", after)
+
+    def test_requests_are_recorded_under_asgi(self):
+        before = self.scrape()
+        async_to_sync(AsyncClient().get)("/api/jobs/")
+        after = self.scrape()
+        sample = 'jobboard_http_requests_total{view="job-list-create",method="GET",status="200"}'
+        self.assertEqual(self.value(after, sample) - self.value(before, sample), 1)
+        sample = 'jobboard_db_queries_total{view="job-list-create"}'
+        self.assertGreaterEqual(self.value(after, sample) - self.value(before, sample), 2)
+
+    def test_response_cache_outcomes(self):
+        sample = 'jobboard_response_cache_total{scope="categories",outcome="%s"}'
+        before = self.scrape()
+        with override_settings(RESPONSE_CACHE={"ENABLED": True, "TTL": 60, "MAX_STALE": 300}):
+            self.client.get("/api/categories/", {"page": 1, "ordering": "-name"})
+            self.client.get("/api/categories/", {"page": 1, "ordering": "-name"})
+        after = self.scrape()
+        self.assertEqual(self.value(after, sample % "miss") - self.value(before, sample % "miss"), 1)
+        self.assertEqual(self.value(after, sample % "hit") - self.value(before, sample % "hit"), 1)
+
+    def test_recording_from_many_threads(self):
+        sample = 'jobboard_http_requests_total{view="threads",method="GET",status="200"}'
+        before = self.value(self.scrape(), sample)
+
+        def record():
+            for _ in range(1000):
+                REQUESTS.inc("threads", "GET", "200")
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.value(self.scrape(), sample) - before, 8000)
+
+    def test_totals_of_all_workers(self):
+        sample = 'jobboard_http_requests_total{view="job-list-create",method="GET",status="200"}'
+        self.client.get("/api/jobs/")
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(METRICS={**METRICS, "DIR": directory}):
+                own = self.value(self.scrape(), sample)
+                other = [
+                    ["jobboard_http_requests_total", ["job-list-create", "GET", "200"], 5],
+                    ["jobboard_http_request_duration_seconds", ["job-list-create", "GET"], [1] + [0] * 11 + [0.004]],
+                ]
+                Path(directory, "1.json").write_text(json.dumps(other))
+                Path(directory, "2.json").write_text("{truncated")
+                text = self.scrape()
+                self.assertEqual(self.value(text, sample), own + 5)
+
+                registry.flush()
+                written = json.loads(Path(directory, f"{os.getpid()}.json").read_text())
+                self.assertIn(["jobboard_http_requests_total", ["job-list-create", "GET", "200"], own], written)
+                # Its own file is not counted twice.
+                self.assertEqual(self.value(self.scrape(), sample), own + 5)
+
+    def test_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+        self.scrape(token="s3cret")
+
+    def test_refused_without_token_unless_debug(self):
+        with override_settings(METRICS={**METRICS, "TOKEN": ""}):
+            self.assertEqual(self.client.get("/metrics").status_code, 403)
+            with override_settings(DEBUG=True):
+                self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+
+SLOW_QUERIES = {"ENABLED": True, "THRESHOLD_MS": 0, "EXPLAIN": True, "CAPTURE_PARAMS": True}
+
+
+@override_settings(SLOW_QUERIES=SLOW_QUERIES)
+class SlowQueryTests(TestCase):
+    """Test the slow query log, its EXPLAIN capture and its report."""
+
+    def setUp(self):
+        cache.clear()
+        generate_dataset(employers=1, seekers=2, jobs=20, applications=0, saved=0)
+        # Created after override_settings, so the middleware sees SLOW_QUERIES.
+        self.client = APIClient()
+
+    def test_normalize(self):
+        self.assertEqual(
+            normalize('SELECT "t1"."id" FROM "t1"  WHERE "a" = %s AND "b" IN (%s, %s)\n LIMIT 10'),
+            'SELECT "t1"."id" FROM "t1" WHERE "a" = ? AND "b" IN (...) LIMIT ?',
+        )
+        self.assertEqual(
+            normalize("SELECT * FROM t WHERE name = 'O''Brien' AND x IN (1, 2, 3) AND y > -1.5"),
+            normalize("SELECT * FROM t WHERE name = 'x' AND x IN (7, 8) AND y > 2"),
+        )
+
+    def test_queries_are_aggregated_by_fingerprint(self):
+        with patch("performance.slow_queries.explain", return_value="SCAN jobs_jobposting") as explain:
+            self.client.get("/api/jobs/", {"location": "Remote"})
+            self.client.get("/api/jobs/", {"location": "Berlin"})
+        entries = SlowQuery.objects.all()
+        self.assertTrue(entries)
+        for entry in entries:
+            self.assertEqual(set(entry.views), {"job-list-create"})
+            self.assertEqual(entry.plan, "SCAN jobs_jobposting")
+        # One EXPLAIN per fingerprint, not per execution.
+        self.assertEqual(explain.call_count, len(entries))
+        entry = SlowQuery.objects.get(normalized_sql__startswith="SELECT COUNT(*)")
+        self.assertEqual(entry.count, 2)
+        self.assertNotIn("Remote", entry.normalized_sql)
+        self.assertRegex(entry.example_params, r"remote|berlin")
+
+    def test_recorded_once_the_response_is_closed(self):
+        def view(request):
+            list(JobPosting.objects.filter(location="Remote")[:1])
+            return HttpResponse("ok")
+
+        with override_settings(SLOW_QUERIES={**SLOW_QUERIES, "CAPTURE_PARAMS": False}):
+            response = SlowQueryMiddleware(view)(RequestFactory().get("/"))
+        self.assertFalse(SlowQuery.objects.exists())
+        response.close()
+        entry = SlowQuery.objects.get(normalized_sql__contains="jobs_jobposting")
+        self.assertEqual(entry.example_params, "")
+        self.assertTrue(entry.plan)
+
+    def test_queries_are_recorded_under_asgi(self):
+        async def view(request):
+            await JobPosting.objects.filter(location="Remote").afirst()
+            return HttpResponse("ok")
+
+        middleware = SlowQueryMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+
+        async def serve():
+            response = await middleware(AsyncRequestFactory().get("/"))
+            # As ASGIHandler does (AsyncClient closes in another thread).
+            await sync_to_async(response.close)()
+
+        async_to_sync(serve)()
+        self.assertTrue(SlowQuery.objects.filter(normalized_sql__contains="jobs_jobposting").exists())
+
+    def test_explain(self):
+        self.client.get("/api/jobs/", {"ordering": "-salary_max"})
+        entry = SlowQuery.objects.filter(normalized_sql__startswith="SELECT", example_view="job-list-create").first()
+        self.assertRegex(entry.plan, r"SCAN|SEARCH")
+
+    def test_threshold(self):
+        with override_settings(SLOW_QUERIES={**SLOW_QUERIES, "THRESHOLD_MS": 60_000, "CAPTURE_PARAMS": False}):
+            APIClient().get("/api/jobs/")
+        self.assertFalse(SlowQuery.objects.exists())
+
+    def test_report_command(self):
+        self.client.get("/api/categories/")
+        out = StringIO()
+        call_command("slow_queries", "--plans", "--view", "category-list-create", stdout=out)
+        self.assertIn("jobs_jobcategory", out.getvalue())
+        self.assertIn("category-list-create (1)", out.getvalue())
+        self.assertIn("plan:", out.getvalue())
+
+        out = StringIO()
+        call_command("slow_queries", "--view", "job-detail", stdout=out)
+        self.assertIn("No slow queries recorded.", out.getvalue())
+        call_command("slow_queries", "--clear", stdout=StringIO())
+        self.assertFalse(SlowQuery.objects.exists())
+
+    def test_admin(self):
+        admin = User.objects.create_superuser(email="root@example.com", password="rootpass123", role="admin")
+        self.client.get("/api/categories/")
+        self.client.force_login(admin)
+        with override_settings(STORAGES=STATIC_STORAGES):
+            response = self.client.get("/admin/performance/slowquery/")
+            self.assertContains(response, "jobs_jobcategory")
+            entry = SlowQuery.objects.first()
+            response = self.client.get(f"/admin/performance/slowquery/{entry.pk}/change/")
+            self.assertContains(response, entry.fingerprint)
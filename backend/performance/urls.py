@@ -0,0 +1,12 @@
+"""
+URL patterns for stored request profiles.
+"""
+
+from django.urls import path
+from .views import RequestProfileDetailView, RequestProfileListView, request_profile_stacks
+
+urlpatterns = [
+    path("profiles/", RequestProfileListView.as_view(), name="request-profiles"),
+    path("profiles/<int:pk>/", RequestProfileDetailView.as_view(), name="request-profile-detail"),
+    path("profiles/<int:pk>/collapsed/", request_profile_stacks, name="request-profile-stacks"),
+]
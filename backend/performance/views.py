@@ -0,0 +1,68 @@
+"""
+Views for reading stored request profiles (admin only).
+"""
+
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+from accounts.permissions import IsAdminUser
+from config.query_budgets import query_budget
+from .models import RequestProfile
+from .serializers import RequestProfileDetailSerializer, RequestProfileListSerializer
+
+
+@extend_schema(
+    tags=["Performance"],
+    parameters=[
+        OpenApiParameter("path", str, description="Only profiles whose path starts with this."),
+        OpenApiParameter("view_name", str, description="Only profiles of this URL name."),
+        OpenApiParameter("min_duration", float, description="Only profiles at least this slow (ms)."),
+    ],
+)
+class RequestProfileListView(generics.ListAPIView):
+    """List stored profiles, newest first."""
+
+    serializer_class = RequestProfileListSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    filter_backends = []
+    query_budget = 3
+
+    def get_queryset(self):
+        queryset = RequestProfile.objects.defer("queries", "stacks")
+        params = self.request.query_params
+        if params.get("path"):
+            queryset = queryset.filter(path__startswith=params["path"])
+        if params.get("view_name"):
+            queryset = queryset.filter(view_name=params["view_name"])
+        if params.get("min_duration"):
+            try:
+                min_duration = float(params["min_duration"])
+            except ValueError:
+                raise ValidationError({"min_duration": ["Must be a number."]})
+            queryset = queryset.filter(duration_ms__gte=min_duration)
+        return queryset
+
+
+@extend_schema(tags=["Performance"])
+class RequestProfileDetailView(generics.RetrieveAPIView):
+    """A stored profile with its SQL."""
+
+    queryset = RequestProfile.objects.defer("stacks")
+    serializer_class = RequestProfileDetailSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+    query_budget = 2
+
+
+@extend_schema(tags=["Performance"], responses={(200, "text/plain"): OpenApiTypes.STR})
+@query_budget(2)
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated, IsAdminUser])
+def request_profile_stacks(request, pk):
+    """The profile's collapsed stacks, for flamegraph.pl or speedscope."""
+    profile = get_object_or_404(RequestProfile.objects.only("stacks"), pk=pk)
+    return HttpResponse(profile.stacks, content_type="text/plain; charset=utf-8")